@@ -7,15 +7,16 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
-from app.core.config import Config
+from app.core.config import PostgresConfig
 from app.database.postgres.base import Base
 from app.database.postgres.models import *
+from app.utils.db_uri import get_db_uri
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
-context.config.set_main_option("sqlalchemy.url", str(Config.POSTGRES_CONN))
+context.config.set_main_option("sqlalchemy.url", get_db_uri(PostgresConfig.from_env()).replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
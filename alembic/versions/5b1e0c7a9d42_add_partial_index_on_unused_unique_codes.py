@@ -0,0 +1,42 @@
+"""add partial index on unused promo unique codes
+
+Revision ID: 5b1e0c7a9d42
+Revises: 94616360e63f
+Create Date: 2026-10-16 10:12:41.218374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e0c7a9d42'
+down_revision: Union[str, None] = '94616360e63f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_promo_unique_values_unused',
+            'promo_unique_values',
+            ['promo_id'],
+            unique=False,
+            postgresql_where=sa.text('is_used IS false'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_promo_unique_values_unused',
+            table_name='promo_unique_values',
+            postgresql_where=sa.text('is_used IS false'),
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
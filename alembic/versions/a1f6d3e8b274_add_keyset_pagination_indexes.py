@@ -0,0 +1,67 @@
+"""add keyset pagination indexes
+
+Revision ID: a1f6d3e8b274
+Revises: e7a4c9b1f053
+Create Date: 2026-10-16 23:24:08.517209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f6d3e8b274'
+down_revision: Union[str, None] = 'e7a4c9b1f053'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_promos_created_at_id',
+            'promos',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_promos_company_id_created_at_id',
+            'promos',
+            ['company_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_comments_promo_id_date_id',
+            'comments',
+            ['promo_id', 'date', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_user_promo_activations_user_id_activated_at_id',
+            'user_promo_activations',
+            ['user_id', 'activated_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_promo_activations_user_id_activated_at_id',
+            table_name='user_promo_activations',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index('ix_comments_promo_id_date_id', table_name='comments', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_promos_company_id_created_at_id', table_name='promos', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_promos_created_at_id', table_name='promos', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,67 @@
+"""add indexes for hot query paths
+
+Revision ID: b8e2f4c61d37
+Revises: a1f6d3e8b274
+Create Date: 2026-10-16 23:41:17.902384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f4c61d37'
+down_revision: Union[str, None] = 'a1f6d3e8b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_promo_activations_promo_id_user_id',
+            'user_promo_activations',
+            ['promo_id', 'user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_user_promo_likes_promo_id',
+            'user_promo_likes',
+            ['promo_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_promo_targets_lower_country',
+            'promo_targets',
+            [sa.text('lower(country)')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_lower_country',
+            'users',
+            [sa.text('lower(country)')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_lower_country', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_promo_targets_lower_country', table_name='promo_targets', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_user_promo_likes_promo_id', table_name='user_promo_likes', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(
+            'ix_user_promo_activations_promo_id_user_id',
+            table_name='user_promo_activations',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
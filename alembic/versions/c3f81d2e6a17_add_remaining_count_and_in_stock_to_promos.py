@@ -0,0 +1,41 @@
+"""add remaining_count and in_stock to promos
+
+Revision ID: c3f81d2e6a17
+Revises: 5b1e0c7a9d42
+Create Date: 2026-10-16 11:02:17.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f81d2e6a17'
+down_revision: Union[str, None] = '5b1e0c7a9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('promos', sa.Column('remaining_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE promos SET remaining_count = CASE
+            WHEN mode = 'COMMON' THEN GREATEST(max_count - used_count, 0)
+            ELSE (
+                SELECT count(*) FROM promo_unique_values
+                WHERE promo_unique_values.promo_id = promos.id AND promo_unique_values.is_used IS false
+            )
+        END
+        """
+    )
+    op.add_column('promos', sa.Column('in_stock', sa.Boolean(), sa.Computed('remaining_count > 0', persisted=True)))
+    op.create_index('ix_promos_in_stock_created_at', 'promos', ['in_stock', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_promos_in_stock_created_at', table_name='promos')
+    op.drop_column('promos', 'in_stock')
+    op.drop_column('promos', 'remaining_count')
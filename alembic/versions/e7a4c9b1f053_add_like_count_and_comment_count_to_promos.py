@@ -0,0 +1,35 @@
+"""add like_count and comment_count to promos
+
+Revision ID: e7a4c9b1f053
+Revises: c3f81d2e6a17
+Create Date: 2026-10-16 12:21:05.873140
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a4c9b1f053'
+down_revision: Union[str, None] = 'c3f81d2e6a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('promos', sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('promos', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE promos SET
+            like_count = (SELECT count(*) FROM user_promo_likes WHERE user_promo_likes.promo_id = promos.id),
+            comment_count = (SELECT count(*) FROM comments WHERE comments.promo_id = promos.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('promos', 'comment_count')
+    op.drop_column('promos', 'like_count')
@@ -0,0 +1,37 @@
+"""add position to promo_unique_values
+
+Revision ID: f2c7d9a4e160
+Revises: b8e2f4c61d37
+Create Date: 2026-10-17 09:14:52.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7d9a4e160'
+down_revision: Union[str, None] = 'b8e2f4c61d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('promo_unique_values', sa.Column('position', sa.Integer(), server_default='0', nullable=False))
+    # Порядок, в котором компания передала коды, нигде не хранился: ближе всего к нему физический порядок вставки.
+    op.execute(
+        """
+        UPDATE promo_unique_values SET position = numbered.position
+        FROM (
+            SELECT ctid, row_number() OVER (PARTITION BY promo_id ORDER BY ctid) - 1 AS position
+            FROM promo_unique_values
+        ) AS numbered
+        WHERE promo_unique_values.ctid = numbered.ctid
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('promo_unique_values', 'position')
@@ -1,11 +1,12 @@
 from fastapi import APIRouter
 
-from app.api.v2.endpoints import auth, business, ping, user
+from app.api.v2.endpoints import auth, business, metrics, ping, user
 
 root_router = APIRouter()
 
 sub_routers = (
     ping.router,
+    metrics.router,
     auth.router,
     business.router,
     user.router,
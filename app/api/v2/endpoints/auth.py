@@ -1,10 +1,10 @@
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
 from fastapi import APIRouter, Response, status
-from fastapi.responses import JSONResponse
 from fastapi.security.oauth2 import OAuth2PasswordBearer
 
 from app.core.exceptions import EmailAlreadyExistsError, InvalidCredentialsError
+from app.core.responses import JSONResponse
 from app.interactors.auth import (
     SignInBusinessCompanyInteractor,
     SignInUserInteractor,
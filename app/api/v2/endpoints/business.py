@@ -3,7 +3,6 @@ from typing import Annotated, Optional
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
 from fastapi import APIRouter, Depends, Path, Query, Response, status
-from fastapi.responses import JSONResponse
 
 from app.api.v2.endpoints.auth import oauth2_scheme
 from app.core.exceptions import (
@@ -12,6 +11,8 @@ from app.core.exceptions import (
     EntityUnauthorizedError,
     InvalidRequestDataError,
 )
+from app.core.responses import JSONResponse
+from app.database.postgres.routing import read_from_primary
 from app.interactors.auth import OAuth2PasswordBearerCompanyInteractor
 from app.interactors.business import (
     CreateNewPromoInteractor,
@@ -25,7 +26,10 @@ from app.schemas.business import PromoCreate, PromoPatch
 from app.schemas.common import PromoId
 from app.schemas.enums import PromoSortByEnum
 from app.schemas.error import ErrorResponse
-from app.utils.serializer import serialize_countries_list
+from app.utils.serializer import (
+    serialize_countries_list,
+    serialize_pagination_headers,
+)
 
 router = APIRouter(route_class=DishkaRoute, prefix="/business", tags=["B2B"])
 
@@ -63,15 +67,21 @@ async def get_promos_list(
     ),
     limit: int | None = Query(default=10, ge=0, le=100, description="Количество записей на странице"),
     offset: int | None = Query(default=0, ge=0, description="Смещение для пагинации"),
+    cursor: str | None = Query(
+        default=None,
+        description="Курсор следующей страницы из заголовка X-Next-Cursor. "
+        "Если указан, X-Total-Count не возвращается, а offset игнорируется.",
+    ),
 ) -> Response:
     try:
         company_id = await oauth2_interactor(token, cache_interactor)
-        total_count, promos_list = await business_interactor(
+        total_count, promos_list, next_cursor = await business_interactor(
             company_id=company_id,
             sort_by=sort_by,
             country=serialize_countries_list(country),
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
     except EntityUnauthorizedError as exc:
         return JSONResponse(
@@ -82,11 +92,12 @@ async def get_promos_list(
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content=promos_list,
-        headers={"X-Total-Count": str(total_count)},
+        headers=serialize_pagination_headers(total_count, next_cursor),
     )
 
 
-@router.get("/promo/{id}")
+# Компания читает промокод сразу после создания и редактирования, поэтому отставание реплики здесь недопустимо.
+@router.get("/promo/{id}", dependencies=[Depends(read_from_primary)])
 async def get_promo_by_id(
     token: Annotated[str, Depends(oauth2_scheme)],
     business_interactor: FromDishka[GetPromoByIdInteractor],
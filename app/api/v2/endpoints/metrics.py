@@ -0,0 +1,13 @@
+from dishka import FromDishka
+from dishka.integrations.fastapi import DishkaRoute
+from fastapi import APIRouter, status
+
+from app.core.metrics import Metrics
+from app.core.responses import JSONResponse
+
+router = APIRouter(route_class=DishkaRoute, tags=["default"])
+
+
+@router.get("/metrics")
+async def get_metrics(metrics: FromDishka[Metrics]):
+    return JSONResponse(status_code=status.HTTP_200_OK, content=metrics.snapshot())
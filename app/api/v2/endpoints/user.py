@@ -3,7 +3,6 @@ from typing import Annotated, Optional
 from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
 from fastapi import APIRouter, Depends, Path, Query, Response, status
-from fastapi.responses import JSONResponse
 
 from app.api.v2.endpoints.auth import oauth2_scheme
 from app.core.exceptions import (
@@ -11,6 +10,7 @@ from app.core.exceptions import (
     EntityNotFoundError,
     EntityUnauthorizedError,
 )
+from app.core.responses import JSONResponse
 from app.interactors.antifraud import AntifraudInteractor
 from app.interactors.auth import OAuth2PasswordBearerUserInteractor
 from app.interactors.caching import CacheAccessTokenInteractor, CacheAntifraudInteractor
@@ -32,6 +32,7 @@ from app.interactors.user import (
 from app.schemas.common import CommentId, PromoId
 from app.schemas.error import ErrorResponse
 from app.schemas.user import CommentTextRequest, UserPatch
+from app.utils.serializer import serialize_pagination_headers
 
 router = APIRouter(route_class=DishkaRoute, prefix="/user", tags=["B2C"])
 
@@ -83,6 +84,11 @@ async def get_user_feed(
     cache_interactor: FromDishka[CacheAccessTokenInteractor],
     limit: int | None = Query(default=10, ge=0, le=100, description="Количество записей на странице"),
     offset: int | None = Query(default=0, ge=0, description="Смещение для пагинации"),
+    cursor: str | None = Query(
+        default=None,
+        description="Курсор следующей страницы из заголовка X-Next-Cursor. "
+        "Если указан, X-Total-Count не возвращается, а offset игнорируется.",
+    ),
     category: str | None = Query(default=None, description="Будут возвращены промокоды с указанной категорией."),
     active: bool | None = Query(
         default=None,
@@ -92,12 +98,13 @@ async def get_user_feed(
 ) -> Response:
     try:
         user_id = await oauth2_interactor(token, cache_interactor)
-        total_count, promos_list = await user_interactor(
+        total_count, promos_list, next_cursor = await user_interactor(
             user_id=user_id,
             category=category,
             active=active,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
     except EntityUnauthorizedError as exc:
         return JSONResponse(
@@ -108,7 +115,7 @@ async def get_user_feed(
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content=promos_list,
-        headers={"X-Total-Count": str(total_count)},
+        headers=serialize_pagination_headers(total_count, next_cursor),
     )
 
 
@@ -205,6 +212,11 @@ async def get_promo_comments(
     cache_interactor: FromDishka[CacheAccessTokenInteractor],
     limit: int | None = Query(default=10, ge=0, le=100, description="Количество записей на странице"),
     offset: int | None = Query(default=0, ge=0, description="Смещение для пагинации"),
+    cursor: str | None = Query(
+        default=None,
+        description="Курсор следующей страницы из заголовка X-Next-Cursor. "
+        "Если указан, X-Total-Count не возвращается, а offset игнорируется.",
+    ),
     id: PromoId = Path(
         description="Уникальный ID промокода, выдаётся сервером",
         example="d8f9a687-4ff9-4976-a05c-f1bf1e5e2eec",
@@ -212,7 +224,7 @@ async def get_promo_comments(
 ) -> Response:
     try:
         _ = await oauth2_interactor(token, cache_interactor)
-        total_count, comments = await user_interactor(promo_id=id, limit=limit, offset=offset)
+        total_count, comments, next_cursor = await user_interactor(promo_id=id, limit=limit, offset=offset, cursor=cursor)
     except EntityUnauthorizedError as exc:
         return JSONResponse(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -227,7 +239,7 @@ async def get_promo_comments(
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content=comments,
-        headers={"X-Total-Count": str(total_count)},
+        headers=serialize_pagination_headers(total_count, next_cursor),
     )
 
 
@@ -391,10 +403,17 @@ async def get_user_activations_history(
     cache_interactor: FromDishka[CacheAccessTokenInteractor],
     limit: int | None = Query(default=10, ge=0, le=100, description="Количество записей на странице"),
     offset: int | None = Query(default=0, ge=0, description="Смещение для пагинации"),
+    cursor: str | None = Query(
+        default=None,
+        description="Курсор следующей страницы из заголовка X-Next-Cursor. "
+        "Если указан, X-Total-Count не возвращается, а offset игнорируется.",
+    ),
 ) -> Response:
     try:
         user_id = await oauth2_interactor(token, cache_interactor)
-        total_count, promos_list = await user_interactor(user_id=user_id, limit=limit, offset=offset)
+        total_count, promos_list, next_cursor = await user_interactor(
+            user_id=user_id, limit=limit, offset=offset, cursor=cursor
+        )
     except EntityUnauthorizedError as exc:
         return JSONResponse(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -404,7 +423,7 @@ async def get_user_activations_history(
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content=promos_list,
-        headers={"X-Total-Count": str(total_count)},
+        headers=serialize_pagination_headers(total_count, next_cursor),
     )
 
 
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import logging
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.build import create_async_container
+from app.database.postgres.session import get_db
+from app.database.repositories.user import UserRepository
+from app.interactors.pool import PENDING_CODES_KEY, PromoCodePoolInteractor
+from app.ioc.registry import get_providers
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_promo_pool(promo_id: str) -> None:
+    container = create_async_container(get_providers())
+
+    try:
+        engine = await container.get(AsyncEngine)
+        redis = await container.get(Redis)
+        promo_code_pool = await container.get(PromoCodePoolInteractor)
+
+        async for db_session in get_db(engine):
+            codes = await UserRepository(db_session).get_unused_promo_codes(promo_id)
+
+        pending_members = await redis.smembers(PENDING_CODES_KEY)
+        pending = {member.split(":", 1)[1] for member in pending_members if member.startswith(f"{promo_id}:")}
+        codes = [code for code in codes if code not in pending]
+
+        await promo_code_pool.warm(promo_id, codes)
+        logger.info("В пул загружено %d кодов промокода %s", len(codes), promo_id)
+    finally:
+        await container.close()
+
+
+async def recount_promo_counters() -> None:
+    container = create_async_container(get_providers())
+
+    try:
+        engine = await container.get(AsyncEngine)
+
+        async for db_session in get_db(engine):
+            repaired = await UserRepository(db_session).recount_promo_counters()
+
+        logger.info("Счётчики лайков и комментариев исправлены у %d промокодов", repaired)
+    finally:
+        await container.close()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warm_parser = commands.add_parser("warm-promo-pool", help="Загрузить неиспользованные коды UNIQUE промокода в Redis")
+    warm_parser.add_argument("promo_id")
+
+    commands.add_parser(
+        "recount-promo-counters", help="Пересчитать like_count и comment_count по таблицам лайков и комментариев"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "warm-promo-pool":
+        asyncio.run(warm_promo_pool(args.promo_id))
+    elif args.command == "recount-promo-counters":
+        asyncio.run(recount_promo_counters())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from os import getenv
+from os import cpu_count, getenv
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -7,6 +7,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def get_worker_share(budget: int) -> int:
+    # Бюджет соединений общий на все воркеры uvicorn, поэтому каждый процесс получает свою долю.
+    return max(budget // int(getenv("SERVER_WORKERS", 1)), 1)
+
+
 @dataclass(frozen=True)
 class PostgresConfig:
     POSTGRES_CONN: str | None
@@ -16,6 +21,18 @@ class PostgresConfig:
     POSTGRES_HOST: str | None
     POSTGRES_PORT: int | None
     POSTGRES_DATABASE: str | None
+    POSTGRES_POOL_SIZE: int
+    POSTGRES_MAX_OVERFLOW: int
+    POSTGRES_POOL_TIMEOUT: float
+    POSTGRES_POOL_RECYCLE: int
+    POSTGRES_POOL_PRE_PING: bool
+    POSTGRES_STATEMENT_CACHE_SIZE: int
+    POSTGRES_STATEMENT_TIMEOUT: int
+    POSTGRES_PGBOUNCER: bool
+    POSTGRES_REPLICA_CONNS: tuple[str, ...]
+    POSTGRES_REPLICA_MAX_LAG: float
+    POSTGRES_REPLICA_HEALTH_INTERVAL: float
+    POSTGRES_SCHEMA_MODE: str
 
     @staticmethod
     def from_env() -> "PostgresConfig":
@@ -26,6 +43,23 @@ class PostgresConfig:
         host = getenv("POSTGRES_HOST")
         port = getenv("POSTGRES_PORT")
         database = getenv("POSTGRES_DATABASE")
+        pool_size = int(getenv("POSTGRES_POOL_SIZE", 20))
+        max_overflow = int(getenv("POSTGRES_MAX_OVERFLOW", 10))
+        pool_budget = int(getenv("POSTGRES_POOL_BUDGET", 0))
+        if pool_budget:
+            # Доля бюджета не расширяется переполнением, иначе воркеры вместе выходят за бюджет.
+            pool_size = get_worker_share(pool_budget)
+            max_overflow = 0
+        pool_timeout = float(getenv("POSTGRES_POOL_TIMEOUT", 30.0))
+        pool_recycle = int(getenv("POSTGRES_POOL_RECYCLE", 1800))
+        pool_pre_ping = getenv("POSTGRES_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+        statement_cache_size = int(getenv("POSTGRES_STATEMENT_CACHE_SIZE", 100))
+        statement_timeout = int(getenv("POSTGRES_STATEMENT_TIMEOUT", 0))
+        pgbouncer = getenv("POSTGRES_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+        replica_conns = tuple(conn.strip() for conn in getenv("POSTGRES_REPLICA_CONNS", "").split(",") if conn.strip())
+        replica_max_lag = float(getenv("POSTGRES_REPLICA_MAX_LAG", 5.0))
+        replica_health_interval = float(getenv("POSTGRES_REPLICA_HEALTH_INTERVAL", 1.0))
+        schema_mode = getenv("POSTGRES_SCHEMA_MODE", "create_all").lower()
 
         return PostgresConfig(
             POSTGRES_CONN=conn,
@@ -35,6 +69,18 @@ class PostgresConfig:
             POSTGRES_HOST=host,
             POSTGRES_PORT=port,
             POSTGRES_DATABASE=database,
+            POSTGRES_POOL_SIZE=pool_size,
+            POSTGRES_MAX_OVERFLOW=max_overflow,
+            POSTGRES_POOL_TIMEOUT=pool_timeout,
+            POSTGRES_POOL_RECYCLE=pool_recycle,
+            POSTGRES_POOL_PRE_PING=pool_pre_ping,
+            POSTGRES_STATEMENT_CACHE_SIZE=statement_cache_size,
+            POSTGRES_STATEMENT_TIMEOUT=statement_timeout,
+            POSTGRES_PGBOUNCER=pgbouncer,
+            POSTGRES_REPLICA_CONNS=replica_conns,
+            POSTGRES_REPLICA_MAX_LAG=replica_max_lag,
+            POSTGRES_REPLICA_HEALTH_INTERVAL=replica_health_interval,
+            POSTGRES_SCHEMA_MODE=schema_mode,
         )
 
 
@@ -42,26 +88,62 @@ class PostgresConfig:
 class ServerConfig:
     SERVER_ADDRESS: str
     SERVER_PORT: int | None
+    SERVER_WORKERS: int
+    SERVER_LOOP: str
+    SERVER_HTTP: str
+    SERVER_BACKLOG: int
+    SERVER_KEEP_ALIVE: int
+    SERVER_GRACEFUL_TIMEOUT: int
 
     @staticmethod
     def from_env() -> "ServerConfig":
         address = getenv("SERVER_ADDRESS", "0.0.0.0:8080")
         port = getenv("SERVER_PORT", 8080)
+        workers = int(getenv("SERVER_WORKERS", 1))
+        loop = getenv("SERVER_LOOP", "auto")
+        http = getenv("SERVER_HTTP", "auto")
+        backlog = int(getenv("SERVER_BACKLOG", 2048))
+        keep_alive = int(getenv("SERVER_KEEP_ALIVE", 5))
+        graceful_timeout = int(getenv("SERVER_GRACEFUL_TIMEOUT", 30))
 
-        return ServerConfig(SERVER_ADDRESS=address, SERVER_PORT=port)
+        return ServerConfig(
+            SERVER_ADDRESS=address,
+            SERVER_PORT=port,
+            SERVER_WORKERS=workers,
+            SERVER_LOOP=loop,
+            SERVER_HTTP=http,
+            SERVER_BACKLOG=backlog,
+            SERVER_KEEP_ALIVE=keep_alive,
+            SERVER_GRACEFUL_TIMEOUT=graceful_timeout,
+        )
 
 
 @dataclass(frozen=True)
 class RedisConfig:
     REDIS_HOST: str
     REDIS_PORT: int
+    REDIS_MAX_CONNECTIONS: int
+    REDIS_CLIENT_CACHE_ENABLED: bool
+    REDIS_CLIENT_CACHE_SIZE: int
 
     @staticmethod
     def from_env() -> "RedisConfig":
         host = getenv("REDIS_HOST", "localhost")
         port = getenv("REDIS_PORT", 6379)
+        max_connections = int(getenv("REDIS_MAX_CONNECTIONS", 100))
+        pool_budget = int(getenv("REDIS_POOL_BUDGET", 0))
+        if pool_budget:
+            max_connections = get_worker_share(pool_budget)
+        client_cache_enabled = getenv("REDIS_CLIENT_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+        client_cache_size = int(getenv("REDIS_CLIENT_CACHE_SIZE", 10000))
 
-        return RedisConfig(REDIS_HOST=host, REDIS_PORT=port)
+        return RedisConfig(
+            REDIS_HOST=host,
+            REDIS_PORT=port,
+            REDIS_MAX_CONNECTIONS=max_connections,
+            REDIS_CLIENT_CACHE_ENABLED=client_cache_enabled,
+            REDIS_CLIENT_CACHE_SIZE=client_cache_size,
+        )
 
 
 @dataclass(frozen=True)
@@ -69,25 +151,108 @@ class SecurityConfig:
     RANDOM_SECRET: str
     ALGORITH: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    PASSWORD_HASH_WORKERS: int
+    PASSWORD_HASH_QUEUE_SIZE: int
 
     @staticmethod
     def from_env() -> "SecurityConfig":
         secret = getenv("RANDOM_SECRET")
         algorithm = getenv("ALGORITH", "HS256")
-        expire_minutes = getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60)
+        expire_minutes = int(getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
+        hash_workers = int(getenv("PASSWORD_HASH_WORKERS", min(4, cpu_count() or 1)))
+        hash_queue_size = int(getenv("PASSWORD_HASH_QUEUE_SIZE", 64))
 
-        return SecurityConfig(RANDOM_SECRET=secret, ALGORITH=algorithm, ACCESS_TOKEN_EXPIRE_MINUTES=expire_minutes)
+        return SecurityConfig(
+            RANDOM_SECRET=secret,
+            ALGORITH=algorithm,
+            ACCESS_TOKEN_EXPIRE_MINUTES=expire_minutes,
+            PASSWORD_HASH_WORKERS=hash_workers,
+            PASSWORD_HASH_QUEUE_SIZE=hash_queue_size,
+        )
 
 
 @dataclass(frozen=True)
 class AntifraudConfig:
     ANTIFRAUD_ADDRESS: str
+    ANTIFRAUD_LOCK_TTL: float
+    ANTIFRAUD_LOCK_POLL_INTERVAL: float
+    ANTIFRAUD_TIMEOUT: float
+    ANTIFRAUD_MAX_ATTEMPTS: int
+    ANTIFRAUD_RETRY_BACKOFF: float
+    ANTIFRAUD_MAX_CONNECTIONS: int
+    ANTIFRAUD_BREAKER_FAILURES: int
+    ANTIFRAUD_BREAKER_RESET_TIMEOUT: float
+    ANTIFRAUD_HEDGE_ENABLED: bool
+    ANTIFRAUD_FAIL_OPEN: bool
+    ANTIFRAUD_CACHE_ENABLED: bool
+    ANTIFRAUD_CACHE_SIZE: int
 
     @staticmethod
     def from_env() -> "AntifraudConfig":
         address = getenv("ANTIFRAUD_ADDRESS", "localhost:9090")
+        lock_ttl = float(getenv("ANTIFRAUD_LOCK_TTL", 5.0))
+        lock_poll_interval = float(getenv("ANTIFRAUD_LOCK_POLL_INTERVAL", 0.02))
+        timeout = float(getenv("ANTIFRAUD_TIMEOUT", 5.0))
+        max_attempts = int(getenv("ANTIFRAUD_MAX_ATTEMPTS", 2))
+        retry_backoff = float(getenv("ANTIFRAUD_RETRY_BACKOFF", 0.05))
+        max_connections = int(getenv("ANTIFRAUD_MAX_CONNECTIONS", 100))
+        pool_budget = int(getenv("ANTIFRAUD_POOL_BUDGET", 0))
+        if pool_budget:
+            max_connections = get_worker_share(pool_budget)
+        breaker_failures = int(getenv("ANTIFRAUD_BREAKER_FAILURES", 5))
+        breaker_reset_timeout = float(getenv("ANTIFRAUD_BREAKER_RESET_TIMEOUT", 5.0))
+        hedge_enabled = getenv("ANTIFRAUD_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+        fail_open = getenv("ANTIFRAUD_FAIL_OPEN", "false").lower() in ("1", "true", "yes")
+        cache_enabled = getenv("ANTIFRAUD_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        cache_size = int(getenv("ANTIFRAUD_CACHE_SIZE", 10000))
+
+        return AntifraudConfig(
+            ANTIFRAUD_ADDRESS=address,
+            ANTIFRAUD_LOCK_TTL=lock_ttl,
+            ANTIFRAUD_LOCK_POLL_INTERVAL=lock_poll_interval,
+            ANTIFRAUD_TIMEOUT=timeout,
+            ANTIFRAUD_MAX_ATTEMPTS=max_attempts,
+            ANTIFRAUD_RETRY_BACKOFF=retry_backoff,
+            ANTIFRAUD_MAX_CONNECTIONS=max_connections,
+            ANTIFRAUD_BREAKER_FAILURES=breaker_failures,
+            ANTIFRAUD_BREAKER_RESET_TIMEOUT=breaker_reset_timeout,
+            ANTIFRAUD_HEDGE_ENABLED=hedge_enabled,
+            ANTIFRAUD_FAIL_OPEN=fail_open,
+            ANTIFRAUD_CACHE_ENABLED=cache_enabled,
+            ANTIFRAUD_CACHE_SIZE=cache_size,
+        )
+
+
+@dataclass(frozen=True)
+class PromoCodePoolConfig:
+    PROMO_CODE_POOL_ENABLED: bool
+    PROMO_CODE_POOL_BATCH_SIZE: int
+    PROMO_CODE_POOL_RECONCILE_INTERVAL: float
+
+    @staticmethod
+    def from_env() -> "PromoCodePoolConfig":
+        enabled = getenv("PROMO_CODE_POOL_ENABLED", "false").lower() in ("1", "true", "yes")
+        batch_size = int(getenv("PROMO_CODE_POOL_BATCH_SIZE", 500))
+        reconcile_interval = float(getenv("PROMO_CODE_POOL_RECONCILE_INTERVAL", 1.0))
+
+        return PromoCodePoolConfig(
+            PROMO_CODE_POOL_ENABLED=enabled,
+            PROMO_CODE_POOL_BATCH_SIZE=batch_size,
+            PROMO_CODE_POOL_RECONCILE_INTERVAL=reconcile_interval,
+        )
+
+
+@dataclass(frozen=True)
+class TokenCacheConfig:
+    TOKEN_CACHE_ENABLED: bool
+    TOKEN_CACHE_SIZE: int
+
+    @staticmethod
+    def from_env() -> "TokenCacheConfig":
+        enabled = getenv("TOKEN_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        size = int(getenv("TOKEN_CACHE_SIZE", 10000))
 
-        return AntifraudConfig(ANTIFRAUD_ADDRESS=address)
+        return TokenCacheConfig(TOKEN_CACHE_ENABLED=enabled, TOKEN_CACHE_SIZE=size)
 
 
 @dataclass(frozen=True)
@@ -97,6 +262,8 @@ class Config:
     redis_config: RedisConfig
     security_config: SecurityConfig
     antifraud_config: AntifraudConfig
+    promo_code_pool_config: PromoCodePoolConfig
+    token_cache_config: TokenCacheConfig
 
 
 def create_config() -> Config:
@@ -106,4 +273,6 @@ def create_config() -> Config:
         redis_config=RedisConfig.from_env(),
         security_config=SecurityConfig.from_env(),
         antifraud_config=AntifraudConfig.from_env(),
+        promo_code_pool_config=PromoCodePoolConfig.from_env(),
+        token_cache_config=TokenCacheConfig.from_env(),
     )
@@ -1,8 +1,8 @@
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
+from app.core.responses import JSONResponse
 from app.schemas.error import ErrorResponse
 
 
@@ -42,6 +42,12 @@ class EntityAccessDeniedError(Exception):
         super().__init__(self.detail)
 
 
+class ServiceOverloadedError(Exception):
+    def __init__(self, detail="Сервис перегружен, повторите запрос позже."):
+        self.detail = detail
+        super().__init__(self.detail)
+
+
 async def validation_exception_handler(_: Request, __: ValidationError):
     print(__)
     return JSONResponse(
@@ -50,7 +56,16 @@ async def validation_exception_handler(_: Request, __: ValidationError):
     )
 
 
+async def service_overloaded_exception_handler(_: Request, exc: ServiceOverloadedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=ErrorResponse(message=exc.detail).dict(),
+        headers={"Retry-After": "1"},
+    )
+
+
 def setup_exception_handlers(app: FastAPI):
     app.add_exception_handler(ValidationError, validation_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(InvalidRequestDataError, validation_exception_handler)
+    app.add_exception_handler(ServiceOverloadedError, service_overloaded_exception_handler)
@@ -0,0 +1,22 @@
+from collections import defaultdict
+from collections.abc import Callable
+
+
+class Metrics:
+    def __init__(self):
+        self.counters: dict[str, float] = defaultdict(float)
+        self.gauges: dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        self.counters[name] += value
+
+    def register_gauge(self, name: str, callback: Callable[[], float]) -> None:
+        self.gauges[name] = callback
+
+    def snapshot(self) -> dict[str, float]:
+        snapshot = dict(self.counters)
+
+        for name, callback in self.gauges.items():
+            snapshot[name] = callback()
+
+        return dict(sorted(snapshot.items()))
@@ -0,0 +1,22 @@
+import json
+from typing import Any
+
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class JSONResponse(StarletteJSONResponse):
+    # Без orjson тело кодируется так же, как в starlette, поэтому ответы совпадают побайтно при любом кодировщике.
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
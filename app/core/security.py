@@ -1,4 +1,8 @@
+import asyncio
+import time
 import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -6,19 +10,47 @@ from jose import ExpiredSignatureError, JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import SecurityConfig
+from app.core.exceptions import ServiceOverloadedError
+from app.core.metrics import Metrics
 
 
 class Security:
-    def __init__(self, config: SecurityConfig):
+    def __init__(self, config: SecurityConfig, metrics: Metrics):
         self.config = config
+        self.metrics = metrics
 
         self.pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
-    def get_password_hash(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+        # argon2-cffi отпускает GIL, поэтому хэширование в потоках не блокирует event loop и идёт параллельно.
+        self.hash_executor = ThreadPoolExecutor(max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+        self.hash_capacity = config.PASSWORD_HASH_WORKERS + config.PASSWORD_HASH_QUEUE_SIZE
+        self.hash_pending = 0
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+        metrics.register_gauge("password_hash_in_progress", lambda: min(self.hash_pending, config.PASSWORD_HASH_WORKERS))
+        metrics.register_gauge("password_hash_queue_depth", lambda: max(self.hash_pending - config.PASSWORD_HASH_WORKERS, 0))
+
+    async def get_password_hash(self, password: str) -> str:
+        return await self.run_password_hash(self.pwd_context.hash, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run_password_hash(self.pwd_context.verify, plain_password, hashed_password)
+
+    async def run_password_hash(self, func: Callable, *args):
+        if self.hash_pending >= self.hash_capacity:
+            self.metrics.increment("password_hash_rejected_total")
+            raise ServiceOverloadedError
+
+        self.hash_pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.hash_executor, func, *args)
+        finally:
+            self.hash_pending -= 1
+            self.metrics.increment("password_hash_total")
+            self.metrics.increment("password_hash_seconds_total", time.perf_counter() - started)
+
+    def close(self) -> None:
+        self.hash_executor.shutdown(wait=False, cancel_futures=True)
 
     def create_access_token(self, data: dict, expires_delta: timedelta | None = None) -> str:
         to_encode = data.copy()
@@ -5,13 +5,18 @@ from sqlalchemy import (
     UUID,
     Boolean,
     Column,
+    Computed,
     Date,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
+    and_,
+    func,
+    or_,
 )
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -43,6 +48,7 @@ user_promo_likes = Table(
     Base.metadata,
     Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True),
     Column("promo_id", UUID(as_uuid=True), ForeignKey("promos.id"), primary_key=True),
+    Index("ix_user_promo_likes_promo_id", "promo_id"),
 )
 
 
@@ -68,6 +74,8 @@ class UserModel(Base):
     liked_promos = relationship("PromoModel", secondary=user_promo_likes, back_populates="liked_by_users")
     activated_promos = relationship("UserPromoActivationModel", back_populates="user", cascade="all, delete-orphan")
 
+    __table_args__ = (Index("ix_users_lower_country", func.lower(country)),)
+
 
 class UserPromoActivationModel(Base):
     __tablename__ = "user_promo_activations"
@@ -86,6 +94,11 @@ class UserPromoActivationModel(Base):
     user = relationship("UserModel", back_populates="activated_promos")
     promo = relationship("PromoModel", back_populates="activations")
 
+    __table_args__ = (
+        Index("ix_user_promo_activations_user_id_activated_at_id", "user_id", "activated_at", "id"),
+        Index("ix_user_promo_activations_promo_id_user_id", "promo_id", "user_id"),
+    )
+
 
 class PromoModel(Base):
     __tablename__ = "promos"
@@ -101,6 +114,10 @@ class PromoModel(Base):
     image_url = Column(String(350), nullable=True)
     max_count = Column(Integer, nullable=False)
     used_count = Column(Integer, nullable=False, default=0)
+    remaining_count = Column(Integer, nullable=False, default=0, server_default="0")
+    in_stock = Column(Boolean, Computed("remaining_count > 0", persisted=True))
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
     active_from = Column(Date, nullable=True)
     active_until = Column(Date, nullable=True)
     mode = Column(Enum(PromoModeEnum), nullable=False)
@@ -115,6 +132,12 @@ class PromoModel(Base):
     unique_values = relationship("PromoUniqueValueModel", cascade="all, delete-orphan", back_populates="promo")
     targets = relationship("PromoTargetModel", back_populates="promo", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_promos_in_stock_created_at", "in_stock", "created_at"),
+        Index("ix_promos_created_at_id", "created_at", "id"),
+        Index("ix_promos_company_id_created_at_id", "company_id", "created_at", "id"),
+    )
+
     @hybrid_property
     def is_active(self):
         now_date = date.today()
@@ -122,13 +145,17 @@ class PromoModel(Base):
             self.active_until is None or self.active_until >= now_date
         )
 
-        if self.mode == PromoModeEnum.COMMON:
-            return date_cond and (self.used_count < self.max_count)
-        elif self.mode == PromoModeEnum.UNIQUE:
-            is_has_unique_values = any(not unique.is_used for unique in self.unique_values)
-            return date_cond and is_has_unique_values
+        return date_cond and self.remaining_count > 0
+
+    @is_active.expression
+    def is_active(cls):
+        now_date = date.today()
 
-        return False
+        return and_(
+            cls.in_stock,
+            or_(cls.active_from.is_(None), cls.active_from <= now_date),
+            or_(cls.active_until.is_(None), cls.active_until >= now_date),
+        )
 
 
 class PromoUniqueValueModel(Base):
@@ -137,9 +164,18 @@ class PromoUniqueValueModel(Base):
     promo_id = Column(UUID(as_uuid=True), ForeignKey("promos.id"), primary_key=True, nullable=False)
     unique_code = Column(String(30), primary_key=True)
     is_used = Column(Boolean, nullable=False, default=False)
+    position = Column(Integer, nullable=False, default=0, server_default="0")
 
     promo = relationship("PromoModel", back_populates="unique_values")
 
+    __table_args__ = (
+        Index(
+            "ix_promo_unique_values_unused",
+            "promo_id",
+            postgresql_where=is_used.is_(False),
+        ),
+    )
+
 
 class PromoTargetModel(Base):
     __tablename__ = "promo_targets"
@@ -152,6 +188,8 @@ class PromoTargetModel(Base):
 
     promo = relationship("PromoModel", back_populates="targets")
 
+    __table_args__ = (Index("ix_promo_targets_lower_country", func.lower(country)),)
+
 
 class CommentModel(Base):
     __tablename__ = "comments"
@@ -170,3 +208,5 @@ class CommentModel(Base):
 
     author = relationship("UserModel", back_populates="comments")
     promo = relationship("PromoModel", back_populates="comments")
+
+    __table_args__ = (Index("ix_comments_promo_id_date_id", "promo_id", "date", "id"),)
@@ -0,0 +1,136 @@
+import asyncio
+import contextlib
+import functools
+import itertools
+import logging
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.core.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ROUTER_KEY = "replica_router"
+READ_ONLY_KEY = "read_only"
+REPLICA_KEY = "replica"
+USED_PRIMARY_KEY = "used_primary"
+
+# Пока реплика догоняет WAL, время последней проигранной транзакции отстаёт от now(). Если догонять нечего,
+# отставание нулевое, даже когда на мастере давно не было записей.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+primary_reads_only: ContextVar[bool] = ContextVar("primary_reads_only", default=False)
+
+T = TypeVar("T")
+
+
+class ReplicaRouter:
+    def __init__(self, engines: list[AsyncEngine], max_lag: float, health_interval: float, metrics: Metrics):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.health_interval = health_interval
+        self.metrics = metrics
+        self.healthy: list[AsyncEngine] = []
+        self.counter = itertools.count()
+        self.task: asyncio.Task | None = None
+
+        metrics.register_gauge("db_replicas_healthy", lambda: len(self.healthy))
+
+    async def start(self) -> None:
+        if not self.engines:
+            return
+
+        await self.check_health()
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+
+        for engine in self.engines:
+            await engine.dispose()
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self.check_health()
+
+    async def check_health(self) -> None:
+        results = await asyncio.gather(*(self.is_healthy(engine) for engine in self.engines))
+        self.healthy = [engine for engine, healthy in zip(self.engines, results, strict=True) if healthy]
+
+    async def is_healthy(self, engine: AsyncEngine) -> bool:
+        try:
+            async with engine.connect() as conn:
+                lag = await asyncio.wait_for(conn.scalar(REPLICA_LAG_QUERY), timeout=self.health_interval)
+        except (SQLAlchemyError, OSError, TimeoutError):
+            logger.warning("Реплика %s недоступна", engine.url.render_as_string(hide_password=True))
+            return False
+
+        return lag <= self.max_lag
+
+    def choose(self) -> AsyncEngine | None:
+        healthy = self.healthy
+        if not healthy:
+            if self.engines:
+                self.metrics.increment("db_replica_fallback_total")
+            return None
+
+        return healthy[next(self.counter) % len(healthy)]
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.get_replica()
+        if replica is not None:
+            self.info[REPLICA_ROUTER_KEY].metrics.increment("db_replica_reads_total")
+            return replica.sync_engine
+
+        # После первого обращения к мастеру сессия остаётся на нём, чтобы запрос видел свои же записи.
+        self.info[USED_PRIMARY_KEY] = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def get_replica(self) -> AsyncEngine | None:
+        router = self.info.get(REPLICA_ROUTER_KEY)
+        if router is None or not self.info.get(READ_ONLY_KEY) or self.info.get(USED_PRIMARY_KEY):
+            return None
+
+        # Все чтения сессии идут в одну реплику, чтобы они видели один и тот же момент репликации.
+        if REPLICA_KEY not in self.info:
+            self.info[REPLICA_KEY] = router.choose()
+
+        return self.info[REPLICA_KEY]
+
+
+def read_only(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        info = self.db_session.info
+        previous = info.get(READ_ONLY_KEY, False)
+
+        info[READ_ONLY_KEY] = not primary_reads_only.get()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            info[READ_ONLY_KEY] = previous
+
+    return wrapper
+
+
+async def read_from_primary() -> None:
+    primary_reads_only.set(True)
@@ -1,25 +1,153 @@
+import time
+import uuid
 from collections.abc import AsyncIterable
+from pathlib import Path
 
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from app.core.config import PostgresConfig
+from app.core.metrics import Metrics
 from app.database.postgres.base import Base
+from app.database.postgres.routing import REPLICA_ROUTER_KEY, ReplicaRouter, RoutingSession
 
+ALEMBIC_SCRIPT_LOCATION = Path(__file__).resolve().parents[3] / "alembic"
 
-async def create_engine(DB_URI: str) -> AsyncIterable[AsyncSession]:
-    engine = create_async_engine(url=DB_URI, echo=False, future=True)
+SCHEMA_MODE_VERIFY = "verify"
+SCHEMA_MODE_CREATE_ALL = "create_all"
+SCHEMA_MODE_SKIP = "skip"
+
+
+class SchemaRevisionMismatchError(Exception):
+    def __init__(self, expected: set[str], actual: set[str]):
+        self.detail = (
+            f"Ревизия схемы базы {sorted(actual) or 'отсутствует'} не совпадает с головой миграций {sorted(expected)}, "
+            "выполните alembic upgrade head."
+        )
+        super().__init__(self.detail)
+
+
+class MeasuredQueuePool(AsyncAdaptedQueuePool):
+    checkouts = 0
+    checkout_timeouts = 0
+    checkout_wait_seconds = 0.0
+    checkout_timeout_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            self.checkout_timeout_wait_seconds += time.perf_counter() - started
+            raise
+
+        self.checkouts += 1
+        self.checkout_wait_seconds += time.perf_counter() - started
+
+        return connection
+
+
+def get_connect_args(config: PostgresConfig) -> dict:
+    connect_args = {
+        "statement_cache_size": config.POSTGRES_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": config.POSTGRES_STATEMENT_CACHE_SIZE,
+    }
+
+    if config.POSTGRES_STATEMENT_TIMEOUT:
+        connect_args["server_settings"] = {"statement_timeout": str(config.POSTGRES_STATEMENT_TIMEOUT)}
+
+    # В transaction mode PgBouncer соседние запросы попадают на разные серверные соединения,
+    # поэтому подготовленные выражения нельзя кэшировать, а их имена не должны повторяться.
+    if config.POSTGRES_PGBOUNCER:
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+    return connect_args
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+
+def build_engine(DB_URI: str, config: PostgresConfig) -> AsyncEngine:
+    return create_async_engine(
+        url=DB_URI,
+        echo=False,
+        future=True,
+        poolclass=MeasuredQueuePool,
+        pool_size=config.POSTGRES_POOL_SIZE,
+        max_overflow=config.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=config.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=config.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=config.POSTGRES_POOL_PRE_PING,
+        connect_args=get_connect_args(config),
+    )
+
+
+async def create_engine(DB_URI: str, config: PostgresConfig) -> AsyncIterable[AsyncSession]:
+    engine = build_engine(DB_URI, config)
+
+    try:
+        await prepare_schema(engine, config.POSTGRES_SCHEMA_MODE)
+    except Exception:
+        await engine.dispose()
+        raise
 
     yield engine
     await engine.dispose()
 
 
+def register_pool_metrics(engine: AsyncEngine, metrics: Metrics) -> None:
+    # engine.pool пересоздаётся при dispose(), поэтому пул берётся заново при каждом чтении.
+    metrics.register_gauge("db_pool_size", lambda: engine.pool.size())
+    metrics.register_gauge("db_pool_checked_out", lambda: engine.pool.checkedout())
+    metrics.register_gauge("db_pool_idle", lambda: engine.pool.checkedin())
+    metrics.register_gauge("db_pool_overflow", lambda: max(engine.pool.overflow(), 0))
+    metrics.register_gauge("db_pool_checkouts_total", lambda: engine.pool.checkouts)
+    metrics.register_gauge("db_pool_checkout_timeouts_total", lambda: engine.pool.checkout_timeouts)
+    metrics.register_gauge("db_pool_checkout_wait_seconds_total", lambda: engine.pool.checkout_wait_seconds)
+    metrics.register_gauge("db_pool_checkout_timeout_wait_seconds_total", lambda: engine.pool.checkout_timeout_wait_seconds)
+
+
 async def create_all_tables(engine: AsyncEngine) -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
-async def get_db(engine: AsyncEngine) -> AsyncIterable[AsyncSession]:
-    async with AsyncSession(bind=engine, expire_on_commit=False) as db_session:
+def get_migration_heads() -> set[str]:
+    return set(ScriptDirectory(str(ALEMBIC_SCRIPT_LOCATION)).get_heads())
+
+
+async def verify_schema_revision(engine: AsyncEngine) -> None:
+    expected = get_migration_heads()
+
+    async with engine.connect() as conn:
+        try:
+            actual = set(await conn.scalars(text("SELECT version_num FROM alembic_version")))
+        except ProgrammingError:
+            actual = set()
+
+    if actual != expected:
+        raise SchemaRevisionMismatchError(expected, actual)
+
+
+async def prepare_schema(engine: AsyncEngine, mode: str) -> None:
+    if mode == SCHEMA_MODE_VERIFY:
+        await verify_schema_revision(engine)
+    elif mode == SCHEMA_MODE_CREATE_ALL:
+        # Режим по умолчанию, как и до появления проверки ревизии: создаёт недостающие таблицы в обход alembic.
+        await create_all_tables(engine)
+    elif mode != SCHEMA_MODE_SKIP:
+        raise ValueError(f"Неизвестный POSTGRES_SCHEMA_MODE: {mode}")
+
+
+async def get_db(engine: AsyncEngine, replica_router: ReplicaRouter | None = None) -> AsyncIterable[AsyncSession]:
+    async with AsyncSession(
+        bind=engine,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        info={REPLICA_ROUTER_KEY: replica_router},
+    ) as db_session:
         yield db_session
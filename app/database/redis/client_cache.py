@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+
+from app.core.config import RedisConfig
+from app.core.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+TRACKED_PREFIXES = ("user_token:", "company_token:", "antifraud:")
+
+
+class RedisClientSideCache:
+    def __init__(self, redis: Redis, config: RedisConfig, metrics: Metrics):
+        self.redis = redis
+        self.metrics = metrics
+        self.enabled = config.REDIS_CLIENT_CACHE_ENABLED
+        self.max_size = config.REDIS_CLIENT_CACHE_SIZE
+        self.values: OrderedDict[str, tuple[str | None, float]] = OrderedDict()
+        self.generation = 0
+        self.tracking = False
+        self.task: asyncio.Task | None = None
+
+        metrics.register_gauge("redis_client_cache_size", lambda: len(self.values))
+
+    async def start(self) -> None:
+        if self.enabled:
+            self.task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.task
+
+    async def listen(self) -> None:
+        pool = self.redis.connection_pool
+
+        while True:
+            connection = pool.connection_class(**pool.connection_kwargs)
+            try:
+                await connection.connect()
+
+                # BCAST присылает инвалидации по префиксам независимо от того, каким соединением пула читался ключ.
+                # Инвалидации перенаправляются в канал на этом же соединении, поэтому отслеживание живёт ровно столько же,
+                # сколько подписка.
+                await connection.send_command("CLIENT", "ID")
+                client_id = await connection.read_response()
+
+                prefixes = [arg for prefix in TRACKED_PREFIXES for arg in ("PREFIX", prefix)]
+                await connection.send_command("CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", *prefixes)
+                await connection.read_response()
+
+                await connection.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+                await connection.read_response()
+                self.tracking = True
+
+                while True:
+                    _, _, keys = await connection.read_response()
+
+                    if keys is None:
+                        self.clear()
+                    else:
+                        for key in keys:
+                            self.invalidate(key)
+            except Exception:
+                logger.exception("Потеряно соединение для инвалидаций клиентского кэша Redis")
+            finally:
+                self.tracking = False
+                self.clear()
+                await connection.disconnect()
+
+            await asyncio.sleep(1)
+
+    async def get(self, key: str) -> str | None:
+        if not self.tracking or not key.startswith(TRACKED_PREFIXES):
+            return await self.redis.get(key)
+
+        entry = self.values.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self.values.move_to_end(key)
+            self.metrics.increment("redis_client_cache_hits_total")
+            return entry[0]
+
+        self.metrics.increment("redis_client_cache_misses_total")
+
+        generation = self.generation
+        async with self.redis.pipeline(transaction=False) as pipe:
+            value, ttl_ms = await pipe.get(key).pttl(key).execute()
+
+        # Инвалидация, пришедшая во время чтения, могла относиться к уже прочитанному значению.
+        if generation == self.generation:
+            expires_at = time.monotonic() + ttl_ms / 1000 if ttl_ms > 0 else math.inf
+            self.values[key] = (value, expires_at)
+            self.values.move_to_end(key)
+
+            while len(self.values) > self.max_size:
+                self.values.popitem(last=False)
+
+        return value
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        await self.redis.set(key, value, ex=ex)
+        self.invalidate(key)
+
+    def invalidate(self, key: str) -> None:
+        self.generation += 1
+        self.values.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.values.clear()
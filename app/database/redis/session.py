@@ -1,13 +1,22 @@
 from collections.abc import AsyncIterable
 
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 
 
-async def get_redis(host: str, port: int, db: int = 0, decode_responses: bool = True) -> AsyncIterable[Redis]:
-    redis_client = Redis(host=host, port=port, db=db, decode_responses=decode_responses)
+async def get_redis(
+    host: str, port: int, db: int = 0, decode_responses: bool = True, max_connections: int = 100
+) -> AsyncIterable[Redis]:
+    pool = BlockingConnectionPool(
+        host=host,
+        port=port,
+        db=db,
+        decode_responses=decode_responses,
+        max_connections=max_connections,
+    )
+    redis_client = Redis.from_pool(pool)
 
     try:
         await redis_client.ping()
         yield redis_client
     finally:
-        await redis_client.close()
+        await redis_client.aclose()
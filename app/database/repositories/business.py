@@ -1,8 +1,9 @@
 from collections.abc import Iterable
-from datetime import date
+from datetime import date, datetime
 from typing import List, Optional, Tuple
 
-from sqlalchemy import desc, func, or_
+from sqlalchemy import Row, desc, func, or_, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -21,9 +22,11 @@ from app.database.postgres.models import (
     UserModel,
     UserPromoActivationModel,
 )
+from app.database.postgres.routing import read_only
 from app.schemas.business import BusinessCompanyRegister, PromoCreate, PromoPatch
 from app.schemas.common import CompanyId, Country, Email, PromoId
 from app.schemas.enums import PromoModeEnum, PromoSortByEnum
+from app.utils.cursor import decode_cursor, encode_cursor
 
 
 class BusinessCompanyRepository:
@@ -31,7 +34,7 @@ class BusinessCompanyRepository:
         self.db_session = db_session
 
     async def create_new_company(self, company: BusinessCompanyRegister, security: Security) -> BusinessCompanyModel:
-        hashed_password = security.get_password_hash(company.password)
+        hashed_password = await security.get_password_hash(company.password)
         new_company = BusinessCompanyModel(
             name=company.name,
             email=company.email,
@@ -55,6 +58,7 @@ class BusinessCompanyRepository:
             description=promo.description,
             image_url=str(promo.image_url) if promo.image_url else None,
             max_count=promo.max_count,
+            remaining_count=len(promo.promo_unique) if promo.mode == PromoModeEnum.UNIQUE else promo.max_count,
             active_from=promo.active_from,
             active_until=promo.active_until,
             mode=promo.mode,
@@ -77,7 +81,10 @@ class BusinessCompanyRepository:
         await self.db_session.flush()
 
         if promo.mode == PromoModeEnum.UNIQUE:
-            unique_values = [PromoUniqueValueModel(promo_id=new_promo.id, unique_code=value) for value in promo.promo_unique]
+            unique_values = [
+                PromoUniqueValueModel(promo_id=new_promo.id, unique_code=value, position=position)
+                for position, value in enumerate(promo.promo_unique)
+            ]
             self.db_session.add_all(unique_values)
 
         await self.db_session.commit()
@@ -85,6 +92,7 @@ class BusinessCompanyRepository:
 
         return new_promo
 
+    @read_only
     async def get_promos_for_company(
         self,
         company_id: CompanyId,
@@ -92,59 +100,64 @@ class BusinessCompanyRepository:
         country: list[Country] | None = None,
         limit: int = 10,
         offset: int = 0,
-    ) -> tuple[int, Iterable[PromoModel]]:
-        query = (
-            select(PromoModel)
-            .options(
-                selectinload(PromoModel.targets),
-                selectinload(PromoModel.unique_values),
-                selectinload(PromoModel.liked_by_users),
-                selectinload(PromoModel.company),
-            )
-            .where(PromoModel.company_id == company_id)
-        )
+        cursor: str | None = None,
+    ) -> tuple[int | None, Iterable[Row], str | None]:
+        query = self.get_promo_read_only_query().where(PromoModel.company_id == company_id)
 
         if country:
             country_lower = [c.lower() for c in country]
-            query = query.outerjoin(PromoTargetModel, PromoTargetModel.promo_id == PromoModel.id).where(
+            query = query.where(
                 or_(
                     PromoTargetModel.country.is_(None),
                     func.lower(PromoTargetModel.country).in_(country_lower),
                 )
             )
 
-        total_count_query = query.with_only_columns(func.count()).order_by(None)
-        total_count = (await self.db_session.execute(total_count_query)).scalar()
-
         if sort_by == PromoSortByEnum.ACTIVE_FROM:
-            query = query.order_by(desc(func.coalesce(PromoModel.active_from, date.min)))
+            cursor_key, cursor_type = "active_from", date
+            sort_column = func.coalesce(PromoModel.active_from, date.min)
         elif sort_by == PromoSortByEnum.ACTIVE_UNTIL:
-            query = query.order_by(desc(func.coalesce(PromoModel.active_until, date.max)))
+            cursor_key, cursor_type = "active_until", date
+            sort_column = func.coalesce(PromoModel.active_until, date.max)
+        else:
+            cursor_key, cursor_type = "created_at", datetime
+            sort_column = PromoModel.created_at
+
+        total_count = None
+        if cursor is None:
+            total_count_query = query.with_only_columns(func.count()).order_by(None)
+            total_count = (await self.db_session.execute(total_count_query)).scalar()
         else:
-            query = query.order_by(desc(PromoModel.created_at))
+            sort_value, promo_id = decode_cursor(cursor, cursor_key, cursor_type)
+            query = query.where(tuple_(sort_column, PromoModel.id) < tuple_(sort_value, promo_id))
+            # Курсор уже указывает на начало страницы, смещение после него пропускало бы строки.
+            offset = 0
 
-        query = query.limit(limit).offset(offset)
+        query = query.order_by(desc(sort_column), desc(PromoModel.id)).limit(limit).offset(offset)
 
         result = await self.db_session.execute(query)
-        promos = result.scalars().all()
+        promos = result.all()
 
-        return total_count, promos
+        next_cursor = None
+        if limit and len(promos) == limit:
+            last_promo = promos[-1]
+            if sort_by == PromoSortByEnum.ACTIVE_FROM:
+                sort_value = last_promo.active_from or date.min
+            elif sort_by == PromoSortByEnum.ACTIVE_UNTIL:
+                sort_value = last_promo.active_until or date.max
+            else:
+                sort_value = last_promo.created_at
 
-    async def get_company_promo_by_id(self, company_id: CompanyId, promo_id: PromoId) -> PromoModel:
-        query = (
-            select(PromoModel)
-            .options(
-                selectinload(PromoModel.targets),
-                selectinload(PromoModel.unique_values),
-                selectinload(PromoModel.liked_by_users),
-                selectinload(PromoModel.company),
-                selectinload(PromoModel.activations),
-            )
-            .where(PromoModel.id == promo_id)
-        )
+            next_cursor = encode_cursor(cursor_key, sort_value, last_promo.id)
+
+        return total_count, promos, next_cursor
+
+    @read_only
+    async def get_company_promo_by_id(self, company_id: CompanyId, promo_id: PromoId) -> Row:
+        query = self.get_promo_read_only_query().where(PromoModel.id == promo_id)
 
         result = await self.db_session.execute(query)
-        promo = result.scalars().one_or_none()
+        promo = result.one_or_none()
 
         if not promo:
             raise EntityNotFoundError("Промокод не найден.")
@@ -154,18 +167,8 @@ class BusinessCompanyRepository:
 
         return promo
 
-    async def patch_company_promo_by_id(self, company_id: CompanyId, promo_id: PromoId, promo_patch: PromoPatch) -> PromoModel:
-        query = (
-            select(PromoModel)
-            .options(
-                selectinload(PromoModel.targets),
-                selectinload(PromoModel.unique_values),
-                selectinload(PromoModel.liked_by_users),
-                selectinload(PromoModel.company),
-            )
-            .where(PromoModel.id == promo_id)
-            .with_for_update()
-        )
+    async def patch_company_promo_by_id(self, company_id: CompanyId, promo_id: PromoId, promo_patch: PromoPatch) -> Row:
+        query = select(PromoModel).options(selectinload(PromoModel.targets)).where(PromoModel.id == promo_id).with_for_update()
 
         result = await self.db_session.execute(query)
         promo = result.scalars().one_or_none()
@@ -189,6 +192,9 @@ class BusinessCompanyRepository:
                 raise InvalidRequestDataError
 
             promo.max_count = promo_patch.max_count
+
+            if promo.mode == PromoModeEnum.COMMON:
+                promo.remaining_count = promo.max_count - promo.used_count
         if promo_patch.active_from is not None:
             promo.active_from = promo_patch.active_from
         if promo_patch.active_until is not None:
@@ -203,10 +209,10 @@ class BusinessCompanyRepository:
             self.db_session.add(target)
 
         await self.db_session.commit()
-        await self.db_session.refresh(promo)
 
-        return promo
+        return await self.get_company_promo_by_id(company_id, promo_id)
 
+    @read_only
     async def get_promo_activations_by_country(self, promo_id: PromoId) -> list[tuple[str, int]]:
         query = (
             select(
@@ -221,3 +227,41 @@ class BusinessCompanyRepository:
 
         result = await self.db_session.execute(query)
         return result.all()
+
+    @classmethod
+    def get_promo_read_only_query(cls) -> select:
+        # Только колонки ответа: строки не попадают в identity map сессии и не тянут связанные объекты.
+        # У промокода не больше одной строки в promo_targets, поэтому внешнее соединение не размножает строки.
+        # Коды отдаются в том порядке, в котором их передала компания.
+        promo_unique = (
+            select(func.array_agg(aggregate_order_by(PromoUniqueValueModel.unique_code, PromoUniqueValueModel.position)))
+            .where(PromoUniqueValueModel.promo_id == PromoModel.id)
+            .correlate(PromoModel)
+            .scalar_subquery()
+        )
+
+        return (
+            select(
+                PromoModel.id,
+                PromoModel.description,
+                PromoModel.image_url,
+                PromoModel.max_count,
+                PromoModel.active_from,
+                PromoModel.active_until,
+                PromoModel.mode,
+                PromoModel.promo_common,
+                PromoModel.company_id,
+                BusinessCompanyModel.name.label("company_name"),
+                PromoModel.like_count,
+                PromoModel.used_count,
+                PromoModel.is_active.label("active"),
+                PromoModel.created_at,
+                PromoTargetModel.age_from,
+                PromoTargetModel.age_until,
+                PromoTargetModel.country,
+                PromoTargetModel.categories,
+                promo_unique.label("promo_unique"),
+            )
+            .join(BusinessCompanyModel, BusinessCompanyModel.id == PromoModel.company_id)
+            .outerjoin(PromoTargetModel, PromoTargetModel.promo_id == PromoModel.id)
+        )
@@ -1,8 +1,12 @@
+import uuid
+from collections import Counter
 from collections.abc import Iterable
-from datetime import date
-from typing import Tuple
+from datetime import date, datetime
+from typing import NoReturn, Tuple
 
-from sqlalchemy import and_, func, or_
+from sqlalchemy import Row, and_, delete, func, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -14,16 +18,20 @@ from app.core.exceptions import (
 )
 from app.core.security import Security
 from app.database.postgres.models import (
+    BusinessCompanyModel,
     CommentModel,
     PromoModel,
     PromoTargetModel,
     PromoUniqueValueModel,
     UserModel,
     UserPromoActivationModel,
+    user_promo_likes,
 )
+from app.database.postgres.routing import read_only
 from app.schemas.common import CommentId, CommentText, Email, PromoId, UserId
 from app.schemas.enums import PromoModeEnum
 from app.schemas.user import UserPatch, UserRegister
+from app.utils.cursor import decode_cursor, encode_cursor
 from app.utils.time import get_comment_date
 
 
@@ -32,7 +40,7 @@ class UserRepository:
         self.db_session = db_session
 
     async def create_new_user(self, user: UserRegister, security: Security) -> UserModel:
-        hashed_password = security.get_password_hash(user.password)
+        hashed_password = await security.get_password_hash(user.password)
         new_user = UserModel(
             name=user.name,
             surname=user.surname,
@@ -77,22 +85,19 @@ class UserRepository:
         if user_patch.avatar_url:
             user.avatar_url = str(user_patch.avatar_url)
         if user_patch.password:
-            user.password = security.get_password_hash(user_patch.password)
+            user.password = await security.get_password_hash(user_patch.password)
 
         await self.db_session.commit()
         await self.db_session.refresh(user)
 
         return user
 
+    @read_only
     async def get_promos_for_user(
-        self, user_id: UserId, category: str, active: bool, limit: int, offset: int
-    ) -> tuple[int, Iterable[PromoModel]]:
-        query = select(PromoModel).options(
-            selectinload(PromoModel.liked_by_users),
-            selectinload(PromoModel.company),
-            selectinload(PromoModel.comments),
-            selectinload(PromoModel.activations),
-            selectinload(PromoModel.unique_values),
+        self, user_id: UserId, category: str, active: bool, limit: int, offset: int, cursor: str | None = None
+    ) -> tuple[int | None, Iterable[Row], str | None]:
+        query = select(*self.get_promo_for_user_projection(user_id)).join(
+            BusinessCompanyModel, BusinessCompanyModel.id == PromoModel.company_id
         )
 
         if active is not None:
@@ -121,31 +126,38 @@ class UserRepository:
         user_target_subquery = self.get_user_promo_target_query(user_age, user_country)
         query = query.where(or_(~PromoModel.targets.any(), PromoModel.id.in_(user_target_subquery)))
 
-        total_count_query = query.with_only_columns(func.count()).order_by(None)
-        total_count = (await self.db_session.execute(total_count_query)).scalar()
+        total_count = None
+        if cursor is None:
+            total_count_query = query.with_only_columns(func.count()).order_by(None)
+            total_count = (await self.db_session.execute(total_count_query)).scalar()
+        else:
+            created_at, promo_id = decode_cursor(cursor, "created_at", datetime)
+            query = query.where(tuple_(PromoModel.created_at, PromoModel.id) < tuple_(created_at, promo_id))
+            # Курсор уже указывает на начало страницы, смещение после него пропускало бы строки.
+            offset = 0
 
-        query = query.order_by(PromoModel.created_at.desc()).limit(limit).offset(offset)
+        query = query.order_by(PromoModel.created_at.desc(), PromoModel.id.desc()).limit(limit).offset(offset)
 
         result = await self.db_session.execute(query)
-        promos = result.scalars().all()
+        promos = result.all()
+
+        next_cursor = None
+        if limit and len(promos) == limit:
+            last_promo = promos[-1]
+            next_cursor = encode_cursor("created_at", last_promo.created_at, last_promo.id)
 
-        return total_count, promos
+        return total_count, promos, next_cursor
 
-    async def get_promo_for_user_by_id(self, promo_id: PromoId) -> PromoModel:
+    @read_only
+    async def get_promo_for_user_by_id(self, user_id: UserId, promo_id: PromoId) -> Row:
         query = (
-            select(PromoModel)
+            select(*self.get_promo_for_user_projection(user_id))
+            .join(BusinessCompanyModel, BusinessCompanyModel.id == PromoModel.company_id)
             .where(PromoModel.id == promo_id)
-            .options(
-                selectinload(PromoModel.liked_by_users),
-                selectinload(PromoModel.company),
-                selectinload(PromoModel.comments),
-                selectinload(PromoModel.activations),
-                selectinload(PromoModel.unique_values),
-            )
         )
 
         result = await self.db_session.execute(query)
-        promo = result.scalars().one_or_none()
+        promo = result.one_or_none()
 
         if not promo:
             raise EntityNotFoundError("Промокод не найден.")
@@ -153,44 +165,59 @@ class UserRepository:
         return promo
 
     async def add_like_to_promo(self, user_id: UserId, promo_id: PromoId) -> None:
-        user_query = select(UserModel).where(UserModel.id == user_id).options(selectinload(UserModel.liked_promos))
-        user_result = await self.db_session.execute(user_query)
-        user = user_result.scalars().one_or_none()
+        inserted_like = (
+            insert(user_promo_likes)
+            .values(user_id=user_id, promo_id=promo_id)
+            .on_conflict_do_nothing()
+            .returning(user_promo_likes.c.promo_id)
+            .cte("inserted_like")
+        )
+        query = (
+            update(PromoModel)
+            .where(PromoModel.id.in_(select(inserted_like.c.promo_id)))
+            .values(like_count=PromoModel.like_count + 1)
+            .execution_options(synchronize_session=False)
+        )
 
-        if not user:
-            raise EntityUnauthorizedError
+        try:
+            await self.db_session.execute(query)
+        except IntegrityError:
+            await self.db_session.rollback()
 
-        promo_query = select(PromoModel).where(PromoModel.id == promo_id).options(selectinload(PromoModel.liked_by_users))
-        promo_result = await self.db_session.execute(promo_query)
-        promo = promo_result.scalars().one_or_none()
+            # Нарушение внешнего ключа на промокод означает, что его нет, остальные ошибки не маскируются под 404.
+            promo_query = select(select(PromoModel.id).where(PromoModel.id == promo_id).exists())
+            if not (await self.db_session.execute(promo_query)).scalar():
+                raise EntityNotFoundError("Промокод не найден.") from None
 
-        if not promo:
-            raise EntityNotFoundError("Промокод не найден.")
+            raise
 
-        if promo not in user.liked_promos:
-            user.liked_promos.append(promo)
-            await self.db_session.commit()
+        await self.db_session.commit()
 
     async def delete_like_to_promo(self, user_id: UserId, promo_id: PromoId) -> None:
-        user_query = select(UserModel).where(UserModel.id == user_id).options(selectinload(UserModel.liked_promos))
-        user_result = await self.db_session.execute(user_query)
-        user = user_result.scalars().one_or_none()
-
-        if not user:
-            raise EntityUnauthorizedError
+        deleted_like = (
+            delete(user_promo_likes)
+            .where(user_promo_likes.c.user_id == user_id, user_promo_likes.c.promo_id == promo_id)
+            .returning(user_promo_likes.c.promo_id)
+            .cte("deleted_like")
+        )
+        query = (
+            update(PromoModel)
+            .where(PromoModel.id.in_(select(deleted_like.c.promo_id)))
+            .values(like_count=PromoModel.like_count - 1)
+            .returning(PromoModel.id)
+            .execution_options(synchronize_session=False)
+        )
 
-        promo_query = select(PromoModel).where(PromoModel.id == promo_id).options(selectinload(PromoModel.liked_by_users))
-        promo_result = await self.db_session.execute(promo_query)
-        promo = promo_result.scalars().one_or_none()
+        result = await self.db_session.execute(query)
+        await self.db_session.commit()
 
-        if not promo:
-            raise EntityNotFoundError("Промокод не найден.")
+        if result.scalar_one_or_none() is None:
+            promo_query = select(select(PromoModel.id).where(PromoModel.id == promo_id).exists())
 
-        if promo in user.liked_promos:
-            user.liked_promos.remove(promo)
-            await self.db_session.commit()
+            if not (await self.db_session.execute(promo_query)).scalar():
+                raise EntityNotFoundError("Промокод не найден.")
 
-    async def add_comment_to_promo(self, user_id: UserId, promo_id: PromoId, comment_text: CommentText) -> CommentModel:
+    async def add_comment_to_promo(self, user_id: UserId, promo_id: PromoId, comment_text: CommentText) -> Row:
         promo_query = select(PromoModel).where(PromoModel.id == promo_id)
         promo_result = await self.db_session.execute(promo_query)
         promo = promo_result.scalars().one_or_none()
@@ -206,40 +233,53 @@ class UserRepository:
         )
 
         self.db_session.add(new_comment)
+        await self.update_promo_counters(promo_id, comment_delta=1)
         await self.db_session.commit()
-        await self.db_session.refresh(new_comment)
-
-        query = select(CommentModel).where(CommentModel.id == new_comment.id).options(selectinload(CommentModel.author))
 
-        result = await self.db_session.execute(query)
-        new_comment = result.scalars().one_or_none()
+        return await self.get_promo_comment_by_id(promo_id, new_comment.id)
 
-        return new_comment
-
-    async def get_promo_comments(self, promo_id: PromoId, limit: int, offset: int) -> tuple[int, Iterable[CommentModel]]:
-        query = select(CommentModel).where(CommentModel.promo_id == promo_id).options(selectinload(CommentModel.author))
+    @read_only
+    async def get_promo_comments(
+        self, promo_id: PromoId, limit: int, offset: int, cursor: str | None = None
+    ) -> tuple[int | None, Iterable[Row], str | None]:
+        query = (
+            select(*self.get_comment_projection())
+            .join(UserModel, UserModel.id == CommentModel.author_id)
+            .where(CommentModel.promo_id == promo_id)
+        )
 
-        total_count_query = query.with_only_columns(func.count()).order_by(None)
-        total_count = (await self.db_session.execute(total_count_query)).scalar()
+        total_count = None
+        if cursor is None:
+            total_count_query = query.with_only_columns(func.count()).order_by(None)
+            total_count = (await self.db_session.execute(total_count_query)).scalar()
+        else:
+            comment_date, comment_id = decode_cursor(cursor, "date", datetime)
+            query = query.where(tuple_(CommentModel.date, CommentModel.id) < tuple_(comment_date, comment_id))
+            offset = 0
 
-        query = query.order_by(CommentModel.date.desc()).limit(limit).offset(offset)
+        query = query.order_by(CommentModel.date.desc(), CommentModel.id.desc()).limit(limit).offset(offset)
 
         result = await self.db_session.execute(query)
-        comments = result.scalars().all()
+        comments = result.all()
+
+        next_cursor = None
+        if limit and len(comments) == limit:
+            next_cursor = encode_cursor("date", comments[-1].date, comments[-1].id)
 
-        return total_count, comments
+        return total_count, comments, next_cursor
 
-    async def get_promo_comment_by_id(self, promo_id: PromoId, comment_id: CommentId) -> CommentModel:
+    @read_only
+    async def get_promo_comment_by_id(self, promo_id: PromoId, comment_id: CommentId) -> Row:
         query = (
-            select(CommentModel)
+            select(*self.get_comment_projection())
+            .join(UserModel, UserModel.id == CommentModel.author_id)
             .where(and_(CommentModel.id == comment_id, CommentModel.promo_id == promo_id))
-            .options(selectinload(CommentModel.author), selectinload(CommentModel.promo))
         )
 
         result = await self.db_session.execute(query)
-        comment = result.scalars().one_or_none()
+        comment = result.one_or_none()
 
-        if not comment or not comment.promo:
+        if not comment:
             raise EntityNotFoundError("Такого промокода или комментария не существует.")
 
         return comment
@@ -250,7 +290,7 @@ class UserRepository:
         promo_id: PromoId,
         comment_id: CommentId,
         comment_text: CommentText,
-    ) -> CommentModel:
+    ) -> Row:
         query = (
             select(CommentModel)
             .where(and_(CommentModel.id == comment_id, CommentModel.promo_id == promo_id))
@@ -269,9 +309,8 @@ class UserRepository:
         comment.text = comment_text
 
         await self.db_session.commit()
-        await self.db_session.refresh(comment)
 
-        return comment
+        return await self.get_promo_comment_by_id(promo_id, comment_id)
 
     async def delete_user_comment_by_id(self, user_id: UserId, promo_id: PromoId, comment_id: CommentId) -> None:
         query = (
@@ -290,112 +329,325 @@ class UserRepository:
             raise EntityAccessDeniedError("Комментарий не принадлежит пользователю.")
 
         await self.db_session.delete(comment)
+        await self.update_promo_counters(promo_id, comment_delta=-1)
         await self.db_session.commit()
 
-    async def activate_promo_by_id(self, user_id: UserId, promo_id: PromoId) -> str:
-        query = select(PromoModel).where(PromoModel.id == promo_id).options(selectinload(PromoModel.unique_values))
+    async def update_promo_counters(self, promo_id: PromoId, like_delta: int = 0, comment_delta: int = 0) -> None:
+        query = (
+            update(PromoModel)
+            .where(PromoModel.id == promo_id)
+            .values(
+                like_count=PromoModel.like_count + like_delta,
+                comment_count=PromoModel.comment_count + comment_delta,
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-        user_data = await self.get_user_by_id(user_id)
+        await self.db_session.execute(query)
 
-        if not user_data:
-            raise EntityUnauthorizedError
+    async def recount_promo_counters(self) -> int:
+        like_count = (
+            select(func.count())
+            .select_from(user_promo_likes)
+            .where(user_promo_likes.c.promo_id == PromoModel.id)
+            .scalar_subquery()
+        )
+        comment_count = select(func.count(CommentModel.id)).where(CommentModel.promo_id == PromoModel.id).scalar_subquery()
 
-        user_age, user_country = user_data.age, user_data.country
+        query = (
+            update(PromoModel)
+            .where(or_(PromoModel.like_count != like_count, PromoModel.comment_count != comment_count))
+            .values(like_count=like_count, comment_count=comment_count)
+            .execution_options(synchronize_session=False)
+        )
 
-        user_target_subquery = self.get_user_promo_target_query(user_age, user_country)
-        query = query.where(or_(~PromoModel.targets.any(), PromoModel.id.in_(user_target_subquery)))
+        result = await self.db_session.execute(query)
+        await self.db_session.commit()
 
+        return result.rowcount
+
+    async def check_promo_eligibility(self, user: UserModel, promo_id: PromoId) -> None:
+        target_cond = self.get_user_target_condition(user)
+
+        query = select(self.get_promo_date_condition().label("is_active")).where(PromoModel.id == promo_id, target_cond)
         result = await self.db_session.execute(query)
-        promo = result.scalars().one_or_none()
+        is_active = result.scalar_one_or_none()
 
-        if not promo:
+        if is_active is None:
             raise EntityNotFoundError("Промокод не найден.")
 
-        if not promo.is_active:
+        if not is_active:
             raise EntityAccessDeniedError("Вы не можете использовать этот промокод.")
 
-        if promo.mode == PromoModeEnum.COMMON:
-            if promo.used_count >= promo.max_count:
-                raise EntityAccessDeniedError("Вы не можете использовать этот промокод.")
+    async def activate_promo_by_id(self, user_id: UserId, promo_id: PromoId, user: UserModel | None = None) -> str:
+        user_data = user or await self.get_user_by_id(user_id)
 
-            promo.used_count += 1
-            code = promo.promo_common
-        else:
-            unique = None
-            for value in promo.unique_values:
-                if not value.is_used:
-                    unique = value
-                    break
+        if not user_data:
+            raise EntityUnauthorizedError
+
+        target_cond = self.get_user_target_condition(user_data)
 
-            if not unique:
-                raise EntityAccessDeniedError("Вы не можете использовать этот промокод.")
+        code = await self.activate_common_promo(promo_id, target_cond)
 
-            code = unique.unique_code
-            unique.is_used = True
+        is_unique = code is None
+        if is_unique:
+            code = await self.activate_unique_promo(promo_id, target_cond)
+
+        if code is None:
+            await self.raise_promo_activation_error(promo_id, target_cond)
 
         activation = UserPromoActivationModel(user_id=user_id, promo_id=promo_id)
 
         self.db_session.add(activation)
 
+        if is_unique:
+            await self.decrement_promo_remaining_count({promo_id: 1})
+
         await self.db_session.commit()
-        await self.db_session.refresh(promo)
 
         return code
 
+    async def add_unique_promo_activation(
+        self, user_id: UserId, promo_id: PromoId, code: str | None, user: UserModel | None = None
+    ) -> None:
+        user_data = user or await self.get_user_by_id(user_id)
+
+        if not user_data:
+            raise EntityUnauthorizedError
+
+        target_cond = self.get_user_target_condition(user_data)
+
+        query = select(PromoModel.id).where(
+            PromoModel.id == promo_id,
+            PromoModel.mode == PromoModeEnum.UNIQUE,
+            self.get_promo_date_condition(),
+            target_cond,
+        )
+        result = await self.db_session.execute(query)
+
+        if code is None or result.scalar_one_or_none() is None:
+            await self.raise_promo_activation_error(promo_id, target_cond)
+
+        activation = UserPromoActivationModel(user_id=user_id, promo_id=promo_id)
+
+        self.db_session.add(activation)
+
+        # Код и остаток обновляются вместе с активацией, чтобы in_stock не ждал сверки пула. Сверка потом
+        # увидит код уже использованным и не уменьшит остаток второй раз.
+        await self.use_unique_codes([(promo_id, code)])
+
+        await self.db_session.commit()
+
+    async def raise_promo_activation_error(self, promo_id: PromoId, target_cond: or_) -> NoReturn:
+        query = select(PromoModel.id).where(PromoModel.id == promo_id, target_cond)
+        result = await self.db_session.execute(query)
+
+        if result.scalar_one_or_none() is None:
+            raise EntityNotFoundError("Промокод не найден.")
+
+        raise EntityAccessDeniedError("Вы не можете использовать этот промокод.")
+
+    async def get_unused_promo_codes(self, promo_id: PromoId) -> list[str]:
+        query = select(PromoUniqueValueModel.unique_code).where(
+            PromoUniqueValueModel.promo_id == promo_id,
+            PromoUniqueValueModel.is_used.is_(False),
+        )
+
+        result = await self.db_session.execute(query)
+
+        return list(result.scalars().all())
+
+    async def mark_unique_codes_used(self, codes: list[tuple[uuid.UUID, str]]) -> None:
+        await self.use_unique_codes(codes)
+        await self.db_session.commit()
+
+    async def use_unique_codes(self, codes: list[tuple[PromoId | uuid.UUID, str]]) -> None:
+        query = (
+            update(PromoUniqueValueModel)
+            .where(
+                tuple_(PromoUniqueValueModel.promo_id, PromoUniqueValueModel.unique_code).in_(codes),
+                PromoUniqueValueModel.is_used.is_(False),
+            )
+            .values(is_used=True)
+            .returning(PromoUniqueValueModel.promo_id)
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await self.db_session.execute(query)
+
+        await self.decrement_promo_remaining_count(Counter(result.scalars().all()))
+
+    async def decrement_promo_remaining_count(self, counts: dict[PromoId, int]) -> None:
+        for promo_id, count in sorted(counts.items()):
+            query = (
+                update(PromoModel)
+                .where(PromoModel.id == promo_id)
+                .values(remaining_count=PromoModel.remaining_count - count)
+                .execution_options(synchronize_session=False)
+            )
+
+            await self.db_session.execute(query)
+
+    async def activate_common_promo(self, promo_id: PromoId, target_cond: or_) -> str | None:
+        query = (
+            update(PromoModel)
+            .where(
+                PromoModel.id == promo_id,
+                PromoModel.mode == PromoModeEnum.COMMON,
+                PromoModel.used_count < PromoModel.max_count,
+                self.get_promo_date_condition(),
+                target_cond,
+            )
+            .values(used_count=PromoModel.used_count + 1, remaining_count=PromoModel.remaining_count - 1)
+            .returning(PromoModel.promo_common)
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await self.db_session.execute(query)
+
+        return result.scalar_one_or_none()
+
+    async def activate_unique_promo(self, promo_id: PromoId, target_cond: or_) -> str | None:
+        free_code_subquery = (
+            select(PromoUniqueValueModel.unique_code)
+            .join(PromoModel, PromoModel.id == PromoUniqueValueModel.promo_id)
+            .where(
+                PromoUniqueValueModel.promo_id == promo_id,
+                PromoUniqueValueModel.is_used.is_(False),
+                PromoModel.mode == PromoModeEnum.UNIQUE,
+                self.get_promo_date_condition(),
+                target_cond,
+            )
+            .limit(1)
+            .with_for_update(skip_locked=True, of=PromoUniqueValueModel)
+            .scalar_subquery()
+        )
+
+        query = (
+            update(PromoUniqueValueModel)
+            .where(
+                PromoUniqueValueModel.promo_id == promo_id,
+                PromoUniqueValueModel.unique_code == free_code_subquery,
+            )
+            .values(is_used=True)
+            .returning(PromoUniqueValueModel.unique_code)
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await self.db_session.execute(query)
+
+        return result.scalar_one_or_none()
+
+    @read_only
     async def get_user_promo_activations_history(
-        self, user_id: UserId, limit: int, offset: int
-    ) -> tuple[int, Iterable[PromoModel]]:
+        self, user_id: UserId, limit: int, offset: int, cursor: str | None = None
+    ) -> tuple[int | None, Iterable[Row], str | None]:
         query = (
-            select(PromoModel)
+            select(
+                *self.get_promo_for_user_projection(user_id),
+                UserPromoActivationModel.activated_at,
+                UserPromoActivationModel.id.label("activation_id"),
+            )
             .join(
                 UserPromoActivationModel,
                 UserPromoActivationModel.promo_id == PromoModel.id,
             )
+            .join(BusinessCompanyModel, BusinessCompanyModel.id == PromoModel.company_id)
             .where(UserPromoActivationModel.user_id == user_id)
-            .options(
-                selectinload(PromoModel.liked_by_users),
-                selectinload(PromoModel.company),
-                selectinload(PromoModel.comments),
-                selectinload(PromoModel.activations),
-                selectinload(PromoModel.unique_values),
-            )
         )
 
-        total_count_query = query.with_only_columns(func.count()).order_by(None)
-        total_count = (await self.db_session.execute(total_count_query)).scalar()
+        total_count = None
+        if cursor is None:
+            total_count_query = query.with_only_columns(func.count()).order_by(None)
+            total_count = (await self.db_session.execute(total_count_query)).scalar()
+        else:
+            activated_at, activation_id = decode_cursor(cursor, "activated_at", datetime)
+            query = query.where(
+                tuple_(UserPromoActivationModel.activated_at, UserPromoActivationModel.id) < tuple_(activated_at, activation_id)
+            )
+            offset = 0
 
-        query = query.order_by(UserPromoActivationModel.activated_at.desc()).limit(limit).offset(offset)
+        query = (
+            query.order_by(UserPromoActivationModel.activated_at.desc(), UserPromoActivationModel.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
 
         result = await self.db_session.execute(query)
-        promos = result.scalars().all()
+        promos = result.all()
 
-        return total_count, promos
+        next_cursor = None
+        if limit and len(promos) == limit:
+            last_promo = promos[-1]
+            next_cursor = encode_cursor("activated_at", last_promo.activated_at, last_promo.activation_id)
+
+        return total_count, promos, next_cursor
 
     @classmethod
-    def get_user_promo_active_condition(cls) -> and_:
-        now_date = date.today()
-        subquery = (
-            select(func.count(PromoUniqueValueModel.promo_id))
-            .filter(
-                PromoUniqueValueModel.promo_id == PromoModel.id,
-                PromoUniqueValueModel.is_used.is_(False),
-            )
-            .scalar_subquery()
+    def get_promo_for_user_columns(cls, user_id: UserId) -> tuple:
+        is_liked_by_user = (
+            select(user_promo_likes.c.promo_id)
+            .where(user_promo_likes.c.promo_id == PromoModel.id, user_promo_likes.c.user_id == user_id)
+            .correlate(PromoModel)
+            .exists()
+        )
+        is_activated_by_user = (
+            select(UserPromoActivationModel.id)
+            .where(UserPromoActivationModel.promo_id == PromoModel.id, UserPromoActivationModel.user_id == user_id)
+            .correlate(PromoModel)
+            .exists()
         )
 
-        active_cond = and_(
-            or_(
-                and_(
-                    PromoModel.mode == PromoModeEnum.COMMON,
-                    PromoModel.used_count < PromoModel.max_count,
-                ),
-                and_(PromoModel.mode == PromoModeEnum.UNIQUE, subquery > 0),
-            ),
+        return (
+            is_liked_by_user.label("is_liked_by_user"),
+            is_activated_by_user.label("is_activated_by_user"),
+        )
+
+    @classmethod
+    def get_promo_for_user_projection(cls, user_id: UserId) -> tuple:
+        return (
+            PromoModel.id,
+            PromoModel.company_id,
+            BusinessCompanyModel.name.label("company_name"),
+            PromoModel.description,
+            PromoModel.image_url,
+            PromoModel.is_active.label("active"),
+            PromoModel.like_count,
+            PromoModel.comment_count,
+            PromoModel.created_at,
+            *cls.get_promo_for_user_columns(user_id),
+        )
+
+    @classmethod
+    def get_comment_projection(cls) -> tuple:
+        return (
+            CommentModel.id,
+            CommentModel.text,
+            CommentModel.date,
+            UserModel.name.label("author_name"),
+            UserModel.surname.label("author_surname"),
+            UserModel.avatar_url.label("author_avatar_url"),
+        )
+
+    @classmethod
+    def get_user_promo_active_condition(cls) -> and_:
+        return PromoModel.is_active
+
+    @classmethod
+    def get_promo_date_condition(cls) -> and_:
+        now_date = date.today()
+        date_cond = and_(
             or_(PromoModel.active_from.is_(None), PromoModel.active_from <= now_date),
             or_(PromoModel.active_until.is_(None), PromoModel.active_until >= now_date),
         )
 
-        return active_cond
+        return date_cond
+
+    @classmethod
+    def get_user_target_condition(cls, user: UserModel) -> or_:
+        user_target_subquery = cls.get_user_promo_target_query(user.age, user.country)
+
+        return or_(~PromoModel.targets.any(), PromoModel.id.in_(user_target_subquery))
 
     @classmethod
     def get_user_promo_target_query(cls, user_age: int, user_country: str) -> select:
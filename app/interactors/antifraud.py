@@ -1,25 +1,247 @@
-from httpx import AsyncClient
+import asyncio
+import time
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
 
+from httpx import AsyncClient, HTTPError
+from redis.asyncio import Redis
+
+from app.core.config import AntifraudConfig
 from app.core.exceptions import EntityAccessDeniedError
-from app.schemas.common import Email, PromoId
+from app.core.metrics import Metrics
+from app.schemas.common import Email, PromoId, UserId
 from app.schemas.user import AntifraudResponse
 
+LATENCY_WINDOW = 1000
+HEDGE_MIN_SAMPLES = 20
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class AntifraudUnavailableError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+
+        # После паузы пропускаем один пробный запрос, остальные продолжают получать отказ до его результата.
+        if self.trial_in_flight:
+            return False
+
+        self.trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
 
 class AntifraudInteractor:
-    def __init__(self, http_client: AsyncClient):
+    def __init__(self, http_client: AsyncClient, config: AntifraudConfig, metrics: Metrics):
         self.http_client = http_client
+        self.metrics = metrics
+        self.timeout = config.ANTIFRAUD_TIMEOUT
+        self.max_attempts = config.ANTIFRAUD_MAX_ATTEMPTS
+        self.retry_backoff = config.ANTIFRAUD_RETRY_BACKOFF
+        self.hedge_enabled = config.ANTIFRAUD_HEDGE_ENABLED
+        self.fail_open = config.ANTIFRAUD_FAIL_OPEN
+        self.breaker = CircuitBreaker(config.ANTIFRAUD_BREAKER_FAILURES, config.ANTIFRAUD_BREAKER_RESET_TIMEOUT)
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+        metrics.register_gauge("antifraud_circuit_open", lambda: float(self.breaker.is_open))
 
     async def __call__(self, user_email: Email, promo_id: PromoId) -> AntifraudResponse:
-        headers = {"Content-Type": "application/json"}
+        if not self.breaker.allow():
+            self.metrics.increment("antifraud_short_circuited_total")
+            return self.fallback()
+
         json = {"user_email": user_email, "promo_id": promo_id}
 
-        for _ in range(2):
+        try:
+            antifraud_response = await asyncio.wait_for(self.validate(json), timeout=self.timeout)
+        except TimeoutError:
+            self.breaker.record_failure()
+            self.metrics.increment("antifraud_timeout_total")
+            return self.fallback()
+        except AntifraudUnavailableError:
+            self.breaker.record_failure()
+            self.metrics.increment("antifraud_error_total")
+            return self.fallback()
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+
+        self.breaker.record_success()
+        self.metrics.increment("antifraud_ok_total")
+
+        return antifraud_response
+
+    def fallback(self) -> AntifraudResponse:
+        # Ответ без cache_until не сохраняется в кэш, поэтому после восстановления сервиса вердикт запросится заново.
+        if self.fail_open:
+            self.metrics.increment("antifraud_fail_open_total")
+            return AntifraudResponse(ok=True)
+
+        self.metrics.increment("antifraud_fail_closed_total")
+        raise EntityAccessDeniedError
+
+    async def validate(self, json: dict) -> AntifraudResponse:
+        for attempt in range(self.max_attempts):
+            if attempt:
+                self.metrics.increment("antifraud_retries_total")
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
             try:
-                response = await self.http_client.post(url="/api/validate", json=json, headers=headers)
-                if response.status_code == 200:
-                    response_data = response.json()
-                    return AntifraudResponse(**response_data)
-            except:  # noqa
+                return await self.send(json)
+            except (HTTPError, ValueError, AntifraudUnavailableError):
                 continue
 
-        raise EntityAccessDeniedError
+        raise AntifraudUnavailableError
+
+    async def send(self, json: dict) -> AntifraudResponse:
+        hedge_delay = self.get_hedge_delay()
+        if hedge_delay is None:
+            return await self.post(json)
+
+        first = asyncio.create_task(self.post(json))
+        pending = {first}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done:
+                # Первый запрос застрял в хвосте распределения задержек, дублируем его и берём тот ответ, что придёт раньше.
+                self.metrics.increment("antifraud_hedged_total")
+                pending.add(asyncio.create_task(self.post(json)))
+
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.metrics.increment("antifraud_hedge_won_total")
+                        return task.result()
+
+                if not pending:
+                    raise AntifraudUnavailableError
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def post(self, json: dict) -> AntifraudResponse:
+        headers = {"Content-Type": "application/json"}
+        started_at = time.monotonic()
+
+        self.metrics.increment("antifraud_requests_total")
+        response = await self.http_client.post(url="/api/validate", json=json, headers=headers)
+
+        if response.status_code != 200:
+            raise AntifraudUnavailableError
+
+        antifraud_response = AntifraudResponse(**response.json())
+        self.latencies.append(time.monotonic() - started_at)
+
+        return antifraud_response
+
+    def get_hedge_delay(self) -> float | None:
+        if not self.hedge_enabled or len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+
+        latencies = sorted(self.latencies)
+        return latencies[int(len(latencies) * 0.95)]
+
+
+class AntifraudSingleFlightInteractor:
+    def __init__(self, redis: Redis, config: AntifraudConfig, metrics: Metrics):
+        self.redis = redis
+        self.metrics = metrics
+        self.lock_ttl = config.ANTIFRAUD_LOCK_TTL
+        self.poll_interval = config.ANTIFRAUD_LOCK_POLL_INTERVAL
+        self.deadline = config.ANTIFRAUD_TIMEOUT
+        self.release_lock_script = redis.register_script(RELEASE_LOCK_SCRIPT)
+        self.in_flight: dict[UserId, asyncio.Task] = {}
+
+    async def __call__(
+        self,
+        user_id: UserId,
+        fetch: Callable[[], Awaitable[AntifraudResponse]],
+        get_cached: Callable[[], Awaitable[AntifraudResponse | None]],
+    ) -> AntifraudResponse:
+        task = self.in_flight.get(user_id)
+
+        if task is None:
+            task = asyncio.create_task(self.fetch_once_across_nodes(user_id, fetch, get_cached))
+            self.in_flight[user_id] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(user_id, None))
+        else:
+            self.metrics.increment("antifraud_coalesced_total")
+
+        # Отмена одного ожидающего запроса не должна отменять общий вызов для остальных.
+        return await asyncio.shield(task)
+
+    async def fetch_once_across_nodes(
+        self,
+        user_id: UserId,
+        fetch: Callable[[], Awaitable[AntifraudResponse]],
+        get_cached: Callable[[], Awaitable[AntifraudResponse | None]],
+    ) -> AntifraudResponse:
+        key = f"antifraud_lock:{user_id}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.deadline
+
+        while time.monotonic() < deadline:
+            if await self.redis.set(key, token, nx=True, px=int(self.lock_ttl * 1000)):
+                try:
+                    self.metrics.increment("antifraud_issued_total")
+                    return await fetch()
+                finally:
+                    await self.release_lock_script(keys=[key], args=[token])
+
+            await asyncio.sleep(self.poll_interval)
+
+            # Вердикт, полученный другим узлом, попадает в кэш. Если его там нет, держатель блокировки
+            # получил отказ или некэшируемый ответ, и после снятия блокировки запрос уйдёт отсюда.
+            cached_response = await get_cached()
+            if cached_response is not None:
+                self.metrics.increment("antifraud_coalesced_remote_total")
+                return cached_response
+
+        # Держатель блокировки раз за разом не получает кэшируемого вердикта: запрос уходит отсюда без блокировки,
+        # и ожидание не затягивается дольше дедлайна антифрода.
+        self.metrics.increment("antifraud_lock_wait_expired_total")
+        self.metrics.increment("antifraud_issued_total")
+        return await fetch()
@@ -6,7 +6,7 @@ from app.core.exceptions import (
 from app.core.security import Security
 from app.database.repositories.business import BusinessCompanyRepository
 from app.database.repositories.user import UserRepository
-from app.interactors.caching import CacheAccessTokenInteractor
+from app.interactors.caching import CacheAccessTokenInteractor, VerifiedTokenCache
 from app.schemas.business import BusinessCompanyLogin, BusinessCompanyRegister
 from app.schemas.enums import EntityTypeEnum
 from app.schemas.user import UserLogin, UserRegister
@@ -41,7 +41,7 @@ class SignInUserInteractor:
         if not user:
             raise InvalidCredentialsError
 
-        if not self.security.verify_password(user_login.password, user.password):
+        if not await self.security.verify_password(user_login.password, user.password):
             raise InvalidCredentialsError
 
         token = self.security.create_access_token({"sub": str(user.id), "type": EntityTypeEnum.USER})
@@ -88,7 +88,7 @@ class SignInBusinessCompanyInteractor:
         if not business_company:
             raise InvalidCredentialsError
 
-        if not self.security.verify_password(business_company_login.password, business_company.password):
+        if not await self.security.verify_password(business_company_login.password, business_company.password):
             raise InvalidCredentialsError
 
         token = self.security.create_access_token({"sub": str(business_company.id), "type": EntityTypeEnum.COMPANY})
@@ -99,10 +99,17 @@ class SignInBusinessCompanyInteractor:
 
 
 class OAuth2PasswordBearerUserInteractor:
-    def __init__(self, security: Security):
+    def __init__(self, security: Security, token_cache: VerifiedTokenCache):
         self.security = security
+        self.token_cache = token_cache
 
     async def __call__(self, token: str, cache_interactor: CacheAccessTokenInteractor) -> str:
+        id = self.token_cache.get(token, EntityTypeEnum.USER)
+        if id is not None:
+            return id
+
+        generation = self.token_cache.generation
+
         decoded_token = self.security.decode_access_token(token)
         if not decoded_token:
             raise EntityUnauthorizedError
@@ -117,14 +124,23 @@ class OAuth2PasswordBearerUserInteractor:
         if cached_token is None or cached_token != token:
             raise EntityUnauthorizedError
 
+        self.token_cache.put(token, EntityTypeEnum.USER, id, decoded_token["exp"], generation)
+
         return id
 
 
 class OAuth2PasswordBearerCompanyInteractor:
-    def __init__(self, security: Security):
+    def __init__(self, security: Security, token_cache: VerifiedTokenCache):
         self.security = security
+        self.token_cache = token_cache
 
     async def __call__(self, token: str, cache_interactor: CacheAccessTokenInteractor) -> str:
+        id = self.token_cache.get(token, EntityTypeEnum.COMPANY)
+        if id is not None:
+            return id
+
+        generation = self.token_cache.generation
+
         decoded_token = self.security.decode_access_token(token)
         if not decoded_token:
             raise EntityUnauthorizedError
@@ -139,4 +155,6 @@ class OAuth2PasswordBearerCompanyInteractor:
         if cached_token is None or cached_token != token:
             raise EntityUnauthorizedError
 
+        self.token_cache.put(token, EntityTypeEnum.COMPANY, id, decoded_token["exp"], generation)
+
         return id
@@ -1,19 +1,24 @@
 from typing import List, Optional
 
 from app.database.repositories.business import BusinessCompanyRepository
+from app.interactors.pool import PromoCodePoolInteractor
 from app.schemas.business import PromoCreate, PromoPatch, PromoReadOnly, PromoStat
 from app.schemas.common import CompanyId, PromoId
-from app.schemas.enums import PromoSortByEnum
+from app.schemas.enums import PromoModeEnum, PromoSortByEnum
 from app.utils.serializer import serialize_promo_read_only, serialize_promo_stat
 
 
 class CreateNewPromoInteractor:
-    def __init__(self, business_company_repository: BusinessCompanyRepository):
+    def __init__(self, business_company_repository: BusinessCompanyRepository, promo_code_pool: PromoCodePoolInteractor):
         self.business_company_repository = business_company_repository
+        self.promo_code_pool = promo_code_pool
 
     async def __call__(self, company_id: CompanyId, promo_create: PromoCreate) -> str:
         new_promo = await self.business_company_repository.create_new_promo(company_id, promo_create)
 
+        if self.promo_code_pool.enabled and promo_create.mode == PromoModeEnum.UNIQUE:
+            await self.promo_code_pool.warm(new_promo.id, promo_create.promo_unique)
+
         return str(new_promo.id)
 
 
@@ -28,21 +33,24 @@ class GetPromosListInteractor:
         country: list[str] | None = None,
         limit: int | None = 10,
         offset: int | None = 0,
-    ) -> list[PromoReadOnly]:
+        cursor: str | None = None,
+    ) -> tuple[int | None, list[PromoReadOnly], str | None]:
         (
             total_count,
             promos,
+            next_cursor,
         ) = await self.business_company_repository.get_promos_for_company(
             company_id=company_id,
             sort_by=sort_by,
             country=country,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
 
         promos_read_only = [serialize_promo_read_only(promo) for promo in promos]
 
-        return total_count, promos_read_only
+        return total_count, promos_read_only, next_cursor
 
 
 class GetPromoByIdInteractor:
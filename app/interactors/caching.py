@@ -1,45 +1,224 @@
+import asyncio
+import contextlib
+import hashlib
 import json
+import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 
 from redis.asyncio import Redis
 
+from app.core.config import AntifraudConfig, SecurityConfig, TokenCacheConfig
+from app.core.metrics import Metrics
+from app.database.redis.client_cache import RedisClientSideCache
 from app.schemas.common import CompanyId, UserId
+from app.schemas.enums import EntityTypeEnum
 from app.schemas.user import AntifraudResponse
 from app.utils.serializer import serialize_antifraud_response
 
+logger = logging.getLogger(__name__)
+
+TOKEN_INVALIDATION_CHANNEL = "token_invalidation"
+
+
+class VerifiedTokenCache:
+    def __init__(self, redis: Redis, config: TokenCacheConfig, security_config: SecurityConfig, metrics: Metrics):
+        self.redis = redis
+        self.metrics = metrics
+        self.enabled = config.TOKEN_CACHE_ENABLED
+        self.max_size = config.TOKEN_CACHE_SIZE
+        self.token_ttl = get_token_ttl(security_config)
+        self.tokens: OrderedDict[str, tuple[str, str, float]] = OrderedDict()
+        self.entity_tokens: dict[str, str] = {}
+        self.generation = 0
+        self.subscribed = False
+        self.task: asyncio.Task | None = None
+
+        metrics.register_gauge("token_cache_size", lambda: len(self.tokens))
+
+    async def start(self) -> None:
+        if self.enabled:
+            self.task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.task
+
+    async def listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(TOKEN_INVALIDATION_CHANNEL)
+
+                    async for message in pubsub.listen():
+                        if message["type"] == "subscribe":
+                            self.subscribed = True
+                        elif message["type"] == "message":
+                            self.invalidate(message["data"])
+            except Exception:
+                logger.exception("Потеряна подписка на инвалидацию токенов")
+
+            # Пока подписки нет, инвалидации с других узлов теряются, поэтому кэш сбрасывается и не используется.
+            self.subscribed = False
+            self.clear()
+            await asyncio.sleep(1)
+
+    def get(self, token: str, entity_type: EntityTypeEnum) -> str | None:
+        if not self.subscribed:
+            return None
+
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        entry = self.tokens.get(digest)
+
+        if entry is None or entry[0] != entity_type.value or entry[2] <= time.time():
+            self.metrics.increment("token_cache_misses_total")
+            return None
+
+        self.tokens.move_to_end(digest)
+        self.metrics.increment("token_cache_hits_total")
+
+        return entry[1]
+
+    def put(self, token: str, entity_type: EntityTypeEnum, entity_id: str, expires_at: float, generation: int) -> None:
+        # Если между проверкой в Redis и сохранением пришла инвалидация, токен мог уже устареть.
+        if not self.subscribed or generation != self.generation:
+            return
+
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        entity_key = f"{entity_type.value}:{entity_id}"
+        # Ключ токена в Redis может истечь раньше exp, и после этого токен уже не должен приниматься и из L1.
+        expires_at = min(expires_at, time.time() + self.token_ttl)
+
+        previous_digest = self.entity_tokens.get(entity_key)
+        if previous_digest is not None and previous_digest != digest:
+            self.tokens.pop(previous_digest, None)
+
+        self.tokens[digest] = (entity_type.value, entity_id, expires_at)
+        self.tokens.move_to_end(digest)
+        self.entity_tokens[entity_key] = digest
+
+        while len(self.tokens) > self.max_size:
+            _, (evicted_type, evicted_id, _) = self.tokens.popitem(last=False)
+            self.entity_tokens.pop(f"{evicted_type}:{evicted_id}", None)
+
+    def invalidate(self, entity_key: str) -> None:
+        self.generation += 1
+
+        digest = self.entity_tokens.pop(entity_key, None)
+        if digest is not None:
+            self.tokens.pop(digest, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.tokens.clear()
+        self.entity_tokens.clear()
+
+    async def publish_invalidation(self, entity_type: EntityTypeEnum, entity_id: str) -> None:
+        entity_key = f"{entity_type.value}:{entity_id}"
+
+        self.invalidate(entity_key)
+        if self.enabled:
+            await self.redis.publish(TOKEN_INVALIDATION_CHANNEL, entity_key)
+
+
+def get_token_ttl(config: SecurityConfig) -> int:
+    return config.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
 
 class CacheAccessTokenInteractor:
-    def __init__(self, redis: Redis):
+    def __init__(
+        self, redis: Redis, token_cache: VerifiedTokenCache, client_cache: RedisClientSideCache, config: SecurityConfig
+    ):
         self.redis = redis
-        self.ttl = 3600
+        self.token_cache = token_cache
+        self.client_cache = client_cache
+        self.ttl = get_token_ttl(config)
 
     async def save_user_token(self, user_id: UserId, token: str) -> None:
         key = f"user_token:{user_id}"
-        await self.redis.set(key, token, ex=self.ttl)
+        await self.client_cache.set(key, token, ex=self.ttl)
+        await self.token_cache.publish_invalidation(EntityTypeEnum.USER, str(user_id))
 
     async def get_user_token(self, user_id: UserId) -> str | None:
         key = f"user_token:{user_id}"
-        token = await self.redis.get(key)
+        token = await self.client_cache.get(key)
 
         if token:
             return token
 
     async def save_company_token(self, company_id: CompanyId, token: str) -> None:
         key = f"company_token:{company_id}"
-        await self.redis.set(key, token, ex=self.ttl)
+        await self.client_cache.set(key, token, ex=self.ttl)
+        await self.token_cache.publish_invalidation(EntityTypeEnum.COMPANY, str(company_id))
 
     async def get_company_token(self, company_id: CompanyId) -> str | None:
         key = f"company_token:{company_id}"
-        token = await self.redis.get(key)
+        token = await self.client_cache.get(key)
 
         if token:
             return token
 
 
+class AntifraudVerdictCache:
+    def __init__(self, config: AntifraudConfig, metrics: Metrics):
+        self.enabled = config.ANTIFRAUD_CACHE_ENABLED
+        self.max_size = config.ANTIFRAUD_CACHE_SIZE
+        self.verdicts: OrderedDict[str, tuple[AntifraudResponse, float]] = OrderedDict()
+
+        metrics.register_gauge("antifraud_cache_l1_size", lambda: len(self.verdicts))
+        metrics.register_gauge("antifraud_cache_l1_hit_ratio", lambda: get_hit_ratio(metrics, "l1"))
+        metrics.register_gauge("antifraud_cache_l2_hit_ratio", lambda: get_hit_ratio(metrics, "l2"))
+
+    def get(self, user_id: UserId) -> AntifraudResponse | None:
+        entry = self.verdicts.get(user_id)
+
+        if entry is None:
+            return None
+
+        if entry[1] <= time.time():
+            del self.verdicts[user_id]
+            return None
+
+        self.verdicts.move_to_end(user_id)
+        return entry[0]
+
+    def put(self, user_id: UserId, antifraud_response: AntifraudResponse) -> None:
+        if not self.enabled or antifraud_response.cache_until is None:
+            return
+
+        # cache_until приходит от антифрода в UTC без часового пояса, как и в расчёте TTL для Redis.
+        ttl = (antifraud_response.cache_until - datetime.utcnow()).total_seconds()
+        if ttl <= 0:
+            return
+
+        self.verdicts[user_id] = (antifraud_response, time.time() + ttl)
+        self.verdicts.move_to_end(user_id)
+
+        while len(self.verdicts) > self.max_size:
+            self.verdicts.popitem(last=False)
+
+
+def get_hit_ratio(metrics: Metrics, tier: str) -> float:
+    hits = metrics.counters[f"antifraud_cache_{tier}_hits_total"]
+    misses = metrics.counters[f"antifraud_cache_{tier}_misses_total"]
+
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
 class CacheAntifraudInteractor:
-    def __init__(self, redis: Redis):
+    def __init__(
+        self, redis: Redis, client_cache: RedisClientSideCache, verdict_cache: AntifraudVerdictCache, metrics: Metrics
+    ):
         self.redis = redis
+        self.client_cache = client_cache
+        self.verdict_cache = verdict_cache
+        self.metrics = metrics
 
     async def save_response(self, user_id: UserId, antifraud_response: AntifraudResponse) -> None:
         key = f"antifraud:{user_id}"
@@ -48,11 +227,27 @@ class CacheAntifraudInteractor:
             exp = int((antifraud_response.cache_until - datetime.utcnow()).total_seconds())
             if exp > 0:
                 cache_data = serialize_antifraud_response(antifraud_response)
-                await self.redis.set(key, json.dumps(cache_data), ex=exp)
+                await self.client_cache.set(key, json.dumps(cache_data), ex=exp)
+                self.verdict_cache.put(user_id, antifraud_response)
 
     async def get_cached_response(self, user_id: UserId) -> AntifraudResponse | None:
+        antifraud_response = self.verdict_cache.get(user_id)
+
+        if antifraud_response is not None:
+            self.metrics.increment("antifraud_cache_l1_hits_total")
+            return antifraud_response
+
+        self.metrics.increment("antifraud_cache_l1_misses_total")
+
         key = f"antifraud:{user_id}"
-        cached_data = await self.redis.get(key)
+        cached_data = await self.client_cache.get(key)
 
         if cached_data:
-            return AntifraudResponse(**json.loads(cached_data))
+            self.metrics.increment("antifraud_cache_l2_hits_total")
+
+            antifraud_response = AntifraudResponse.model_validate_json(cached_data)
+            self.verdict_cache.put(user_id, antifraud_response)
+
+            return antifraud_response
+
+        self.metrics.increment("antifraud_cache_l2_misses_total")
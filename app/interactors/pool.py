@@ -0,0 +1,132 @@
+import asyncio
+import contextlib
+import logging
+import uuid
+from collections.abc import Iterable
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import PromoCodePoolConfig
+from app.database.postgres.session import get_db
+from app.database.repositories.user import UserRepository
+from app.schemas.common import PromoId
+
+logger = logging.getLogger(__name__)
+
+POOLED_PROMOS_KEY = "promo_pool:promos"
+PENDING_CODES_KEY = "promo_pool:pending"
+
+# Возвращает -1, если промокод не прогрет, 0, если коды закончились, иначе выданный код.
+# Выданный код сразу попадает в pending, чтобы его можно было досохранить в Postgres после падения.
+POP_CODE_SCRIPT = """
+if redis.call('SISMEMBER', KEYS[1], ARGV[1]) == 0 then
+    return -1
+end
+local code = redis.call('LPOP', KEYS[2])
+if not code then
+    return 0
+end
+redis.call('SADD', KEYS[3], ARGV[1] .. ':' .. code)
+return code
+"""
+
+
+class PromoNotPooledError(Exception):
+    pass
+
+
+class PromoCodePoolInteractor:
+    def __init__(self, redis: Redis, config: PromoCodePoolConfig):
+        self.redis = redis
+        self.enabled = config.PROMO_CODE_POOL_ENABLED
+        self.pop_code_script = redis.register_script(POP_CODE_SCRIPT)
+
+    async def warm(self, promo_id: PromoId, codes: Iterable[str]) -> None:
+        key = f"promo_pool:{promo_id}"
+        codes = list(codes)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if codes:
+                pipe.rpush(key, *codes)
+            pipe.sadd(POOLED_PROMOS_KEY, str(promo_id))
+            await pipe.execute()
+
+    async def pop_code(self, promo_id: PromoId) -> str | None:
+        key = f"promo_pool:{promo_id}"
+        code = await self.pop_code_script(keys=[POOLED_PROMOS_KEY, key, PENDING_CODES_KEY], args=[str(promo_id)])
+
+        if code == -1:
+            raise PromoNotPooledError
+        if code == 0:
+            return None
+
+        return code
+
+    async def release_code(self, promo_id: PromoId, code: str) -> None:
+        key = f"promo_pool:{promo_id}"
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lpush(key, code)
+            pipe.srem(PENDING_CODES_KEY, f"{promo_id}:{code}")
+            await pipe.execute()
+
+
+class PromoCodePoolReconciler:
+    def __init__(self, redis: Redis, engine: AsyncEngine, config: PromoCodePoolConfig):
+        self.redis = redis
+        self.engine = engine
+        self.enabled = config.PROMO_CODE_POOL_ENABLED
+        self.batch_size = config.PROMO_CODE_POOL_BATCH_SIZE
+        self.interval = config.PROMO_CODE_POOL_RECONCILE_INTERVAL
+        self.task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if not self.enabled:
+            return
+
+        await self.reconcile_all()
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.task
+
+        await self.reconcile_all()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                reconciled = await self.reconcile()
+            except Exception:
+                logger.exception("Не удалось сохранить выданные коды в Postgres")
+                reconciled = 0
+
+            if reconciled < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+    async def reconcile_all(self) -> None:
+        while await self.reconcile() == self.batch_size:
+            pass
+
+    async def reconcile(self) -> int:
+        members = await self.redis.srandmember(PENDING_CODES_KEY, self.batch_size)
+        if not members:
+            return 0
+
+        codes = []
+        for member in members:
+            promo_id, code = member.split(":", 1)
+            codes.append((uuid.UUID(promo_id), code))
+
+        async for db_session in get_db(self.engine):
+            await UserRepository(db_session).mark_unique_codes_used(codes)
+
+        await self.redis.srem(PENDING_CODES_KEY, *members)
+
+        return len(members)
@@ -1,12 +1,15 @@
+import asyncio
 from typing import List, Tuple
 
-from app.core.exceptions import EntityAccessDeniedError
+from app.core.exceptions import EntityAccessDeniedError, EntityUnauthorizedError
 from app.core.security import Security
+from app.database.postgres.models import UserModel
 from app.database.repositories.user import UserRepository
-from app.interactors.antifraud import AntifraudInteractor
+from app.interactors.antifraud import AntifraudInteractor, AntifraudSingleFlightInteractor
 from app.interactors.caching import CacheAntifraudInteractor
+from app.interactors.pool import PromoCodePoolInteractor, PromoNotPooledError
 from app.schemas.common import CommentId, CommentText, PromoId, UserId
-from app.schemas.user import Comment, PromoForUser, User, UserPatch
+from app.schemas.user import AntifraudResponse, Comment, PromoForUser, User, UserPatch
 from app.utils.serializer import (
     serialize_comment,
     serialize_promo_for_user,
@@ -44,19 +47,20 @@ class GetUserPromoFeedInteractor:
         self.user_repository = user_repository
 
     async def __call__(
-        self, user_id: UserId, category: str, active: bool, limit: int, offset: int
-    ) -> tuple[int, list[PromoForUser]]:
-        total_count, promos = await self.user_repository.get_promos_for_user(
+        self, user_id: UserId, category: str, active: bool, limit: int, offset: int, cursor: str | None = None
+    ) -> tuple[int | None, list[PromoForUser], str | None]:
+        total_count, promos, next_cursor = await self.user_repository.get_promos_for_user(
             user_id=user_id,
             category=category,
             active=active,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
 
-        promos_for_user = [serialize_promo_for_user(promo, user_id) for promo in promos]
+        promos_for_user = [serialize_promo_for_user(promo) for promo in promos]
 
-        return total_count, promos_for_user
+        return total_count, promos_for_user, next_cursor
 
 
 class GetUserPromoByIdInteractor:
@@ -64,9 +68,9 @@ class GetUserPromoByIdInteractor:
         self.user_repository = user_repository
 
     async def __call__(self, user_id: UserId, promo_id: PromoId) -> PromoForUser:
-        promo = await self.user_repository.get_promo_for_user_by_id(promo_id=promo_id)
+        promo = await self.user_repository.get_promo_for_user_by_id(user_id=user_id, promo_id=promo_id)
 
-        promo_for_user = serialize_promo_for_user(promo, user_id)
+        promo_for_user = serialize_promo_for_user(promo)
 
         return promo_for_user
 
@@ -92,11 +96,11 @@ class AddCommentToPromoInteractor:
         self.user_repository = user_repository
 
     async def __call__(self, user_id: UserId, promo_id: PromoId, comment_text: CommentText) -> Comment:
-        comment_orm = await self.user_repository.add_comment_to_promo(
+        comment_row = await self.user_repository.add_comment_to_promo(
             user_id=user_id, promo_id=promo_id, comment_text=comment_text
         )
 
-        comment = serialize_comment(comment_orm)
+        comment = serialize_comment(comment_row)
 
         return comment
 
@@ -105,12 +109,16 @@ class GetPromoCommentsInteractor:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
-    async def __call__(self, promo_id: PromoId, limit: int, offset: int) -> tuple[int, list[Comment]]:
-        total_count, comments_orm = await self.user_repository.get_promo_comments(promo_id=promo_id, limit=limit, offset=offset)
+    async def __call__(
+        self, promo_id: PromoId, limit: int, offset: int, cursor: str | None = None
+    ) -> tuple[int | None, list[Comment], str | None]:
+        total_count, comment_rows, next_cursor = await self.user_repository.get_promo_comments(
+            promo_id=promo_id, limit=limit, offset=offset, cursor=cursor
+        )
 
-        comments = [serialize_comment(comment_orm) for comment_orm in comments_orm]
+        comments = [serialize_comment(comment_row) for comment_row in comment_rows]
 
-        return total_count, comments
+        return total_count, comments, next_cursor
 
 
 class GetPromoCommentByIdInteractor:
@@ -118,9 +126,9 @@ class GetPromoCommentByIdInteractor:
         self.user_repository = user_repository
 
     async def __call__(self, promo_id: PromoId, comment_id: CommentId) -> Comment:
-        comment_orm = await self.user_repository.get_promo_comment_by_id(promo_id=promo_id, comment_id=comment_id)
+        comment_row = await self.user_repository.get_promo_comment_by_id(promo_id=promo_id, comment_id=comment_id)
 
-        comment = serialize_comment(comment_orm)
+        comment = serialize_comment(comment_row)
 
         return comment
 
@@ -136,14 +144,14 @@ class EditUserCommentByIdInteractor:
         comment_id: CommentId,
         comment_text: CommentText,
     ) -> Comment:
-        comment_orm = await self.user_repository.edit_user_comment_by_id(
+        comment_row = await self.user_repository.edit_user_comment_by_id(
             user_id=user_id,
             promo_id=promo_id,
             comment_id=comment_id,
             comment_text=comment_text,
         )
 
-        comment = serialize_comment(comment_orm)
+        comment = serialize_comment(comment_row)
 
         return comment
 
@@ -162,8 +170,15 @@ class DeleteUserCommentByIdInteractor:
 
 
 class UserActivatePromoByIdInteractor:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        promo_code_pool: PromoCodePoolInteractor,
+        antifraud_single_flight: AntifraudSingleFlightInteractor,
+    ):
         self.user_repository = user_repository
+        self.promo_code_pool = promo_code_pool
+        self.antifraud_single_flight = antifraud_single_flight
 
     async def __call__(
         self,
@@ -172,36 +187,94 @@ class UserActivatePromoByIdInteractor:
         antifraud_interactor: AntifraudInteractor,
         caching_interactor: CacheAntifraudInteractor,
     ) -> str:
-        cached_response = await caching_interactor.get_cached_response(user_id=user_id)
+        user = await self.user_repository.get_user_by_id(user_id=user_id)
 
-        if cached_response:
-            if not cached_response.ok:
-                raise EntityAccessDeniedError
-        else:
-            user = await self.user_repository.get_user_by_id(user_id=user_id)
+        if not user:
+            raise EntityUnauthorizedError
+
+        # Вердикт антифрода не обращается к БД, поэтому сессия свободна для проверки промокода, пока идёт HTTP запрос.
+        antifraud_response, eligibility_error = await asyncio.gather(
+            self.get_antifraud_response(user, promo_id, antifraud_interactor, caching_interactor),
+            self.user_repository.check_promo_eligibility(user=user, promo_id=promo_id),
+            return_exceptions=True,
+        )
 
-            antifraud_response = await antifraud_interactor(user_email=user.email, promo_id=promo_id)
+        if isinstance(antifraud_response, BaseException):
+            raise antifraud_response
 
-            if not antifraud_response.ok:
-                raise EntityAccessDeniedError
+        if not antifraud_response.ok:
+            raise EntityAccessDeniedError
 
-            await caching_interactor.save_response(user_id=user_id, antifraud_response=antifraud_response)
+        if eligibility_error is not None:
+            raise eligibility_error
 
-        promo_code = await self.user_repository.activate_promo_by_id(user_id=user_id, promo_id=promo_id)
+        promo_code = await self.activate_promo(user_id=user_id, promo_id=promo_id, user=user)
 
         return promo_code
 
+    async def get_antifraud_response(
+        self,
+        user: UserModel,
+        promo_id: PromoId,
+        antifraud_interactor: AntifraudInteractor,
+        caching_interactor: CacheAntifraudInteractor,
+    ) -> AntifraudResponse:
+        user_id, user_email = str(user.id), user.email
+
+        cached_response = await caching_interactor.get_cached_response(user_id=user_id)
+        if cached_response:
+            return cached_response
+
+        async def fetch_antifraud_response() -> AntifraudResponse:
+            antifraud_response = await antifraud_interactor(user_email=user_email, promo_id=promo_id)
+
+            if antifraud_response.ok:
+                await caching_interactor.save_response(user_id=user_id, antifraud_response=antifraud_response)
+
+            return antifraud_response
+
+        return await self.antifraud_single_flight(
+            user_id=user_id,
+            fetch=fetch_antifraud_response,
+            get_cached=lambda: caching_interactor.get_cached_response(user_id=user_id),
+        )
+
+    async def activate_promo(self, user_id: UserId, promo_id: PromoId, user: UserModel | None = None) -> str:
+        if self.promo_code_pool.enabled:
+            try:
+                promo_code = await self.promo_code_pool.pop_code(promo_id)
+            except PromoNotPooledError:
+                pass
+            else:
+                try:
+                    await self.user_repository.add_unique_promo_activation(
+                        user_id=user_id, promo_id=promo_id, code=promo_code, user=user
+                    )
+                except Exception:
+                    if promo_code is not None:
+                        await self.promo_code_pool.release_code(promo_id, promo_code)
+                    raise
+
+                return promo_code
+
+        return await self.user_repository.activate_promo_by_id(user_id=user_id, promo_id=promo_id, user=user)
+
 
 class GetPromoActivationsHistoryInteractor:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
 
-    async def __call__(self, user_id: UserId, limit: int, offset: int) -> tuple[int, list[PromoForUser]]:
+    async def __call__(
+        self, user_id: UserId, limit: int, offset: int, cursor: str | None = None
+    ) -> tuple[int | None, list[PromoForUser], str | None]:
         (
             total_count,
             promos,
-        ) = await self.user_repository.get_user_promo_activations_history(user_id=user_id, limit=limit, offset=offset)
+            next_cursor,
+        ) = await self.user_repository.get_user_promo_activations_history(
+            user_id=user_id, limit=limit, offset=offset, cursor=cursor
+        )
 
-        promos_for_user = [serialize_promo_for_user(promo, user_id) for promo in promos]
+        promos_for_user = [serialize_promo_for_user(promo) for promo in promos]
 
-        return total_count, promos_for_user
+        return total_count, promos_for_user, next_cursor
@@ -1,5 +1,10 @@
 from .config import ConfigProvider
 from .connect import AntifraudProvider, PostgresProvider, RedisProvider
 from .interactor import InteractorProvider
-from .misc import SecurityProvider
+from .misc import (
+    MetricsProvider,
+    PromoCodePoolProvider,
+    SecurityProvider,
+    TokenCacheProvider,
+)
 from .repository import RepositoryProvider
@@ -4,8 +4,10 @@ from app.core.config import (
     AntifraudConfig,
     Config,
     PostgresConfig,
+    PromoCodePoolConfig,
     RedisConfig,
     SecurityConfig,
+    TokenCacheConfig,
     create_config,
 )
 
@@ -32,4 +34,12 @@ class ConfigProvider(Provider):
 
     @provide
     def get_auth_token_config(self, config: Config) -> SecurityConfig:
-        return config.auth_token_config
+        return config.security_config
+
+    @provide
+    def get_promo_code_pool_config(self, config: Config) -> PromoCodePoolConfig:
+        return config.promo_code_pool_config
+
+    @provide
+    def get_token_cache_config(self, config: Config) -> TokenCacheConfig:
+        return config.token_cache_config
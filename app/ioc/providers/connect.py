@@ -1,34 +1,39 @@
 from collections.abc import AsyncIterable
 
 from dishka import Provider, Scope, provide
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits, Timeout
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.core.config import AntifraudConfig, PostgresConfig, RedisConfig
-from app.database.postgres.session import create_engine
+from app.core.metrics import Metrics
+from app.database.postgres.routing import ReplicaRouter
+from app.database.postgres.session import build_engine, create_engine, register_pool_metrics
+from app.database.redis.client_cache import RedisClientSideCache
 from app.database.redis.session import get_redis
-from app.utils.db_uri import is_valid_postgres_uri
+from app.utils.db_uri import get_async_db_uri, get_db_uri
 
 
 class PostgresProvider(Provider):
     scope = Scope.APP
 
     @provide
-    async def create_db_engine(self, config: PostgresConfig) -> AsyncIterable[AsyncEngine]:
-        DB_URI = config.POSTGRES_CONN.replace("postgresql://", "postgresql+asyncpg://")
-        if not is_valid_postgres_uri(config.POSTGRES_CONN):
-            host = config.POSTGRES_HOST
-            port = config.POSTGRES_PORT
-            username = config.POSTGRES_USERNAME
-            password = config.POSTGRES_PASSWORD
-            db_name = config.POSTGRES_DATABASE
-
-            DB_URI = f"postgresql+asyncpg://{username}:{password}@{host}:{port}/{db_name}"
-
-        async for engine in create_engine(DB_URI=DB_URI):
+    async def create_db_engine(self, config: PostgresConfig, metrics: Metrics) -> AsyncIterable[AsyncEngine]:
+        async for engine in create_engine(DB_URI=get_db_uri(config), config=config):
+            register_pool_metrics(engine, metrics)
             yield engine
 
+    @provide
+    async def create_replica_router(self, config: PostgresConfig, metrics: Metrics) -> AsyncIterable[ReplicaRouter]:
+        engines = [build_engine(get_async_db_uri(conn), config) for conn in config.POSTGRES_REPLICA_CONNS]
+        replica_router = ReplicaRouter(
+            engines, config.POSTGRES_REPLICA_MAX_LAG, config.POSTGRES_REPLICA_HEALTH_INTERVAL, metrics
+        )
+
+        await replica_router.start()
+        yield replica_router
+        await replica_router.stop()
+
 
 class RedisProvider(Provider):
     scope = Scope.APP
@@ -38,14 +43,31 @@ class RedisProvider(Provider):
         async for redis in get_redis(
             host=config.REDIS_HOST,
             port=config.REDIS_PORT,
+            max_connections=config.REDIS_MAX_CONNECTIONS,
         ):
             yield redis
 
+    @provide
+    async def create_client_side_cache(
+        self, redis: Redis, config: RedisConfig, metrics: Metrics
+    ) -> AsyncIterable[RedisClientSideCache]:
+        client_cache = RedisClientSideCache(redis, config, metrics)
+
+        await client_cache.start()
+        yield client_cache
+        await client_cache.stop()
+
 
 class AntifraudProvider(Provider):
     scope = Scope.APP
 
     @provide
     async def create_http_client(self, config: AntifraudConfig) -> AsyncIterable[AsyncClient]:
-        async with AsyncClient(base_url=f"http://{config.ANTIFRAUD_ADDRESS}") as client:
+        limits = Limits(
+            max_connections=config.ANTIFRAUD_MAX_CONNECTIONS,
+            max_keepalive_connections=config.ANTIFRAUD_MAX_CONNECTIONS,
+        )
+        timeout = Timeout(config.ANTIFRAUD_TIMEOUT)
+
+        async with AsyncClient(base_url=f"http://{config.ANTIFRAUD_ADDRESS}", limits=limits, timeout=timeout) as client:
             yield client
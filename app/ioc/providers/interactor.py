@@ -1,7 +1,8 @@
 from dishka import Provider, Scope, provide, provide_all
 
-from app.interactors.antifraud import AntifraudInteractor
+from app.interactors.antifraud import AntifraudInteractor, AntifraudSingleFlightInteractor
 from app.interactors.auth import (
+    OAuth2PasswordBearerCompanyInteractor,
     OAuth2PasswordBearerUserInteractor,
     SignInBusinessCompanyInteractor,
     SignInUserInteractor,
@@ -15,7 +16,12 @@ from app.interactors.business import (
     GetPromoStatByIdInteractor,
     PatchPromoByIdInteractor,
 )
-from app.interactors.caching import CacheAccessTokenInteractor, CacheAntifraudInteractor
+from app.interactors.caching import (
+    AntifraudVerdictCache,
+    CacheAccessTokenInteractor,
+    CacheAntifraudInteractor,
+)
+from app.interactors.pool import PromoCodePoolInteractor
 from app.interactors.user import (
     AddCommentToPromoInteractor,
     AddLikeToPromoInteractor,
@@ -68,6 +74,10 @@ class InteractorProvider(Provider):
     )
 
     oauth2_interactor = provide(OAuth2PasswordBearerUserInteractor)
+    oauth2_company_interactor = provide(OAuth2PasswordBearerCompanyInteractor)
     cache_interactor = provide(CacheAccessTokenInteractor)
     caching_interactor = provide(CacheAntifraudInteractor)
-    antifraud_interactor = provide(AntifraudInteractor)
+    antifraud_interactor = provide(AntifraudInteractor, scope=Scope.APP)
+    promo_code_pool_interactor = provide(PromoCodePoolInteractor, scope=Scope.APP)
+    antifraud_single_flight_interactor = provide(AntifraudSingleFlightInteractor, scope=Scope.APP)
+    antifraud_verdict_cache = provide(AntifraudVerdictCache, scope=Scope.APP)
@@ -1,12 +1,58 @@
+from collections.abc import AsyncIterable, Iterable
+
 from dishka import Provider, Scope, provide
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-from app.core.config import SecurityConfig
+from app.core.config import PromoCodePoolConfig, SecurityConfig, TokenCacheConfig
+from app.core.metrics import Metrics
 from app.core.security import Security
+from app.interactors.caching import VerifiedTokenCache
+from app.interactors.pool import PromoCodePoolReconciler
+
+
+class MetricsProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    def create_metrics(self) -> Metrics:
+        return Metrics()
 
 
 class SecurityProvider(Provider):
     scope = Scope.APP
 
     @provide
-    def create_security_service(self, config: SecurityConfig) -> Security:
-        return Security(config)
+    def create_security_service(self, config: SecurityConfig, metrics: Metrics) -> Iterable[Security]:
+        security = Security(config, metrics)
+
+        yield security
+        security.close()
+
+
+class PromoCodePoolProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    async def create_promo_code_pool_reconciler(
+        self, redis: Redis, engine: AsyncEngine, config: PromoCodePoolConfig
+    ) -> AsyncIterable[PromoCodePoolReconciler]:
+        reconciler = PromoCodePoolReconciler(redis, engine, config)
+
+        await reconciler.start()
+        yield reconciler
+        await reconciler.stop()
+
+
+class TokenCacheProvider(Provider):
+    scope = Scope.APP
+
+    @provide
+    async def create_verified_token_cache(
+        self, redis: Redis, config: TokenCacheConfig, security_config: SecurityConfig, metrics: Metrics
+    ) -> AsyncIterable[VerifiedTokenCache]:
+        token_cache = VerifiedTokenCache(redis, config, security_config, metrics)
+
+        await token_cache.start()
+        yield token_cache
+        await token_cache.stop()
@@ -1,8 +1,9 @@
 from collections.abc import AsyncIterable
 
-from dishka import Provider, Scope, provide
-from sqlalchemy.ext.asyncio import AsyncEngine
+from dishka import Provider, Scope, provide, provide_all
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from app.database.postgres.routing import ReplicaRouter
 from app.database.postgres.session import get_db
 from app.database.repositories.business import BusinessCompanyRepository
 from app.database.repositories.user import UserRepository
@@ -12,11 +13,10 @@ class RepositoryProvider(Provider):
     scope = Scope.REQUEST
 
     @provide
-    async def get_business_company_repository(self, engine: AsyncEngine) -> AsyncIterable[BusinessCompanyRepository]:
-        async for db_session in get_db(engine):
-            yield BusinessCompanyRepository(db_session)
+    async def get_db_session(self, engine: AsyncEngine, replica_router: ReplicaRouter) -> AsyncIterable[AsyncSession]:
+        # Сессия берёт соединение из пула только при первом запросе к БД, поэтому запросы,
+        # отклонённые на авторизации, пул не трогают.
+        async for db_session in get_db(engine, replica_router):
+            yield db_session
 
-    @provide
-    async def get_user_repository(self, engine: AsyncEngine) -> AsyncIterable[UserRepository]:
-        async for db_session in get_db(engine):
-            yield UserRepository(db_session)
+    repositories = provide_all(BusinessCompanyRepository, UserRepository)
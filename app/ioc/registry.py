@@ -6,20 +6,26 @@ from app.ioc.providers import (
     AntifraudProvider,
     ConfigProvider,
     InteractorProvider,
+    MetricsProvider,
     PostgresProvider,
+    PromoCodePoolProvider,
     RedisProvider,
     RepositoryProvider,
     SecurityProvider,
+    TokenCacheProvider,
 )
 
 
 def get_providers() -> Iterable[Provider]:
     return (
         ConfigProvider(),
+        MetricsProvider(),
         SecurityProvider(),
         InteractorProvider(),
         RepositoryProvider(),
         PostgresProvider(),
         RedisProvider(),
         AntifraudProvider(),
+        PromoCodePoolProvider(),
+        TokenCacheProvider(),
     )
@@ -4,6 +4,12 @@ from app.core.exceptions import InvalidRequestDataError
 from app.utils.validator import is_iso3166_country, is_valid_email
 
 
+class ResponseModel(BaseModel):
+    # Ответы собираются сервером из уже проверенных при записи данных, поэтому валидаторы запросов
+    # к ним не подключаются, а доверенные данные можно собирать через model_construct без проверок.
+    model_config = ConfigDict(from_attributes=True)
+
+
 class CustomBaseModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
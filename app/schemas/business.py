@@ -2,7 +2,7 @@ from typing import List, Optional
 
 from pydantic import Field, conint, constr
 
-from app.schemas.base import CustomBaseModel
+from app.schemas.base import CustomBaseModel, ResponseModel
 from app.schemas.common import (
     CompanyId,
     CompanyName,
@@ -21,6 +21,9 @@ from app.schemas.common import (
     PromoMode,
     PromoUnique,
     PromoUsedCount,
+    TargetAgeFrom,
+    TargetAgeUntil,
+    TargetCategories,
 )
 
 
@@ -48,29 +51,21 @@ class Target(CustomBaseModel):
     Целевая аудитория
     """
 
-    age_from: conint(ge=0, le=100, strict=True) | None = Field(
-        default=None,
-        ge=0,
-        le=100,
-        strict=True,
-        description="Минимальный возраст целевой аудитории (включительно). Не должен превышать age_until.",
-        examples=[14],
-    )
-    age_until: conint(ge=0, le=100, strict=True) | None = Field(
-        default=None,
-        ge=0,
-        le=100,
-        strict=True,
-        description="Максимальный возраст целевой аудитории (включительно).",
-        examples=[20],
-    )
+    age_from: TargetAgeFrom | None = None
+    age_until: TargetAgeUntil | None = None
     country: Country | None = None
-    categories: list[constr(min_length=2, max_length=20)] | None = Field(
-        default=None,
-        max_length=20,
-        description="Категории для таргетинга.",
-        examples=["ios", "коты", "футбол", "учитель"],
-    )
+    categories: TargetCategories | None = None
+
+
+class TargetReadOnly(ResponseModel):
+    """
+    Целевая аудитория
+    """
+
+    age_from: TargetAgeFrom | None = None
+    age_until: TargetAgeUntil | None = None
+    country: Country | None = None
+    categories: TargetCategories | None = None
 
 
 class PromoCreate(CustomBaseModel):
@@ -102,14 +97,14 @@ class PromoPatch(CustomBaseModel):
     active_until: PromoActiveUntil | None = None
 
 
-class PromoReadOnly(CustomBaseModel):
+class PromoReadOnly(ResponseModel):
     """
     Промокод
     """
 
     description: PromoDescription
     image_url: PromoImageURL | None = None
-    target: Target
+    target: TargetReadOnly
     max_count: PromoMaxCount
     active_from: PromoActiveFrom | None = None
     active_until: PromoActiveUntil | None = None
@@ -124,7 +119,7 @@ class PromoReadOnly(CustomBaseModel):
     active: PromoIsActive
 
 
-class PromoStatCountriesActivations(CustomBaseModel):
+class PromoStatCountriesActivations(ResponseModel):
     country: Country | None
     activations_count: conint(ge=1, strict=True) = Field(
         ge=1,
@@ -134,7 +129,7 @@ class PromoStatCountriesActivations(CustomBaseModel):
     )
 
 
-class PromoStat(CustomBaseModel):
+class PromoStat(ResponseModel):
     """
     Статистика промокода
     """
@@ -67,6 +67,17 @@ UserAvatarURL = Annotated[
     ),
 ]
 
+UserAge = Annotated[
+    conint(ge=0, le=100, strict=True),
+    Field(
+        ge=0,
+        le=100,
+        strict=True,
+        description="Возраст пользователя",
+        examples=[13],
+    ),
+]
+
 CompanyId = Annotated[
     UUID4,
     Field(
@@ -259,3 +270,34 @@ Country = Annotated[
         examples=["ru"],
     ),
 ]
+
+TargetAgeFrom = Annotated[
+    conint(ge=0, le=100, strict=True),
+    Field(
+        ge=0,
+        le=100,
+        strict=True,
+        description="Минимальный возраст целевой аудитории (включительно). Не должен превышать age_until.",
+        examples=[14],
+    ),
+]
+
+TargetAgeUntil = Annotated[
+    conint(ge=0, le=100, strict=True),
+    Field(
+        ge=0,
+        le=100,
+        strict=True,
+        description="Максимальный возраст целевой аудитории (включительно).",
+        examples=[20],
+    ),
+]
+
+TargetCategories = Annotated[
+    list[constr(min_length=2, max_length=20)],
+    Field(
+        max_length=20,
+        description="Категории для таргетинга.",
+        examples=["ios", "коты", "футбол", "учитель"],
+    ),
+]
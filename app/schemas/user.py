@@ -3,7 +3,7 @@ from typing import Optional
 
 from pydantic import Field, conint
 
-from app.schemas.base import CustomBaseModel
+from app.schemas.base import CustomBaseModel, ResponseModel
 from app.schemas.common import (
     CommentId,
     CommentText,
@@ -17,6 +17,7 @@ from app.schemas.common import (
     PromoImageURL,
     PromoIsActive,
     PromoLikeCount,
+    UserAge,
     UserAvatarURL,
     UserFirstName,
     UserSurname,
@@ -28,17 +29,20 @@ class UserTargetSettings(CustomBaseModel):
     Таргет настройки пользователя
     """
 
-    age: conint(ge=0, le=100, strict=True) = Field(
-        ge=0,
-        le=100,
-        strict=True,
-        description="Возраст пользователя",
-        examples=[13],
-    )
+    age: UserAge
     country: Country
 
 
-class User(CustomBaseModel):
+class UserTargetSettingsReadOnly(ResponseModel):
+    """
+    Таргет настройки пользователя
+    """
+
+    age: UserAge
+    country: Country
+
+
+class User(ResponseModel):
     """
     Пользователь
     """
@@ -47,7 +51,7 @@ class User(CustomBaseModel):
     surname: UserSurname
     email: Email
     avatar_url: UserAvatarURL | None = None
-    other: UserTargetSettings
+    other: UserTargetSettingsReadOnly
 
 
 class UserRegister(CustomBaseModel):
@@ -83,7 +87,7 @@ class UserPatch(CustomBaseModel):
     password: Password | None = None
 
 
-class PromoForUser(CustomBaseModel):
+class PromoForUser(ResponseModel):
     """
     Поля промокода при получении пользователем
     """
@@ -111,7 +115,7 @@ class PromoForUser(CustomBaseModel):
     )
 
 
-class CommentAuthor(CustomBaseModel):
+class CommentAuthor(ResponseModel):
     """
     Автор комментария
     """
@@ -121,7 +125,7 @@ class CommentAuthor(CustomBaseModel):
     avatar_url: UserAvatarURL | None = None
 
 
-class Comment(CustomBaseModel):
+class Comment(ResponseModel):
     """
     Комментарий
     """
@@ -140,6 +144,6 @@ class CommentTextRequest(CustomBaseModel):
     text: CommentText
 
 
-class AntifraudResponse(CustomBaseModel):
+class AntifraudResponse(ResponseModel):
     ok: bool
     cache_until: datetime | None = None
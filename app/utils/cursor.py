@@ -0,0 +1,26 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime
+
+from app.core.exceptions import InvalidRequestDataError
+
+
+def encode_cursor(key: str, value: date | datetime, entity_id: uuid.UUID) -> str:
+    payload = json.dumps([key, value.isoformat(), str(entity_id)], separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str, value_type: type[date] | type[datetime]) -> tuple[date | datetime, uuid.UUID]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_key, value, entity_id = json.loads(payload)
+
+        if cursor_key != key:
+            raise ValueError
+
+        return value_type.fromisoformat(value), uuid.UUID(entity_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise InvalidRequestDataError("Некорректный курсор пагинации.") from None
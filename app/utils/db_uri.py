@@ -1,9 +1,31 @@
 from urllib.parse import urlparse
 
+from app.core.config import PostgresConfig
+
 
 def is_valid_postgres_uri(uri: str) -> bool:
     try:
         parsed_uri = urlparse(uri)
-        return parsed_uri.scheme.startswith("postgresql")
+        return parsed_uri.scheme.startswith("postgres")
     except Exception:
         return False
+
+
+def get_async_db_uri(uri: str) -> str:
+    # postgres://, postgresql:// и строки с другим драйвером приводятся к asyncpg.
+    scheme, rest = uri.split("://", 1)
+
+    return f"postgresql+asyncpg://{rest}" if scheme.split("+")[0] in ("postgres", "postgresql") else uri
+
+
+def get_db_uri(config: PostgresConfig) -> str:
+    if is_valid_postgres_uri(config.POSTGRES_CONN):
+        return get_async_db_uri(config.POSTGRES_CONN)
+
+    host = config.POSTGRES_HOST
+    port = config.POSTGRES_PORT
+    username = config.POSTGRES_USERNAME
+    password = config.POSTGRES_PASSWORD
+    db_name = config.POSTGRES_DATABASE
+
+    return f"postgresql+asyncpg://{username}:{password}@{host}:{port}/{db_name}"
@@ -1,4 +1,9 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+
+def get_naive_utc_now() -> datetime:
+    # Колонки дат хранятся без часового пояса. datetime.UTC появился только в Python 3.11.
+    return datetime.now(timezone.utc).replace(tzinfo=None)  # noqa: UP017
 
 
 def get_comment_date() -> str:
@@ -0,0 +1,56 @@
+"""
+Параллельная активация одного COMMON промокода.
+
+Запуск: BASE_URL=http://localhost:8080/api python -m benchmarks.activate_common_promo --requests 5000 --max-count 2000
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+
+from benchmarks.common import (
+    auth_headers,
+    create_client,
+    create_common_promo,
+    report,
+    run_concurrently,
+    sign_up_company,
+    sign_up_users,
+)
+
+
+async def main(requests: int, max_count: int, users: int, concurrency: int) -> None:
+    async with create_client(max_connections=concurrency) as client:
+        company_token = await sign_up_company(client)
+        user_tokens = await sign_up_users(client, users)
+        promo_id = await create_common_promo(client, company_token, max_count)
+
+        def activate(token: str):
+            return lambda: client.post(f"/user/promo/{promo_id}/activate", headers=auth_headers(token))
+
+        calls = [activate(user_tokens[i % users]) for i in range(requests)]
+        responses, latencies, elapsed = await run_concurrently(calls, concurrency)
+
+        statuses = Counter(response.status_code for response in responses)
+        promo = (await client.get(f"/business/promo/{promo_id}", headers=auth_headers(company_token))).json()
+
+    report("activate COMMON", latencies, elapsed)
+    print(f"statuses: {dict(statuses)}")
+    print(f"used_count: {promo['used_count']}, max_count: {promo['max_count']}")
+
+    expected = min(requests, max_count)
+    oversell = promo["used_count"] - promo["max_count"]
+    assert statuses[200] == promo["used_count"], "successful activations do not match used_count"
+    assert statuses[200] <= expected and oversell <= 0, f"oversell detected: {oversell}"
+    print("oversell: 0")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--max-count", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.max_count, args.users, args.concurrency))
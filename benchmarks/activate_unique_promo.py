@@ -0,0 +1,57 @@
+"""
+Параллельная активация всех кодов UNIQUE промокода.
+
+Запуск: BASE_URL=http://localhost:8080/api python -m benchmarks.activate_unique_promo --codes 5000
+"""
+
+import argparse
+import asyncio
+import uuid
+from collections import Counter
+
+from benchmarks.common import (
+    auth_headers,
+    create_client,
+    create_unique_promo,
+    report,
+    run_concurrently,
+    sign_up_company,
+    sign_up_users,
+)
+
+
+async def main(codes_count: int, extra: int, users: int, concurrency: int) -> None:
+    codes = [f"code-{uuid.uuid4().hex[:20]}" for _ in range(codes_count)]
+
+    async with create_client(max_connections=concurrency) as client:
+        company_token = await sign_up_company(client)
+        user_tokens = await sign_up_users(client, users)
+        promo_id = await create_unique_promo(client, company_token, codes)
+
+        def activate(token: str):
+            return lambda: client.post(f"/user/promo/{promo_id}/activate", headers=auth_headers(token))
+
+        calls = [activate(user_tokens[i % users]) for i in range(codes_count + extra)]
+        responses, latencies, elapsed = await run_concurrently(calls, concurrency)
+
+    statuses = Counter(response.status_code for response in responses)
+    issued = [response.json()["promo"] for response in responses if response.status_code == 200]
+
+    report("activate UNIQUE", latencies, elapsed)
+    print(f"statuses: {dict(statuses)}")
+
+    assert len(issued) == len(set(issued)), "the same code was issued twice"
+    assert set(issued) == set(codes), f"{len(set(codes) - set(issued))} codes were never issued"
+    assert statuses[403] == extra, "activations past the last code must be denied"
+    print(f"issued {len(issued)} distinct codes of {codes_count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--codes", type=int, default=5000)
+    parser.add_argument("--extra", type=int, default=100)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.codes, args.extra, args.users, args.concurrency))
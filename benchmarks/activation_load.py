@@ -0,0 +1,61 @@
+"""
+Нагрузка на полный путь активации промокода (проверка токена, кэш антифрода, вызов антифрода, запись в БД)
+с заданной интенсивностью запросов.
+
+Сценарий наполняет базу пользователями и COMMON промокодами и отправляет POST /user/promo/{id}/activate
+с постоянной частотой --rps в течение --duration секунд. Для запуска без внешнего контейнера антифрода
+поднимите локальную замену и укажите её API через ANTIFRAUD_ADDRESS:
+
+    python -m benchmarks.antifraud_stub --port 9090 --latency 0.05 --distribution lognormal --cache-ttl 5
+    ANTIFRAUD_ADDRESS=localhost:9090 python main.py
+
+Запуск: BASE_URL=http://localhost:8080/api python -m benchmarks.activation_load --rps 200 --duration 30
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+
+from benchmarks.common import (
+    auth_headers,
+    create_client,
+    create_common_promo,
+    report,
+    run_at_rate,
+    sign_up_company,
+    sign_up_users,
+)
+
+
+async def main(rps: float, duration: float, users: int, promos: int, max_connections: int) -> None:
+    async with create_client(max_connections=max_connections) as client:
+        company_token = await sign_up_company(client)
+        user_tokens = await sign_up_users(client, users)
+        promo_ids = [await create_common_promo(client, company_token, int(rps * duration)) for _ in range(promos)]
+
+        def activate(index: int):
+            token = user_tokens[index % users]
+            promo_id = promo_ids[index % promos]
+
+            return lambda: client.post(f"/user/promo/{promo_id}/activate", headers=auth_headers(token))
+
+        responses, latencies, elapsed = await run_at_rate(activate, rps, duration)
+
+    statuses = Counter(
+        response.status_code if not isinstance(response, Exception) else type(response).__name__ for response in responses
+    )
+
+    report(f"activate at {rps:g} rps", latencies, elapsed)
+    print(f"statuses: {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rps", type=float, default=200)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--promos", type=int, default=10)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rps, args.duration, args.users, args.promos, args.max_connections))
@@ -0,0 +1,180 @@
+"""
+Задержка активации промокода при последовательном конвейере (кэш антифрода, пользователь, вызов антифрода,
+активация с повторной загрузкой пользователя) и при текущем, где проверка промокода идёт параллельно с
+вызовом антифрода, а пользователь читается один раз.
+
+Антифрод заменяется локальной заглушкой с фиксированной задержкой, вердикты не кэшируются.
+Сценарий работает напрямую с репозиториями (POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET).
+
+Запуск: python -m benchmarks.activation_pipeline --latencies 0.05,0.1,0.2 --activations 100
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import time
+import uuid
+
+from httpx import AsyncClient
+from redis.asyncio import Redis
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.build import create_async_container
+from app.core.config import AntifraudConfig, PromoCodePoolConfig
+from app.core.metrics import Metrics
+from app.database.postgres.models import BusinessCompanyModel, PromoModel, UserModel
+from app.database.postgres.session import get_db
+from app.database.redis.client_cache import RedisClientSideCache
+from app.database.repositories.user import UserRepository
+from app.interactors.antifraud import AntifraudInteractor, AntifraudSingleFlightInteractor
+from app.interactors.caching import AntifraudVerdictCache, CacheAntifraudInteractor
+from app.interactors.pool import PromoCodePoolInteractor
+from app.interactors.user import UserActivatePromoByIdInteractor
+from app.ioc.registry import get_providers
+from app.schemas.enums import PromoModeEnum
+from benchmarks.antifraud_stub import StubBehaviour, create_stub_app, serve_stub
+from benchmarks.common import report
+
+
+async def seed(engine: AsyncEngine, users_count: int) -> tuple[list[str], str]:
+    company_id, promo_id = uuid.uuid4(), uuid.uuid4()
+    users = [
+        {
+            "id": uuid.uuid4(),
+            "name": "Bench",
+            "surname": "User",
+            "email": f"bench-{uuid.uuid4().hex}@user.com",
+            "password": "-",
+            "age": 30,
+            "country": "ru",
+        }
+        for _ in range(users_count)
+    ]
+
+    async for db_session in get_db(engine):
+        await db_session.execute(
+            insert(BusinessCompanyModel),
+            [
+                {
+                    "id": company_id,
+                    "name": "Benchmark company",
+                    "email": f"bench-{uuid.uuid4().hex}@company.com",
+                    "password": "-",
+                }
+            ],
+        )
+        await db_session.execute(
+            insert(PromoModel),
+            [
+                {
+                    "id": promo_id,
+                    "description": "Benchmark COMMON promo",
+                    "max_count": users_count,
+                    "remaining_count": users_count,
+                    "mode": PromoModeEnum.COMMON,
+                    "promo_common": "bench-common",
+                    "company_id": company_id,
+                }
+            ],
+        )
+        await db_session.execute(insert(UserModel), users)
+        await db_session.commit()
+
+    return [str(user["id"]) for user in users], str(promo_id)
+
+
+async def activate_sequentially(
+    interactor: UserActivatePromoByIdInteractor,
+    user_id: str,
+    promo_id: str,
+    antifraud_interactor: AntifraudInteractor,
+    caching_interactor: CacheAntifraudInteractor,
+) -> str:
+    cached_response = await caching_interactor.get_cached_response(user_id=user_id)
+
+    if not cached_response:
+        user = await interactor.user_repository.get_user_by_id(user_id=user_id)
+        antifraud_response = await antifraud_interactor(user_email=user.email, promo_id=promo_id)
+        assert antifraud_response.ok
+
+    return await interactor.user_repository.activate_promo_by_id(user_id=user_id, promo_id=promo_id)
+
+
+async def activate_concurrently(
+    interactor: UserActivatePromoByIdInteractor,
+    user_id: str,
+    promo_id: str,
+    antifraud_interactor: AntifraudInteractor,
+    caching_interactor: CacheAntifraudInteractor,
+) -> str:
+    return await interactor(
+        user_id=user_id,
+        promo_id=promo_id,
+        antifraud_interactor=antifraud_interactor,
+        caching_interactor=caching_interactor,
+    )
+
+
+async def measure(pipeline, user_ids: list[str], promo_id: str, engine: AsyncEngine, dependencies: dict) -> list[float]:
+    latencies = []
+
+    for user_id in user_ids:
+        async for db_session in get_db(engine):
+            interactor = UserActivatePromoByIdInteractor(
+                UserRepository(db_session), dependencies["promo_code_pool"], dependencies["antifraud_single_flight"]
+            )
+
+            started = time.perf_counter()
+            await pipeline(interactor, user_id, promo_id, dependencies["antifraud"], dependencies["caching"])
+            latencies.append(time.perf_counter() - started)
+
+    return latencies
+
+
+async def main(latencies: list[float], activations: int, port: int) -> None:
+    container = create_async_container(get_providers())
+    behaviour = StubBehaviour()
+
+    try:
+        engine = await container.get(AsyncEngine)
+        redis = await container.get(Redis)
+
+        async with (
+            serve_stub(create_stub_app(behaviour), port=port) as address,
+            AsyncClient(base_url=f"http://{address}") as http_client,
+        ):
+            config = dataclasses.replace(await container.get(AntifraudConfig), ANTIFRAUD_ADDRESS=address)
+            dependencies = {
+                "promo_code_pool": PromoCodePoolInteractor(redis, PromoCodePoolConfig(False, 0, 0)),
+                "antifraud_single_flight": await container.get(AntifraudSingleFlightInteractor),
+                "antifraud": AntifraudInteractor(http_client, config, Metrics()),
+                "caching": CacheAntifraudInteractor(
+                    redis,
+                    await container.get(RedisClientSideCache),
+                    await container.get(AntifraudVerdictCache),
+                    await container.get(Metrics),
+                ),
+            }
+
+            for latency in latencies:
+                behaviour.latency = latency
+
+                for name, pipeline in (("sequential", activate_sequentially), ("concurrent", activate_concurrently)):
+                    user_ids, promo_id = await seed(engine, activations)
+
+                    started = time.perf_counter()
+                    results = await measure(pipeline, user_ids, promo_id, engine, dependencies)
+                    report(f"antifraud {latency * 1000:.0f}ms, {name}", results, time.perf_counter() - started)
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latencies", default="0.05,0.1,0.2")
+    parser.add_argument("--activations", type=int, default=100)
+    parser.add_argument("--port", type=int, default=9191)
+    args = parser.parse_args()
+
+    asyncio.run(main([float(latency) for latency in args.latencies.split(",")], args.activations, args.port))
@@ -0,0 +1,170 @@
+"""
+Проверка устойчивого клиента антифрода против локальной замены сервиса, которая добавляет задержки и ошибки:
+дедлайн вызова, повторы, circuit breaker, хеджирование и политики fail-open/fail-closed.
+
+Завершается с кодом 1, если хотя бы один сценарий не прошёл. Внешние сервисы не нужны.
+
+Запуск: python -m benchmarks.antifraud_resilience --port 9191
+"""
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import sys
+import time
+from collections.abc import AsyncIterator
+
+from httpx import AsyncClient, Limits, Timeout
+
+from app.core.config import AntifraudConfig
+from app.core.exceptions import EntityAccessDeniedError
+from app.core.metrics import Metrics
+from app.interactors.antifraud import HEDGE_MIN_SAMPLES, AntifraudInteractor
+from benchmarks.antifraud_stub import StubBehaviour, create_stub_app, serve_stub
+
+EMAIL = "resilience@antifraud.ru"
+PROMO_ID = "00000000-0000-0000-0000-000000000000"
+
+DEFAULTS = {
+    "ANTIFRAUD_TIMEOUT": 0.5,
+    "ANTIFRAUD_MAX_ATTEMPTS": 2,
+    "ANTIFRAUD_RETRY_BACKOFF": 0.01,
+    "ANTIFRAUD_BREAKER_FAILURES": 3,
+    "ANTIFRAUD_BREAKER_RESET_TIMEOUT": 0.3,
+    "ANTIFRAUD_HEDGE_ENABLED": False,
+    "ANTIFRAUD_FAIL_OPEN": False,
+}
+
+
+@contextlib.asynccontextmanager
+async def create_interactor(address: str, **overrides) -> AsyncIterator[tuple[AntifraudInteractor, Metrics]]:
+    config = dataclasses.replace(AntifraudConfig.from_env(), ANTIFRAUD_ADDRESS=address, **{**DEFAULTS, **overrides})
+    limits = Limits(max_connections=config.ANTIFRAUD_MAX_CONNECTIONS)
+    metrics = Metrics()
+
+    async with AsyncClient(base_url=f"http://{address}", limits=limits, timeout=Timeout(config.ANTIFRAUD_TIMEOUT)) as client:
+        yield AntifraudInteractor(client, config, metrics), metrics
+
+
+async def call(interactor: AntifraudInteractor) -> tuple[bool | None, float]:
+    started_at = time.monotonic()
+    try:
+        ok = (await interactor(user_email=EMAIL, promo_id=PROMO_ID)).ok
+    except EntityAccessDeniedError:
+        ok = None
+
+    return ok, time.monotonic() - started_at
+
+
+async def healthy(address: str, behaviour: StubBehaviour) -> None:
+    async with create_interactor(address) as (interactor, metrics):
+        behaviour.latency = 0.01
+
+        ok, _ = await call(interactor)
+
+        assert ok is True, ok
+        assert metrics.counters["antifraud_ok_total"] == 1
+
+
+async def retry_after_error(address: str, behaviour: StubBehaviour) -> None:
+    async with create_interactor(address) as (interactor, metrics):
+        behaviour.fail_next = 1
+
+        ok, _ = await call(interactor)
+
+        assert ok is True, ok
+        assert metrics.counters["antifraud_retries_total"] == 1
+
+
+async def deadline_fail_closed(address: str, behaviour: StubBehaviour) -> None:
+    async with create_interactor(address) as (interactor, metrics):
+        behaviour.latency = 2.0
+
+        ok, elapsed = await call(interactor)
+
+        assert ok is None, ok
+        assert elapsed < 0.7, f"call took {elapsed:.2f}s with a 0.5s deadline"
+        assert metrics.counters["antifraud_timeout_total"] == 1
+        assert metrics.counters["antifraud_fail_closed_total"] == 1
+
+
+async def deadline_fail_open(address: str, behaviour: StubBehaviour) -> None:
+    async with create_interactor(address, ANTIFRAUD_FAIL_OPEN=True) as (interactor, metrics):
+        behaviour.latency = 2.0
+
+        ok, elapsed = await call(interactor)
+
+        assert ok is True, ok
+        assert elapsed < 0.7, f"call took {elapsed:.2f}s with a 0.5s deadline"
+        assert metrics.counters["antifraud_fail_open_total"] == 1
+
+
+async def circuit_breaker(address: str, behaviour: StubBehaviour) -> None:
+    async with create_interactor(address) as (interactor, metrics):
+        behaviour.error_rate = 1.0
+
+        for _ in range(3):
+            await call(interactor)
+        assert metrics.snapshot()["antifraud_circuit_open"] == 1
+
+        requests = behaviour.requests
+        ok, elapsed = await call(interactor)
+        assert ok is None and elapsed < 0.05, (ok, elapsed)
+        assert behaviour.requests == requests, "open circuit still sends requests"
+        assert metrics.counters["antifraud_short_circuited_total"] == 1
+
+        behaviour.error_rate = 0.0
+        await asyncio.sleep(0.3)
+
+        ok, _ = await call(interactor)
+        assert ok is True, ok
+        assert metrics.snapshot()["antifraud_circuit_open"] == 0
+
+
+async def hedged_request(address: str, behaviour: StubBehaviour) -> None:
+    async with create_interactor(address, ANTIFRAUD_HEDGE_ENABLED=True, ANTIFRAUD_TIMEOUT=3.0) as (interactor, metrics):
+        behaviour.latency = 0.01
+
+        for _ in range(HEDGE_MIN_SAMPLES):
+            await call(interactor)
+
+        behaviour.slow_next = 1
+        behaviour.slow_latency = 2.0
+        ok, elapsed = await call(interactor)
+
+        assert ok is True, ok
+        assert elapsed < 0.5, f"hedged call took {elapsed:.2f}s"
+        assert metrics.counters["antifraud_hedged_total"] == 1
+        assert metrics.counters["antifraud_hedge_won_total"] == 1
+
+
+SCENARIOS = [healthy, retry_after_error, deadline_fail_closed, deadline_fail_open, circuit_breaker, hedged_request]
+
+
+async def main(port: int) -> None:
+    behaviour = StubBehaviour()
+    failures = []
+
+    async with serve_stub(create_stub_app(behaviour), port=port) as address:
+        for scenario in SCENARIOS:
+            behaviour.__init__()
+
+            try:
+                await scenario(address, behaviour)
+            except AssertionError as error:
+                failures.append(scenario.__name__)
+                print(f"FAIL {scenario.__name__}: {error}")
+            else:
+                print(f"ok   {scenario.__name__}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9191)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.port))
@@ -0,0 +1,59 @@
+"""
+Параллельные активации COMMON промокода одним пользователем при пустом кэше антифрода.
+
+Сравнивает число активаций с числом запросов к антифроду по счётчикам /metrics: без объединения каждая
+активация, промахнувшаяся мимо кэша, отправляла бы свой запрос.
+
+Запуск: BASE_URL=http://localhost:8080/api python -m benchmarks.antifraud_single_flight --requests 200
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+
+from benchmarks.common import (
+    auth_headers,
+    create_client,
+    create_common_promo,
+    report,
+    run_concurrently,
+    sign_up_company,
+    sign_up_user,
+)
+
+COUNTERS = ("antifraud_issued_total", "antifraud_coalesced_total", "antifraud_coalesced_remote_total")
+
+
+async def get_counters(client) -> dict[str, int]:
+    metrics = (await client.get("/metrics")).json()
+    return {name: metrics.get(name, 0) for name in COUNTERS}
+
+
+async def main(requests: int, concurrency: int) -> None:
+    async with create_client(max_connections=concurrency) as client:
+        company_token = await sign_up_company(client)
+        user_token = await sign_up_user(client)
+        promo_id = await create_common_promo(client, company_token, requests)
+
+        before = await get_counters(client)
+
+        calls = [
+            lambda: client.post(f"/user/promo/{promo_id}/activate", headers=auth_headers(user_token)) for _ in range(requests)
+        ]
+        responses, latencies, elapsed = await run_concurrently(calls, concurrency)
+
+        after = await get_counters(client)
+
+    report("activate by one user", latencies, elapsed)
+    print(f"statuses: {dict(Counter(response.status_code for response in responses))}")
+    for name in COUNTERS:
+        print(f"{name}: {after[name] - before[name]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,144 @@
+"""
+Локальная замена антифрод-сервиса (lodthe/prod-backend-antifraud) с управляемыми задержками, ошибками и cache_until.
+
+Повторяет внешний API сервиса: POST /api/validate и POST /internal/update_user_verdict, поэтому API можно
+нагружать и тестировать без контейнера антифрода.
+
+Распределения задержки:
+    fixed        всегда --latency секунд;
+    uniform      равномерно от 0 до 2 * --latency;
+    exponential  экспоненциальное со средним --latency;
+    lognormal    логнормальное с медианой --latency и параметром формы --sigma (длинный хвост).
+
+Запуск: python -m benchmarks.antifraud_stub --port 9090 --latency 0.05 --distribution lognormal --cache-ttl 5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import math
+import random
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import uvicorn
+from fastapi import Body, FastAPI, status
+from fastapi.responses import JSONResponse
+
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+@dataclass
+class StubBehaviour:
+    latency: float = 0.0
+    distribution: str = "fixed"
+    sigma: float = 0.5
+    error_rate: float = 0.0
+    deny_rate: float = 0.0
+    cache_ttl: float | None = None
+    fail_next: int = 0
+    slow_next: int = 0
+    slow_latency: float = 1.0
+    verdicts: dict[str, bool] = field(default_factory=dict)
+    requests: int = 0
+
+    def sample_latency(self) -> float:
+        if self.slow_next > 0:
+            self.slow_next -= 1
+            return self.slow_latency
+
+        if self.latency <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            return random.uniform(0, 2 * self.latency)
+        if self.distribution == "exponential":
+            return random.expovariate(1 / self.latency)
+        if self.distribution == "lognormal":
+            return random.lognormvariate(math.log(self.latency), self.sigma)
+
+        return self.latency
+
+    def should_fail(self) -> bool:
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            return True
+
+        return random.random() < self.error_rate
+
+    def get_verdict(self, user_email: str) -> bool:
+        if user_email in self.verdicts:
+            return self.verdicts[user_email]
+
+        return random.random() >= self.deny_rate
+
+
+def create_stub_app(behaviour: StubBehaviour) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/validate")
+    async def validate(user_email: str = Body(...), promo_id: str = Body(...)):
+        behaviour.requests += 1
+
+        await asyncio.sleep(behaviour.sample_latency())
+
+        if behaviour.should_fail():
+            return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={})
+
+        cache_until = None
+        if behaviour.cache_ttl:
+            cache_until = (datetime.utcnow() + timedelta(seconds=behaviour.cache_ttl)).isoformat(timespec="milliseconds")
+
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={"ok": behaviour.get_verdict(user_email), "cache_until": cache_until},
+        )
+
+    @app.post("/internal/update_user_verdict")
+    async def update_user_verdict(user_email: str = Body(...), ok: bool = Body(...)):
+        behaviour.verdicts[user_email] = ok
+
+        return JSONResponse(status_code=status.HTTP_200_OK, content={})
+
+    return app
+
+
+@contextlib.asynccontextmanager
+async def serve_stub(app: FastAPI, host: str = "127.0.0.1", port: int = 9191) -> AsyncIterator[str]:
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+
+    try:
+        yield f"{host}:{port}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9090)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--deny-rate", type=float, default=0.0)
+    parser.add_argument("--cache-ttl", type=float, default=None)
+    args = parser.parse_args()
+
+    behaviour = StubBehaviour(
+        latency=args.latency,
+        distribution=args.distribution,
+        sigma=args.sigma,
+        error_rate=args.error_rate,
+        deny_rate=args.deny_rate,
+        cache_ttl=args.cache_ttl,
+    )
+
+    uvicorn.run(create_stub_app(behaviour), host=args.host, port=args.port, log_level="warning")
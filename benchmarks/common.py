@@ -0,0 +1,166 @@
+import asyncio
+import os
+import socket
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterable
+
+from httpx import AsyncClient, Limits
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:8080/api")
+PASSWORD = "BenchPa$$w0rd!2025"
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def create_client(max_connections: int = 200) -> AsyncClient:
+    limits = Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return AsyncClient(base_url=BASE_URL, limits=limits, timeout=60)
+
+
+def auth_headers(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def sign_up_company(client: AsyncClient) -> str:
+    response = await client.post(
+        "/business/auth/sign-up",
+        json={"name": "Benchmark company", "email": f"bench-{uuid.uuid4().hex}@company.com", "password": PASSWORD},
+    )
+    response.raise_for_status()
+
+    return response.json()["token"]
+
+
+async def sign_up_user(client: AsyncClient, age: int = 30, country: str = "ru", email: str | None = None) -> str:
+    response = await client.post(
+        "/user/auth/sign-up",
+        json={
+            "name": "Bench",
+            "surname": "User",
+            "email": email or f"bench-{uuid.uuid4().hex}@user.com",
+            "password": PASSWORD,
+            "other": {"age": age, "country": country},
+        },
+    )
+    response.raise_for_status()
+
+    return response.json()["token"]
+
+
+async def sign_up_users(client: AsyncClient, count: int, concurrency: int = 20) -> list[str]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def sign_up() -> str:
+        async with semaphore:
+            return await sign_up_user(client)
+
+    return await asyncio.gather(*(sign_up() for _ in range(count)))
+
+
+async def create_common_promo(client: AsyncClient, company_token: str, max_count: int) -> str:
+    response = await client.post(
+        "/business/promo",
+        headers=auth_headers(company_token),
+        json={
+            "description": "Benchmark COMMON promo",
+            "target": {},
+            "max_count": max_count,
+            "mode": "COMMON",
+            "promo_common": "bench-common",
+        },
+    )
+    response.raise_for_status()
+
+    return response.json()["id"]
+
+
+async def create_unique_promo(client: AsyncClient, company_token: str, codes: list[str]) -> str:
+    response = await client.post(
+        "/business/promo",
+        headers=auth_headers(company_token),
+        json={
+            "description": "Benchmark UNIQUE promo",
+            "target": {},
+            "max_count": 1,
+            "mode": "UNIQUE",
+            "promo_unique": codes,
+        },
+    )
+    response.raise_for_status()
+
+    return response.json()["id"]
+
+
+async def run_concurrently(calls: Iterable[Callable[[], Awaitable]], concurrency: int) -> tuple[list, list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def timed(call: Callable[[], Awaitable]):
+        async with semaphore:
+            started = time.perf_counter()
+            result = await call()
+            latencies.append(time.perf_counter() - started)
+            return result
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(timed(call) for call in calls))
+    elapsed = time.perf_counter() - started
+
+    return results, latencies, elapsed
+
+
+async def run_at_rate(
+    make_call: Callable[[int], Callable[[], Awaitable]], rps: float, duration: float
+) -> tuple[list, list[float], float]:
+    # Открытая модель нагрузки: запросы уходят по расписанию, не дожидаясь ответов на предыдущие.
+    # Задержка считается от запланированного момента, поэтому очередь на стороне клиента не скрывает деградацию сервера.
+    count = int(rps * duration)
+    latencies = []
+
+    async def timed(call: Callable[[], Awaitable], scheduled: float):
+        result = await call()
+        latencies.append(time.perf_counter() - scheduled)
+        return result
+
+    started = time.perf_counter()
+    tasks = []
+    for index in range(count):
+        scheduled = started + index / rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        tasks.append(asyncio.create_task(timed(make_call(index), scheduled)))
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    return results, latencies, elapsed
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))
+
+    return ordered[index]
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    count = len(latencies)
+    rps = count / elapsed if elapsed else 0.0
+    mean = statistics.mean(latencies) if latencies else 0.0
+
+    print(
+        f"{name}: {count} requests in {elapsed:.2f}s ({rps:.1f} rps), "
+        f"mean {mean * 1000:.1f}ms, p50 {percentile(latencies, 50) * 1000:.1f}ms, "
+        f"p95 {percentile(latencies, 95) * 1000:.1f}ms, p99 {percentile(latencies, 99) * 1000:.1f}ms"
+    )
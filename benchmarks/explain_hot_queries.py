@@ -0,0 +1,39 @@
+"""
+Проверка планов запросов репозиториев: наполняет базу реалистичным объёмом данных, вызывает методы
+UserRepository и BusinessCompanyRepository, перехватывает каждый выполненный запрос и прогоняет его через EXPLAIN.
+
+Завершается с кодом 1, если горячий запрос читает одну из больших таблиц последовательным сканированием.
+Наполнение и проверки общие с pytest-тестом tests/test_hot_query_plans.py и живут в tests/hot_query_plans.py.
+Данные пишутся во временную схему, которая удаляется после прогона.
+
+Сценарий работает напрямую с репозиториями (POSTGRES_CONN).
+
+Запуск: python -m benchmarks.explain_hot_queries --users 5000 --promos 20000
+"""
+
+import argparse
+import asyncio
+import sys
+
+from tests.hot_query_plans import explain_hot_queries
+
+
+async def main(users_count: int, promos_count: int) -> None:
+    failures = []
+
+    for name, seq_scans in (await explain_hot_queries(users_count, promos_count)).items():
+        print(f"{'FAIL' if seq_scans else 'ok  '} {name}")
+        failures += seq_scans
+
+    if failures:
+        print("\n\n".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--promos", type=int, default=20000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.users, args.promos))
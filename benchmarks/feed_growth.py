@@ -0,0 +1,149 @@
+"""
+Задержка и память ленты /user/feed по мере роста таблиц лайков и комментариев.
+
+Сценарий работает напрямую с репозиториями (POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET).
+
+Запуск: python -m benchmarks.feed_growth --promos 10 --steps 0,1000,10000,50000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.build import create_async_container
+from app.core.security import Security
+from app.database.postgres.models import CommentModel, UserModel, user_promo_likes
+from app.database.postgres.session import get_db
+from app.database.repositories.business import BusinessCompanyRepository
+from app.database.repositories.user import UserRepository
+from app.interactors.user import GetUserPromoFeedInteractor
+from app.ioc.registry import get_providers
+from app.schemas.business import BusinessCompanyRegister, PromoCreate
+from app.schemas.user import UserRegister
+from benchmarks.common import PASSWORD, percentile
+
+BATCH_SIZE = 5000
+
+
+async def seed(engine: AsyncEngine, security: Security, promos_count: int) -> tuple[str, list[str]]:
+    async for db_session in get_db(engine):
+        company = await BusinessCompanyRepository(db_session).create_new_company(
+            BusinessCompanyRegister(name="Benchmark company", email=f"bench-{uuid.uuid4().hex}@company.com", password=PASSWORD),
+            security,
+        )
+        viewer = await UserRepository(db_session).create_new_user(
+            UserRegister(
+                name="Bench",
+                surname="Viewer",
+                email=f"bench-{uuid.uuid4().hex}@user.com",
+                password=PASSWORD,
+                other={"age": 30, "country": "ru"},
+            ),
+            security,
+        )
+
+        promo_ids = []
+        for _ in range(promos_count):
+            promo = await BusinessCompanyRepository(db_session).create_new_promo(
+                str(company.id),
+                PromoCreate(
+                    description="Benchmark feed promo",
+                    target={},
+                    max_count=100,
+                    mode="COMMON",
+                    promo_common="bench-feed",
+                ),
+            )
+            promo_ids.append(promo.id)
+
+    return str(viewer.id), promo_ids
+
+
+async def grow(engine: AsyncEngine, promo_ids: list, rows: int) -> None:
+    users_count = max(1, rows // len(promo_ids))
+
+    async for db_session in get_db(engine):
+        for start in range(0, users_count, BATCH_SIZE):
+            users = [
+                {
+                    "id": uuid.uuid4(),
+                    "name": "Bench",
+                    "surname": "Fan",
+                    "email": f"bench-{uuid.uuid4().hex}@user.com",
+                    "password": "-",
+                    "age": 30,
+                    "country": "ru",
+                }
+                for _ in range(min(BATCH_SIZE, users_count - start))
+            ]
+            await db_session.execute(insert(UserModel), users)
+
+            likes = [{"user_id": user["id"], "promo_id": promo_id} for user in users for promo_id in promo_ids]
+            comments = [
+                {"text": "Benchmark comment text", "date": datetime.utcnow(), "author_id": user["id"], "promo_id": promo_id}
+                for user in users
+                for promo_id in promo_ids
+            ]
+            await db_session.execute(insert(user_promo_likes), likes)
+            await db_session.execute(insert(CommentModel), comments)
+
+        await db_session.commit()
+        await UserRepository(db_session).recount_promo_counters()
+
+
+async def measure(engine: AsyncEngine, user_id: str, repeats: int) -> tuple[list[float], int]:
+    latencies = []
+    peak = 0
+
+    for _ in range(repeats):
+        async for db_session in get_db(engine):
+            interactor = GetUserPromoFeedInteractor(UserRepository(db_session))
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            await interactor(user_id=user_id, category=None, active=None, limit=10, offset=0)
+            latencies.append(time.perf_counter() - started)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    return latencies, peak
+
+
+async def main(promos_count: int, steps: list[int], repeats: int) -> None:
+    container = create_async_container(get_providers())
+
+    try:
+        engine = await container.get(AsyncEngine)
+        security = await container.get(Security)
+
+        user_id, promo_ids = await seed(engine, security, promos_count)
+
+        grown = 0
+        for step in steps:
+            if step > grown:
+                await grow(engine, promo_ids, step - grown)
+                grown = step
+
+            latencies, peak = await measure(engine, user_id, repeats)
+            print(
+                f"{step} likes and comments per page: p50 {percentile(latencies, 50) * 1000:.1f}ms, "
+                f"p95 {percentile(latencies, 95) * 1000:.1f}ms, peak memory {peak / 1024:.0f} KiB"
+            )
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--promos", type=int, default=10)
+    parser.add_argument("--steps", type=lambda value: [int(step) for step in value.split(",")], default=[0, 1000, 10000, 50000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.promos, args.steps, args.repeats))
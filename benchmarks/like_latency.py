@@ -0,0 +1,149 @@
+"""
+Задержка лайка и снятия лайка в зависимости от числа уже существующих лайков у пользователя и у промокода.
+
+Сценарий работает напрямую с репозиториями (POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET).
+
+Запуск: python -m benchmarks.like_latency --steps 0,1000,10000,100000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.build import create_async_container
+from app.core.security import Security
+from app.database.postgres.models import PromoModel, UserModel, user_promo_likes
+from app.database.postgres.session import get_db
+from app.database.repositories.business import BusinessCompanyRepository
+from app.database.repositories.user import UserRepository
+from app.ioc.registry import get_providers
+from app.schemas.business import BusinessCompanyRegister, PromoCreate
+from app.schemas.enums import PromoModeEnum
+from app.schemas.user import UserRegister
+from benchmarks.common import PASSWORD, percentile
+
+BATCH_SIZE = 5000
+
+
+async def seed(engine: AsyncEngine, security: Security) -> tuple[str, str, str]:
+    async for db_session in get_db(engine):
+        company = await BusinessCompanyRepository(db_session).create_new_company(
+            BusinessCompanyRegister(name="Benchmark company", email=f"bench-{uuid.uuid4().hex}@company.com", password=PASSWORD),
+            security,
+        )
+        user = await UserRepository(db_session).create_new_user(
+            UserRegister(
+                name="Bench",
+                surname="User",
+                email=f"bench-{uuid.uuid4().hex}@user.com",
+                password=PASSWORD,
+                other={"age": 30, "country": "ru"},
+            ),
+            security,
+        )
+        promo = await BusinessCompanyRepository(db_session).create_new_promo(
+            str(company.id),
+            PromoCreate(
+                description="Benchmark liked promo", target={}, max_count=100, mode="COMMON", promo_common="bench-like"
+            ),
+        )
+
+    return str(company.id), str(user.id), str(promo.id)
+
+
+async def grow(engine: AsyncEngine, company_id: str, user_id: str, promo_id: str, count: int) -> None:
+    async for db_session in get_db(engine):
+        for start in range(0, count, BATCH_SIZE):
+            size = min(BATCH_SIZE, count - start)
+
+            fans = [
+                {
+                    "id": uuid.uuid4(),
+                    "name": "Bench",
+                    "surname": "Fan",
+                    "email": f"bench-{uuid.uuid4().hex}@user.com",
+                    "password": "-",
+                    "age": 30,
+                    "country": "ru",
+                }
+                for _ in range(size)
+            ]
+            promos = [
+                {
+                    "id": uuid.uuid4(),
+                    "description": "Benchmark other promo",
+                    "max_count": 100,
+                    "remaining_count": 100,
+                    "mode": PromoModeEnum.COMMON,
+                    "promo_common": "bench-other",
+                    "company_id": company_id,
+                }
+                for _ in range(size)
+            ]
+            await db_session.execute(insert(UserModel), fans)
+            await db_session.execute(insert(PromoModel), promos)
+
+            likes = [{"user_id": fan["id"], "promo_id": promo_id} for fan in fans]
+            likes += [{"user_id": user_id, "promo_id": promo["id"]} for promo in promos]
+            await db_session.execute(insert(user_promo_likes), likes)
+
+        await db_session.commit()
+
+
+async def measure(engine: AsyncEngine, user_id: str, promo_id: str, repeats: int) -> tuple[list[float], list[float]]:
+    like_latencies, unlike_latencies = [], []
+
+    for _ in range(repeats):
+        async for db_session in get_db(engine):
+            user_repository = UserRepository(db_session)
+
+            started = time.perf_counter()
+            await user_repository.add_like_to_promo(user_id=user_id, promo_id=promo_id)
+            like_latencies.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await user_repository.delete_like_to_promo(user_id=user_id, promo_id=promo_id)
+            unlike_latencies.append(time.perf_counter() - started)
+
+    return like_latencies, unlike_latencies
+
+
+async def main(steps: list[int], repeats: int) -> None:
+    container = create_async_container(get_providers())
+
+    try:
+        engine = await container.get(AsyncEngine)
+        security = await container.get(Security)
+
+        company_id, user_id, promo_id = await seed(engine, security)
+
+        grown = 0
+        for step in steps:
+            if step > grown:
+                await grow(engine, company_id, user_id, promo_id, step - grown)
+                grown = step
+
+            like_latencies, unlike_latencies = await measure(engine, user_id, promo_id, repeats)
+            print(
+                f"{step} existing likes: like p50 {percentile(like_latencies, 50) * 1000:.2f}ms "
+                f"p95 {percentile(like_latencies, 95) * 1000:.2f}ms, "
+                f"unlike p50 {percentile(unlike_latencies, 50) * 1000:.2f}ms "
+                f"p95 {percentile(unlike_latencies, 95) * 1000:.2f}ms"
+            )
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--steps", type=lambda value: [int(step) for step in value.split(",")], default=[0, 1000, 10000, 100000]
+    )
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.steps, args.repeats))
@@ -0,0 +1,168 @@
+"""
+Задержка страницы ленты, списка промокодов компании, комментариев и истории активаций
+на нулевом смещении, на глубоком смещении и по курсору той же глубины.
+
+Сценарий работает напрямую с репозиториями (POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET).
+
+Запуск: python -m benchmarks.pagination_depth --rows 100000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.build import create_async_container
+from app.core.security import Security
+from app.database.postgres.models import CommentModel, PromoModel, UserPromoActivationModel
+from app.database.postgres.session import get_db
+from app.database.repositories.business import BusinessCompanyRepository
+from app.database.repositories.user import UserRepository
+from app.interactors.business import GetPromosListInteractor
+from app.interactors.user import (
+    GetPromoActivationsHistoryInteractor,
+    GetPromoCommentsInteractor,
+    GetUserPromoFeedInteractor,
+)
+from app.ioc.registry import get_providers
+from app.schemas.business import BusinessCompanyRegister, PromoCreate
+from app.schemas.enums import PromoModeEnum
+from app.schemas.user import UserRegister
+from app.utils.time import get_naive_utc_now
+from benchmarks.common import PASSWORD, percentile
+
+BATCH_SIZE = 5000
+PAGE_SIZE = 10
+
+
+async def seed(engine: AsyncEngine, security: Security, rows: int) -> tuple[str, str, str]:
+    async for db_session in get_db(engine):
+        company = await BusinessCompanyRepository(db_session).create_new_company(
+            BusinessCompanyRegister(name="Benchmark company", email=f"bench-{uuid.uuid4().hex}@company.com", password=PASSWORD),
+            security,
+        )
+        viewer = await UserRepository(db_session).create_new_user(
+            UserRegister(
+                name="Bench",
+                surname="Viewer",
+                email=f"bench-{uuid.uuid4().hex}@user.com",
+                password=PASSWORD,
+                other={"age": 30, "country": "ru"},
+            ),
+            security,
+        )
+        commented_promo = await BusinessCompanyRepository(db_session).create_new_promo(
+            str(company.id),
+            PromoCreate(
+                description="Benchmark commented promo", target={}, max_count=100, mode="COMMON", promo_common="bench-page"
+            ),
+        )
+
+        started_at = get_naive_utc_now()
+        for start in range(0, rows, BATCH_SIZE):
+            batch = range(start, min(start + BATCH_SIZE, rows))
+
+            promos = [
+                {
+                    "id": uuid.uuid4(),
+                    "description": "Benchmark page promo",
+                    "max_count": 100,
+                    "remaining_count": 100,
+                    "mode": PromoModeEnum.COMMON,
+                    "promo_common": "bench-page",
+                    "created_at": started_at - timedelta(seconds=index),
+                    "company_id": company.id,
+                }
+                for index in batch
+            ]
+            comments = [
+                {
+                    "text": "Benchmark comment text",
+                    "date": started_at - timedelta(seconds=index),
+                    "author_id": viewer.id,
+                    "promo_id": commented_promo.id,
+                }
+                for index in batch
+            ]
+            activations = [
+                {"user_id": viewer.id, "promo_id": promo["id"], "activated_at": promo["created_at"]} for promo in promos
+            ]
+            await db_session.execute(insert(PromoModel), promos)
+            await db_session.execute(insert(CommentModel), comments)
+            await db_session.execute(insert(UserPromoActivationModel), activations)
+
+        await db_session.commit()
+        await UserRepository(db_session).recount_promo_counters()
+
+    return str(company.id), str(viewer.id), str(commented_promo.id)
+
+
+def get_pages(company_id: str, user_id: str, promo_id: str) -> dict:
+    return {
+        "feed": lambda db_session, **page: GetUserPromoFeedInteractor(UserRepository(db_session))(
+            user_id=user_id, category=None, active=None, **page
+        ),
+        "company promos": lambda db_session, **page: GetPromosListInteractor(BusinessCompanyRepository(db_session))(
+            company_id=company_id, **page
+        ),
+        "comments": lambda db_session, **page: GetPromoCommentsInteractor(UserRepository(db_session))(
+            promo_id=promo_id, **page
+        ),
+        "history": lambda db_session, **page: GetPromoActivationsHistoryInteractor(UserRepository(db_session))(
+            user_id=user_id, **page
+        ),
+    }
+
+
+async def measure(engine: AsyncEngine, get_page, repeats: int, **page) -> list[float]:
+    latencies = []
+
+    for _ in range(repeats):
+        async for db_session in get_db(engine):
+            started = time.perf_counter()
+            await get_page(db_session, **page)
+            latencies.append(time.perf_counter() - started)
+
+    return latencies
+
+
+async def main(rows: int, repeats: int) -> None:
+    container = create_async_container(get_providers())
+
+    try:
+        engine = await container.get(AsyncEngine)
+        security = await container.get(Security)
+
+        company_id, user_id, promo_id = await seed(engine, security, rows)
+        depth = rows - PAGE_SIZE
+
+        for name, get_page in get_pages(company_id, user_id, promo_id).items():
+            async for db_session in get_db(engine):
+                *_, cursor = await get_page(db_session, limit=1, offset=depth - 1)
+
+            scenarios = {
+                "offset 0": {"limit": PAGE_SIZE, "offset": 0},
+                f"offset {depth}": {"limit": PAGE_SIZE, "offset": depth},
+                f"cursor at {depth}": {"limit": PAGE_SIZE, "offset": 0, "cursor": cursor},
+            }
+            for scenario, page in scenarios.items():
+                latencies = await measure(engine, get_page, repeats, **page)
+                print(
+                    f"{name}, {scenario}: p50 {percentile(latencies, 50) * 1000:.1f}ms, "
+                    f"p95 {percentile(latencies, 95) * 1000:.1f}ms"
+                )
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.repeats))
@@ -0,0 +1,287 @@
+"""
+Чтения через проекции колонок против прежнего пути через графы ORM: лента, промокод пользователя, комментарии,
+история активаций, промокоды компании и промокод компании по id.
+
+Прежние запросы (select(PromoModel) с joinedload/selectinload связей и сборкой ответа через pydantic-модели)
+повторены здесь, новые берутся из репозиториев вместе с прямыми сериализаторами. Для каждого чтения сверяет
+тела ответов побайтно и печатает задержку и пик памяти tracemalloc на запрос. Завершается с кодом 1,
+если тела различаются.
+
+Сценарий работает напрямую с репозиториями (POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET).
+
+Запуск: python -m benchmarks.projection_reads --promos 50 --unique-codes 100 --page 10 --repeats 50
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+import uuid
+import warnings
+from datetime import timedelta
+
+from pydantic import PydanticDeprecatedSince20
+from sqlalchemy import Result, func, insert, or_
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload, selectinload
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+from app.core.build import create_async_container
+from app.core.responses import JSONResponse
+from app.core.security import Security
+from app.database.postgres.models import CommentModel, PromoModel, UserPromoActivationModel
+from app.database.postgres.session import get_db
+from app.database.repositories.business import BusinessCompanyRepository
+from app.database.repositories.user import UserRepository
+from app.ioc.registry import get_providers
+from app.schemas.business import BusinessCompanyRegister, PromoCreate
+from app.schemas.user import UserRegister
+from app.utils.serializer import serialize_comment, serialize_promo_for_user, serialize_promo_read_only
+from app.utils.time import get_naive_utc_now
+from benchmarks.common import PASSWORD, percentile
+from benchmarks.serializers import legacy_comment, legacy_promo_for_user, legacy_promo_read_only
+
+
+async def seed(engine: AsyncEngine, security: Security, promos_count: int, unique_codes: int) -> tuple[str, str, str]:
+    async for db_session in get_db(engine):
+        company = await BusinessCompanyRepository(db_session).create_new_company(
+            BusinessCompanyRegister(name="Benchmark company", email=f"bench-{uuid.uuid4().hex}@company.com", password=PASSWORD),
+            security,
+        )
+        viewer = await UserRepository(db_session).create_new_user(
+            UserRegister(
+                name="Bench",
+                surname="Viewer",
+                email=f"bench-{uuid.uuid4().hex}@user.com",
+                password=PASSWORD,
+                other={"age": 30, "country": "ru"},
+            ),
+            security,
+        )
+
+        promo_ids = []
+        for index in range(promos_count):
+            target = {"age_from": 14, "country": "ru", "categories": ["ios", "коты"]} if index % 2 else {}
+            if index % 3:
+                promo = PromoCreate(
+                    description="Benchmark projection promo",
+                    target=target,
+                    max_count=100,
+                    mode="COMMON",
+                    promo_common="bench-projection",
+                )
+            else:
+                promo = PromoCreate(
+                    description="Benchmark projection promo",
+                    target=target,
+                    max_count=1,
+                    mode="UNIQUE",
+                    promo_unique=[f"code-{index}-{code}" for code in range(unique_codes)],
+                )
+            promo_ids.append((await BusinessCompanyRepository(db_session).create_new_promo(str(company.id), promo)).id)
+
+        started = get_naive_utc_now()
+        await db_session.execute(
+            insert(CommentModel),
+            [
+                {
+                    "text": f"Benchmark comment {index}",
+                    "date": started + timedelta(seconds=index),
+                    "author_id": viewer.id,
+                    "promo_id": promo_ids[0],
+                }
+                for index in range(promos_count)
+            ],
+        )
+        await db_session.execute(
+            insert(UserPromoActivationModel),
+            [
+                {"user_id": viewer.id, "promo_id": promo_id, "activated_at": started + timedelta(seconds=index)}
+                for index, promo_id in enumerate(promo_ids)
+            ],
+        )
+        await db_session.commit()
+        await UserRepository(db_session).recount_promo_counters()
+
+    return str(company.id), str(viewer.id), str(promo_ids[0])
+
+
+async def fetch_page(db_session: AsyncSession, query: select, page_size: int, *order_by) -> Result:
+    # Как и репозитории, первая страница без курсора считает общее число строк.
+    await db_session.execute(query.with_only_columns(func.count()).order_by(None))
+
+    return await db_session.execute(query.order_by(*order_by).limit(page_size).offset(0))
+
+
+def get_cases(company_id: str, user_id: str, promo_id: str, page_size: int) -> dict:
+    promo_for_user_columns = UserRepository.get_promo_for_user_columns(user_id)
+
+    async def orm_feed(db_session: AsyncSession) -> list[dict]:
+        user = await UserRepository(db_session).get_user_by_id(user_id)
+        query = (
+            select(PromoModel, *promo_for_user_columns)
+            .options(joinedload(PromoModel.company))
+            .where(
+                or_(
+                    ~PromoModel.targets.any(),
+                    PromoModel.id.in_(UserRepository.get_user_promo_target_query(user.age, user.country)),
+                )
+            )
+        )
+        result = await fetch_page(db_session, query, page_size, PromoModel.created_at.desc(), PromoModel.id.desc())
+        return [legacy_promo_for_user(*row) for row in result.all()]
+
+    async def projection_feed(db_session: AsyncSession) -> list[dict]:
+        _, promos, _ = await UserRepository(db_session).get_promos_for_user(user_id, None, None, page_size, 0)
+        return [serialize_promo_for_user(promo) for promo in promos]
+
+    async def orm_promo_for_user(db_session: AsyncSession) -> list[dict]:
+        query = (
+            select(PromoModel, *promo_for_user_columns).where(PromoModel.id == promo_id).options(joinedload(PromoModel.company))
+        )
+        return [legacy_promo_for_user(*(await db_session.execute(query)).one())]
+
+    async def projection_promo_for_user(db_session: AsyncSession) -> list[dict]:
+        return [serialize_promo_for_user(await UserRepository(db_session).get_promo_for_user_by_id(user_id, promo_id))]
+
+    async def orm_comments(db_session: AsyncSession) -> list[dict]:
+        query = select(CommentModel).where(CommentModel.promo_id == promo_id).options(selectinload(CommentModel.author))
+        result = await fetch_page(db_session, query, page_size, CommentModel.date.desc(), CommentModel.id.desc())
+        return [legacy_comment(comment) for comment in result.scalars().all()]
+
+    async def projection_comments(db_session: AsyncSession) -> list[dict]:
+        _, comments, _ = await UserRepository(db_session).get_promo_comments(promo_id, page_size, 0)
+        return [serialize_comment(comment) for comment in comments]
+
+    async def orm_history(db_session: AsyncSession) -> list[dict]:
+        query = (
+            select(PromoModel, *promo_for_user_columns, UserPromoActivationModel.activated_at)
+            .join(UserPromoActivationModel, UserPromoActivationModel.promo_id == PromoModel.id)
+            .where(UserPromoActivationModel.user_id == user_id)
+            .options(joinedload(PromoModel.company))
+        )
+        result = await fetch_page(
+            db_session, query, page_size, UserPromoActivationModel.activated_at.desc(), UserPromoActivationModel.id.desc()
+        )
+        return [legacy_promo_for_user(promo, is_liked, is_activated) for promo, is_liked, is_activated, _ in result.all()]
+
+    async def projection_history(db_session: AsyncSession) -> list[dict]:
+        _, promos, _ = await UserRepository(db_session).get_user_promo_activations_history(user_id, page_size, 0)
+        return [serialize_promo_for_user(promo) for promo in promos]
+
+    async def orm_company_promos(db_session: AsyncSession) -> list[dict]:
+        query = (
+            select(PromoModel)
+            .options(
+                selectinload(PromoModel.targets),
+                selectinload(PromoModel.unique_values),
+                selectinload(PromoModel.company),
+            )
+            .where(PromoModel.company_id == company_id)
+        )
+        result = await fetch_page(db_session, query, page_size, PromoModel.created_at.desc(), PromoModel.id.desc())
+        return [legacy_promo_read_only(promo) for promo in result.scalars().all()]
+
+    async def projection_company_promos(db_session: AsyncSession) -> list[dict]:
+        _, promos, _ = await BusinessCompanyRepository(db_session).get_promos_for_company(company_id, limit=page_size)
+        return [serialize_promo_read_only(promo) for promo in promos]
+
+    async def orm_company_promo(db_session: AsyncSession) -> list[dict]:
+        query = (
+            select(PromoModel)
+            .options(
+                selectinload(PromoModel.targets),
+                selectinload(PromoModel.unique_values),
+                selectinload(PromoModel.company),
+                selectinload(PromoModel.activations),
+            )
+            .where(PromoModel.id == promo_id)
+        )
+        return [legacy_promo_read_only((await db_session.execute(query)).scalars().one())]
+
+    async def projection_company_promo(db_session: AsyncSession) -> list[dict]:
+        return [
+            serialize_promo_read_only(await BusinessCompanyRepository(db_session).get_company_promo_by_id(company_id, promo_id))
+        ]
+
+    return {
+        "feed": (orm_feed, projection_feed),
+        "promo for user": (orm_promo_for_user, projection_promo_for_user),
+        "comments": (orm_comments, projection_comments),
+        "history": (orm_history, projection_history),
+        "company promos": (orm_company_promos, projection_company_promos),
+        "company promo": (orm_company_promo, projection_company_promo),
+    }
+
+
+async def measure(engine: AsyncEngine, read, response_class, repeats: int) -> tuple[bytes, list[float], int]:
+    latencies = []
+    peak = 0
+    body = b""
+
+    for _ in range(repeats):
+        async for db_session in get_db(engine):
+            started = time.perf_counter()
+            body = response_class(await read(db_session)).body
+            latencies.append(time.perf_counter() - started)
+
+    # Память меряется отдельными прогонами, чтобы tracemalloc не искажал задержки.
+    for _ in range(max(repeats // 10, 1)):
+        async for db_session in get_db(engine):
+            tracemalloc.start()
+            response_class(await read(db_session))
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    return body, latencies, peak
+
+
+def describe(name: str, latencies: list[float], peak: int) -> str:
+    return (
+        f"{name} p50 {percentile(latencies, 50) * 1000:6.2f}ms, p95 {percentile(latencies, 95) * 1000:6.2f}ms, "
+        f"peak {peak / 1024:7.0f} KiB"
+    )
+
+
+async def main(promos_count: int, unique_codes: int, page: int, repeats: int) -> None:
+    warnings.simplefilter("ignore", PydanticDeprecatedSince20)
+    container = create_async_container(get_providers())
+    failures = []
+
+    try:
+        engine = await container.get(AsyncEngine)
+        security = await container.get(Security)
+
+        company_id, user_id, promo_id = await seed(engine, security, promos_count, unique_codes)
+
+        for name, (orm_read, projection_read) in get_cases(company_id, user_id, promo_id, page).items():
+            orm_body, orm_latencies, orm_peak = await measure(engine, orm_read, StarletteJSONResponse, repeats)
+            projection_body, projection_latencies, projection_peak = await measure(
+                engine, projection_read, JSONResponse, repeats
+            )
+
+            if orm_body != projection_body:
+                failures.append(name)
+                print(f"FAIL {name}: bodies differ\n  orm        {orm_body[:300]}\n  projection {projection_body[:300]}")
+                continue
+
+            print(f"{name:>14}: {describe('orm', orm_latencies, orm_peak)}")
+            print(f"{'':>14}  {describe('projection', projection_latencies, projection_peak)}")
+    finally:
+        await container.close()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--promos", type=int, default=50)
+    parser.add_argument("--unique-codes", type=int, default=100)
+    parser.add_argument("--page", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.promos, args.unique_codes, args.page, args.repeats))
@@ -0,0 +1,128 @@
+"""
+Сравнение выдачи UNIQUE кодов через Redis пул и через Postgres (SKIP LOCKED).
+
+Сценарий работает напрямую с репозиториями, поэтому ему нужны те же переменные окружения, что и серверу
+(POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET).
+
+Запуск: python -m benchmarks.promo_code_pool --codes 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import uuid
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.build import create_async_container
+from app.core.config import PromoCodePoolConfig
+from app.core.security import Security
+from app.database.postgres.session import get_db
+from app.database.repositories.business import BusinessCompanyRepository
+from app.database.repositories.user import UserRepository
+from app.interactors.antifraud import AntifraudSingleFlightInteractor
+from app.interactors.pool import PromoCodePoolInteractor, PromoCodePoolReconciler
+from app.interactors.user import UserActivatePromoByIdInteractor
+from app.ioc.registry import get_providers
+from app.schemas.business import BusinessCompanyRegister, PromoCreate
+from app.schemas.user import UserRegister
+from benchmarks.common import PASSWORD, report, run_concurrently
+
+
+async def seed(engine: AsyncEngine, security: Security, codes_count: int) -> tuple[str, str, str]:
+    async for db_session in get_db(engine):
+        company = await BusinessCompanyRepository(db_session).create_new_company(
+            BusinessCompanyRegister(name="Benchmark company", email=f"bench-{uuid.uuid4().hex}@company.com", password=PASSWORD),
+            security,
+        )
+        user = await UserRepository(db_session).create_new_user(
+            UserRegister(
+                name="Bench",
+                surname="User",
+                email=f"bench-{uuid.uuid4().hex}@user.com",
+                password=PASSWORD,
+                other={"age": 30, "country": "ru"},
+            ),
+            security,
+        )
+
+        promo_ids = []
+        for _ in range(2):
+            promo = await BusinessCompanyRepository(db_session).create_new_promo(
+                str(company.id),
+                PromoCreate(
+                    description="Benchmark UNIQUE promo",
+                    target={},
+                    max_count=1,
+                    mode="UNIQUE",
+                    promo_unique=[f"code-{uuid.uuid4().hex[:20]}" for _ in range(codes_count)],
+                ),
+            )
+            promo_ids.append(str(promo.id))
+
+    return str(user.id), promo_ids[0], promo_ids[1]
+
+
+async def activate_all(
+    engine: AsyncEngine,
+    promo_code_pool: PromoCodePoolInteractor,
+    antifraud_single_flight: AntifraudSingleFlightInteractor,
+    user_id: str,
+    promo_id: str,
+    count: int,
+    concurrency: int,
+) -> tuple[list, list[float], float]:
+    async def activate():
+        async for db_session in get_db(engine):
+            interactor = UserActivatePromoByIdInteractor(UserRepository(db_session), promo_code_pool, antifraud_single_flight)
+            return await interactor.activate_promo(user_id=user_id, promo_id=promo_id)
+
+    return await run_concurrently([activate for _ in range(count)], concurrency)
+
+
+async def main(codes_count: int, concurrency: int) -> None:
+    container = create_async_container(get_providers())
+
+    try:
+        engine = await container.get(AsyncEngine)
+        redis = await container.get(Redis)
+        security = await container.get(Security)
+        antifraud_single_flight = await container.get(AntifraudSingleFlightInteractor)
+
+        user_id, postgres_promo_id, pooled_promo_id = await seed(engine, security, codes_count)
+
+        postgres_path = PromoCodePoolInteractor(redis, PromoCodePoolConfig(False, 0, 0))
+        codes, latencies, elapsed = await activate_all(
+            engine, postgres_path, antifraud_single_flight, user_id, postgres_promo_id, codes_count, concurrency
+        )
+        assert len(set(codes)) == codes_count
+        report("postgres SKIP LOCKED", latencies, elapsed)
+
+        pool_config = PromoCodePoolConfig(True, 500, 0.1)
+        pooled_path = PromoCodePoolInteractor(redis, pool_config)
+        async for db_session in get_db(engine):
+            await pooled_path.warm(pooled_promo_id, await UserRepository(db_session).get_unused_promo_codes(pooled_promo_id))
+
+        reconciler = PromoCodePoolReconciler(redis, engine, pool_config)
+        await reconciler.start()
+        codes, latencies, elapsed = await activate_all(
+            engine, pooled_path, antifraud_single_flight, user_id, pooled_promo_id, codes_count, concurrency
+        )
+        await reconciler.stop()
+        assert len(set(codes)) == codes_count
+        report("redis pool", latencies, elapsed)
+
+        async for db_session in get_db(engine):
+            unused = await UserRepository(db_session).get_unused_promo_codes(pooled_promo_id)
+        print(f"codes left unused in postgres after reconciliation: {len(unused)}")
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--codes", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.codes, args.concurrency))
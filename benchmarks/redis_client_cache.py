@@ -0,0 +1,95 @@
+"""
+Сколько обращений к Redis экономит клиентский кэш (CLIENT TRACKING) на чтении токенов и ответов антифрода.
+
+Запускается против локального redis-server (REDIS_HOST, REDIS_PORT). Число GET считается по INFO commandstats.
+
+Запуск: python -m benchmarks.redis_client_cache --keys 1000 --reads 100000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from dataclasses import replace
+
+from redis.asyncio import Redis
+
+from app.core.config import RedisConfig
+from app.core.metrics import Metrics
+from app.database.redis.client_cache import RedisClientSideCache
+from app.database.redis.session import get_redis
+from benchmarks.common import percentile
+
+
+async def get_calls(redis: Redis) -> int:
+    stats = await redis.info("commandstats")
+    return stats.get("cmdstat_get", {}).get("calls", 0)
+
+
+async def read_all(client_cache: RedisClientSideCache, keys: list[str], reads: int) -> tuple[list[float], int]:
+    latencies = []
+    calls_before = await get_calls(client_cache.redis)
+
+    for _ in range(reads):
+        key = random.choice(keys)
+
+        started = time.perf_counter()
+        await client_cache.get(key)
+        latencies.append(time.perf_counter() - started)
+
+    return latencies, await get_calls(client_cache.redis) - calls_before
+
+
+async def invalidation_lag(client_cache: RedisClientSideCache, key: str) -> float:
+    await client_cache.get(key)
+
+    value = uuid.uuid4().hex
+    started = time.perf_counter()
+    # Запись идёт мимо кэша, как с другого узла: локальная копия должна обновиться только по push-уведомлению.
+    await client_cache.redis.set(key, value, ex=3600)
+
+    while await client_cache.get(key) != value:
+        await asyncio.sleep(0)
+
+    return time.perf_counter() - started
+
+
+async def main(keys_count: int, reads: int) -> None:
+    config = RedisConfig.from_env()
+
+    async for redis in get_redis(host=config.REDIS_HOST, port=config.REDIS_PORT, max_connections=config.REDIS_MAX_CONNECTIONS):
+        keys = [f"user_token:bench-{uuid.uuid4().hex}" for _ in range(keys_count)]
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(key, uuid.uuid4().hex, ex=3600)
+            await pipe.execute()
+
+        for enabled in (False, True):
+            client_cache = RedisClientSideCache(redis, replace(config, REDIS_CLIENT_CACHE_ENABLED=enabled), Metrics())
+            await client_cache.start()
+            while enabled and not client_cache.tracking:
+                await asyncio.sleep(0.01)
+
+            latencies, calls = await read_all(client_cache, keys, reads)
+            print(
+                f"client cache {'on' if enabled else 'off'}: {reads} reads, {calls} GET round trips, "
+                f"p50 {percentile(latencies, 50) * 1000:.3f}ms, p99 {percentile(latencies, 99) * 1000:.3f}ms"
+            )
+
+            if enabled:
+                lags = [await invalidation_lag(client_cache, random.choice(keys)) for _ in range(100)]
+                print(f"invalidation lag: p50 {percentile(lags, 50) * 1000:.3f}ms, p99 {percentile(lags, 99) * 1000:.3f}ms")
+
+            await client_cache.stop()
+
+        await redis.delete(*keys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=100_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.keys, args.reads))
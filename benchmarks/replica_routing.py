@@ -0,0 +1,118 @@
+"""
+Проверка маршрутизации чтений в реплику: read-only методы репозиториев уходят в реплику, запись и всё после неё
+идут в мастер, переопределение для эндпоинта и отказ реплик возвращают чтения на мастер.
+
+Роль реплики играет второй движок поверх той же базы (или POSTGRES_REPLICA_CONNS, если задан), а каждый
+выполненный запрос записывается вместе с движком, который его выполнил. Завершается с кодом 1 при ошибке.
+Сценарий работает напрямую с репозиториями (POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET).
+
+Запуск: python -m benchmarks.replica_routing
+"""
+
+import asyncio
+import sys
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.build import create_async_container
+from app.core.config import PostgresConfig
+from app.core.metrics import Metrics
+from app.database.postgres.routing import ReplicaRouter, primary_reads_only
+from app.database.postgres.session import build_engine, get_db
+from app.database.repositories.user import UserRepository
+from app.ioc.registry import get_providers
+
+
+async def read(user_repository: UserRepository) -> None:
+    await user_repository.get_promo_comments(str(uuid.uuid4()), 10, 0)
+
+
+async def write(user_repository: UserRepository) -> None:
+    await user_repository.update_promo_counters(str(uuid.uuid4()), like_delta=0)
+
+
+async def read_only_goes_to_replica(user_repository: UserRepository) -> list[str]:
+    await read(user_repository)
+    return ["replica"]
+
+
+async def reads_after_write_stay_on_primary(user_repository: UserRepository) -> list[str]:
+    await write(user_repository)
+    await read(user_repository)
+    return ["primary"]
+
+
+async def endpoint_override_reads_primary(user_repository: UserRepository) -> list[str]:
+    token = primary_reads_only.set(True)
+    try:
+        await read(user_repository)
+    finally:
+        primary_reads_only.reset(token)
+
+    return ["primary"]
+
+
+async def main() -> None:
+    container = create_async_container(get_providers())
+
+    try:
+        engine = await container.get(AsyncEngine)
+        config = await container.get(PostgresConfig)
+
+        if config.POSTGRES_REPLICA_CONNS:
+            replica_uri = config.POSTGRES_REPLICA_CONNS[0].replace("postgresql://", "postgresql+asyncpg://")
+        else:
+            replica_uri = engine.url.render_as_string(hide_password=False)
+        replica = build_engine(replica_uri, config)
+
+        metrics = Metrics()
+        replica_router = ReplicaRouter([replica], config.POSTGRES_REPLICA_MAX_LAG, 60, metrics)
+        await replica_router.start()
+
+        used = []
+        for name, routed_engine in (("primary", engine), ("replica", replica)):
+            event.listen(
+                routed_engine.sync_engine,
+                "before_cursor_execute",
+                lambda *args, name=name: used.append(name),
+            )
+
+        scenarios = [read_only_goes_to_replica, reads_after_write_stay_on_primary, endpoint_override_reads_primary]
+        failures = []
+
+        for scenario in scenarios:
+            used.clear()
+            async for db_session in get_db(engine, replica_router):
+                expected = await scenario(UserRepository(db_session))
+
+            # Один метод репозитория может выполнить несколько запросов, поэтому подряд идущие повторы схлопываются.
+            actual = [name for index, name in enumerate(used) if index == 0 or used[index - 1] != name]
+            if actual != expected:
+                failures.append(scenario.__name__)
+                print(f"FAIL {scenario.__name__}: expected {expected}, got {actual}")
+            else:
+                print(f"ok   {scenario.__name__}")
+
+        used.clear()
+        replica_router.healthy = []
+        async for db_session in get_db(engine, replica_router):
+            await read(UserRepository(db_session))
+
+        if set(used) != {"primary"} or not metrics.counters["db_replica_fallback_total"]:
+            failures.append("unhealthy_replica_falls_back_to_primary")
+            print(f"FAIL unhealthy_replica_falls_back_to_primary: got {used}")
+        else:
+            print("ok   unhealthy_replica_falls_back_to_primary")
+
+        await replica_router.stop()
+    finally:
+        await container.close()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
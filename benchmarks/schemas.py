@@ -0,0 +1,141 @@
+"""
+Стоимость схем по отдельности: разбор тел запросов (model_validate с валидаторами CustomBaseModel) и сборка
+ответов тремя способами — схемой ответа с валидаторами запросов, как было до разделения схем, схемой ответа
+без них и доверенной сборкой прямым сериализатором из строки проекции, которой пользуется API.
+
+Заодно проверяет, что вывод прямых сериализаторов проходит схемы ответов без изменений. Строки собираются
+в памяти, поэтому база не нужна.
+
+Запуск: python -m benchmarks.schemas --repeat 200 --unique-codes 5000
+"""
+
+import argparse
+import sys
+import timeit
+import uuid
+from collections.abc import Callable
+from functools import partial
+
+from pydantic import BaseModel
+
+from app.database.postgres.models import BusinessCompanyModel, PromoUniqueValueModel
+from app.schemas.base import CustomBaseModel
+from app.schemas.business import (
+    BusinessCompanyRegister,
+    PromoCreate,
+    PromoPatch,
+    PromoReadOnly,
+    PromoStat,
+)
+from app.schemas.user import Comment, CommentTextRequest, PromoForUser, User, UserLogin, UserPatch, UserRegister
+from app.utils.serializer import (
+    serialize_comment,
+    serialize_promo_for_user,
+    serialize_promo_read_only,
+    serialize_promo_stat,
+    serialize_user,
+)
+from benchmarks.common import PASSWORD
+from benchmarks.serializers import (
+    IMAGE_URL,
+    make_comment,
+    make_comment_row,
+    make_promo,
+    make_promo_for_user_row,
+    make_promo_read_only_row,
+    make_user,
+)
+
+
+def with_request_validators(model: type[BaseModel]) -> type[BaseModel]:
+    return type(f"Validated{model.__name__}", (model, CustomBaseModel), {})
+
+
+def get_request_cases(unique_codes: int) -> dict[str, tuple[type[BaseModel], dict]]:
+    promo = {"description": "Повышенный кэшбек 10% для новых клиентов банка!", "image_url": IMAGE_URL, "max_count": 100}
+    target = {"age_from": 14, "age_until": 20, "country": "ru", "categories": ["ios", "коты"]}
+    user = {"name": "Мария", "surname": "Федотова", "email": "cu_fan@edu.hse.ru", "avatar_url": IMAGE_URL}
+
+    return {
+        "UserRegister": (UserRegister, {**user, "password": PASSWORD, "other": {"age": 23, "country": "ru"}}),
+        "UserLogin": (UserLogin, {"email": user["email"], "password": PASSWORD}),
+        "UserPatch": (UserPatch, {"name": "Анна", "avatar_url": IMAGE_URL}),
+        "BusinessCompanyRegister": (
+            BusinessCompanyRegister,
+            {"name": "Шахов production", "email": "company@edu.hse.ru", "password": PASSWORD},
+        ),
+        "PromoCreate COMMON": (PromoCreate, {**promo, "target": target, "mode": "COMMON", "promo_common": "sale-10"}),
+        f"PromoCreate UNIQUE x{unique_codes}": (
+            PromoCreate,
+            {
+                **promo,
+                "max_count": 1,
+                "target": target,
+                "mode": "UNIQUE",
+                "promo_unique": [f"code-{index}" for index in range(unique_codes)],
+            },
+        ),
+        "PromoPatch": (PromoPatch, {"description": promo["description"], "target": target, "max_count": 50}),
+        "CommentTextRequest": (CommentTextRequest, {"text": "Отличное предложение, все работает"}),
+    }
+
+
+def get_response_cases(unique_codes: int) -> dict[str, tuple[type[BaseModel], Callable[[], dict]]]:
+    company = BusinessCompanyModel(id=uuid.uuid4(), name="Шахов production", email="company@edu.hse.ru")
+    common_promo, unique_promo = make_promo(0, company), make_promo(1, company)
+    unique_promo.unique_values = [
+        PromoUniqueValueModel(promo_id=unique_promo.id, unique_code=f"code-{index}") for index in range(unique_codes)
+    ]
+    common_promo_row, unique_promo_row = make_promo_read_only_row(common_promo), make_promo_read_only_row(unique_promo)
+    promo_for_user_row = make_promo_for_user_row(common_promo, True, False)
+    user = make_user(1)
+    comment_row = make_comment_row(make_comment(1, user))
+
+    return {
+        "PromoReadOnly COMMON": (PromoReadOnly, lambda: serialize_promo_read_only(common_promo_row)),
+        f"PromoReadOnly UNIQUE x{unique_codes}": (PromoReadOnly, lambda: serialize_promo_read_only(unique_promo_row)),
+        "PromoForUser": (PromoForUser, lambda: serialize_promo_for_user(promo_for_user_row)),
+        "Comment": (Comment, lambda: serialize_comment(comment_row)),
+        "User": (User, lambda: serialize_user(user)),
+        "PromoStat": (PromoStat, lambda: serialize_promo_stat([("ru", 3), ("us", 5), ("de", 0)])),
+    }
+
+
+def measure(call, repeat: int) -> str:
+    return f"{timeit.timeit(call, number=repeat) / repeat * 1e6:9.1f}us"
+
+
+def main(repeat: int, unique_codes: int) -> None:
+    print("request parsing")
+    for name, (model, payload) in get_request_cases(unique_codes).items():
+        print(f"  {name:>32}: {measure(partial(model.model_validate, payload), repeat)}")
+
+    failures = []
+
+    print("response building: request validators / response schema / direct serializer")
+    for name, (model, serialize) in get_response_cases(unique_codes).items():
+        validated_model = with_request_validators(model)
+        data = serialize()
+
+        if model.model_validate(data).model_dump(mode="json", exclude_none=True) != data:
+            failures.append(name)
+            print(f"FAIL {name}: serializer output does not round-trip through {model.__name__}")
+            continue
+
+        print(
+            f"  {name:>32}: {measure(partial(validated_model.model_validate, data), repeat)} "
+            f"/ {measure(partial(model.model_validate, data), repeat)} "
+            f"/ {measure(serialize, repeat)}"
+        )
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--unique-codes", type=int, default=5000)
+    args = parser.parse_args()
+
+    main(args.repeat, args.unique_codes)
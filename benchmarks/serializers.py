@@ -0,0 +1,330 @@
+"""
+Сериализация страниц ответа: прежний путь (pydantic-модель -> строка JSON -> json.loads -> JSONResponse starlette)
+против прямых сериализаторов app.utils.serializer и JSONResponse из app.core.responses (orjson, если установлен).
+
+Для каждого сериализатора и размера страницы сверяет тела ответов побайтно и печатает время сборки тела
+одной страницы. Завершается с кодом 1, если тела различаются. База не нужна: строки ORM для прежнего пути
+и строки проекций репозиториев для прямых сериализаторов собираются в памяти.
+
+Запуск: python -m benchmarks.serializers --pages 10,100 --repeat 200
+"""
+
+import argparse
+import json
+import sys
+import timeit
+import uuid
+import warnings
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from pydantic import PydanticDeprecatedSince20
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+from app.core.responses import JSONResponse, orjson
+from app.database.postgres.models import (
+    BusinessCompanyModel,
+    CommentModel,
+    PromoModel,
+    PromoTargetModel,
+    PromoUniqueValueModel,
+    UserModel,
+)
+from app.schemas.business import PromoReadOnly, PromoStat, PromoStatCountriesActivations, Target
+from app.schemas.enums import PromoModeEnum
+from app.schemas.user import Comment, CommentAuthor, PromoForUser, User, UserTargetSettings
+from app.utils.serializer import (
+    serialize_comment,
+    serialize_promo_for_user,
+    serialize_promo_read_only,
+    serialize_promo_stat,
+    serialize_user,
+)
+from app.utils.time import format_rfc3339_date
+
+IMAGE_URL = "https://cdn2.thecatapi.com/images/3lo.jpg"
+
+
+def legacy_promo_read_only(promo: PromoModel) -> dict:
+    target = Target()
+    if promo.targets:
+        target_data = promo.targets[0]
+        target = Target(
+            age_from=target_data.age_from,
+            age_until=target_data.age_until,
+            country=target_data.country,
+            categories=target_data.categories,
+        )
+
+    promo_code = (
+        promo.promo_common
+        if promo.mode == PromoModeEnum.COMMON
+        else [unique_value.unique_code for unique_value in promo.unique_values]
+    )
+
+    promo_read_only = PromoReadOnly(
+        description=promo.description,
+        image_url=promo.image_url,
+        target=target,
+        max_count=promo.max_count,
+        active_from=promo.active_from,
+        active_until=promo.active_until,
+        mode=promo.mode,
+        promo_common=promo.promo_common if promo.mode == PromoModeEnum.COMMON else None,
+        promo_unique=promo_code if promo.mode == PromoModeEnum.UNIQUE else None,
+        promo_id=promo.id,
+        company_id=promo.company_id,
+        company_name=promo.company.name,
+        like_count=promo.like_count,
+        used_count=promo.used_count,
+        active=promo.is_active,
+    )
+
+    return json.loads(promo_read_only.json(exclude_none=True))
+
+
+def legacy_promo_stat(promo_activations: list[tuple[str, int]]) -> dict:
+    activations_count = sum(activation_count for _, activation_count in promo_activations)
+
+    countries = [
+        PromoStatCountriesActivations(country=country, activations_count=activation_count)
+        for country, activation_count in promo_activations
+        if activation_count > 0
+    ]
+
+    return json.loads(PromoStat(activations_count=activations_count, countries=countries).json(exclude_none=True))
+
+
+def legacy_user(user_orm: UserModel) -> dict:
+    user = User(
+        name=user_orm.name,
+        surname=user_orm.surname,
+        email=user_orm.email,
+        avatar_url=user_orm.avatar_url,
+        other=UserTargetSettings(age=user_orm.age, country=user_orm.country),
+    )
+
+    return json.loads(user.json(exclude_none=True))
+
+
+def legacy_promo_for_user(promo: PromoModel, is_liked_by_user: bool, is_activated_by_user: bool) -> dict:
+    promo_for_user = PromoForUser(
+        promo_id=promo.id,
+        company_id=promo.company_id,
+        company_name=promo.company.name,
+        description=promo.description,
+        image_url=promo.image_url,
+        active=promo.is_active,
+        is_activated_by_user=is_activated_by_user,
+        like_count=promo.like_count,
+        is_liked_by_user=is_liked_by_user,
+        comment_count=promo.comment_count,
+    )
+
+    return json.loads(promo_for_user.json(exclude_none=True))
+
+
+def legacy_comment(comment_orm: CommentModel) -> dict:
+    author = CommentAuthor(
+        name=comment_orm.author.name,
+        surname=comment_orm.author.surname,
+        avatar_url=comment_orm.author.avatar_url,
+    )
+
+    comment = Comment(
+        id=comment_orm.id,
+        text=comment_orm.text,
+        date=format_rfc3339_date(comment_orm.date, "03:00"),
+        author=author,
+    )
+
+    return json.loads(comment.json(exclude_none=True))
+
+
+def make_user(index: int) -> UserModel:
+    return UserModel(
+        id=uuid.uuid4(),
+        name="Мария",
+        surname="Федотова",
+        email=f"user-{index}@edu.hse.ru",
+        avatar_url=IMAGE_URL if index % 2 else None,
+        age=20 + index % 50,
+        country="ru" if index % 3 else "US",
+    )
+
+
+def make_promo(index: int, company: BusinessCompanyModel) -> PromoModel:
+    is_common = index % 2 == 0
+    promo_id = uuid.uuid4()
+
+    promo = PromoModel(
+        id=promo_id,
+        description=f"Повышенный кэшбек {index}% для новых клиентов банка!",
+        image_url=IMAGE_URL if index % 3 else None,
+        max_count=100 if is_common else 1,
+        used_count=index,
+        remaining_count=100 - index % 100,
+        like_count=index * 2,
+        comment_count=index % 7,
+        active_from=date(2025, 1, 1) if index % 4 else None,
+        active_until=date.today() + timedelta(days=index % 5 - 1) if index % 5 else None,
+        mode=PromoModeEnum.COMMON if is_common else PromoModeEnum.UNIQUE,
+        promo_common="sale-10" if is_common else None,
+        company_id=company.id,
+    )
+    promo.company = company
+    promo.targets = (
+        [PromoTargetModel(promo_id=promo_id, age_from=14, age_until=None, country="ru", categories=["ios", "коты"])]
+        if index % 2
+        else []
+    )
+    promo.unique_values = (
+        [] if is_common else [PromoUniqueValueModel(promo_id=promo_id, unique_code=f"code-{index}-{code}") for code in range(5)]
+    )
+
+    return promo
+
+
+def make_comment(index: int, author: UserModel) -> CommentModel:
+    comment = CommentModel(
+        id=uuid.uuid4(),
+        text=f"Отличное предложение номер {index}, все работает",
+        date=datetime(2025, 1, 2, 15, 4, 5, 123456) + timedelta(minutes=index),
+    )
+    comment.author = author
+
+    return comment
+
+
+def make_promo_read_only_row(promo: PromoModel) -> SimpleNamespace:
+    target = promo.targets[0] if promo.targets else PromoTargetModel()
+
+    return SimpleNamespace(
+        id=promo.id,
+        description=promo.description,
+        image_url=promo.image_url,
+        max_count=promo.max_count,
+        active_from=promo.active_from,
+        active_until=promo.active_until,
+        mode=promo.mode,
+        promo_common=promo.promo_common,
+        company_id=promo.company_id,
+        company_name=promo.company.name,
+        like_count=promo.like_count,
+        used_count=promo.used_count,
+        active=promo.is_active,
+        created_at=promo.created_at,
+        age_from=target.age_from,
+        age_until=target.age_until,
+        country=target.country,
+        categories=target.categories,
+        promo_unique=[unique_value.unique_code for unique_value in promo.unique_values] or None,
+    )
+
+
+def make_promo_for_user_row(promo: PromoModel, is_liked_by_user: bool, is_activated_by_user: bool) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=promo.id,
+        company_id=promo.company_id,
+        company_name=promo.company.name,
+        description=promo.description,
+        image_url=promo.image_url,
+        active=promo.is_active,
+        like_count=promo.like_count,
+        comment_count=promo.comment_count,
+        created_at=promo.created_at,
+        is_liked_by_user=is_liked_by_user,
+        is_activated_by_user=is_activated_by_user,
+    )
+
+
+def make_comment_row(comment: CommentModel) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=comment.id,
+        text=comment.text,
+        date=comment.date,
+        author_name=comment.author.name,
+        author_surname=comment.author.surname,
+        author_avatar_url=comment.author.avatar_url,
+    )
+
+
+def build_cases(page: int) -> dict:
+    company = BusinessCompanyModel(id=uuid.uuid4(), name="Шахов production", email="company@edu.hse.ru")
+    promos = [make_promo(index, company) for index in range(page)]
+    users = [make_user(index) for index in range(page)]
+    comments = [make_comment(index, user) for index, user in enumerate(users)]
+    promos_for_user = [(promo, index % 2 == 0, index % 3 == 0) for index, promo in enumerate(promos)]
+
+    return {
+        "promo_read_only": (
+            legacy_promo_read_only,
+            [(promo,) for promo in promos],
+            serialize_promo_read_only,
+            [(make_promo_read_only_row(promo),) for promo in promos],
+        ),
+        "promo_for_user": (
+            legacy_promo_for_user,
+            promos_for_user,
+            serialize_promo_for_user,
+            [(make_promo_for_user_row(*arguments),) for arguments in promos_for_user],
+        ),
+        "comment": (
+            legacy_comment,
+            [(comment,) for comment in comments],
+            serialize_comment,
+            [(make_comment_row(comment),) for comment in comments],
+        ),
+        "user": (legacy_user, [(user,) for user in users], serialize_user, [(user,) for user in users]),
+    }
+
+
+def main(pages: list[int], repeat: int) -> None:
+    warnings.simplefilter("ignore", PydanticDeprecatedSince20)
+    print(f"encoder: {'orjson' if orjson is not None else 'json'}")
+    failures = []
+
+    for page in pages:
+        cases = build_cases(page)
+
+        def render(serialize, arguments, response_class):
+            return lambda: response_class([serialize(*argument) for argument in arguments]).body
+
+        candidates = {
+            name: (
+                render(legacy, legacy_arguments, StarletteJSONResponse),
+                render(direct, direct_arguments, JSONResponse),
+            )
+            for name, (legacy, legacy_arguments, direct, direct_arguments) in cases.items()
+        }
+        # Прежний путь валидирует страны по ISO 3166, поэтому коды берутся из существующих.
+        country_codes = [("ru", 3), ("us", 0), ("de", 1)] * max(page // 3, 1)
+        candidates["promo_stat"] = (
+            lambda country_codes=country_codes: StarletteJSONResponse(legacy_promo_stat(country_codes)).body,
+            lambda country_codes=country_codes: JSONResponse(serialize_promo_stat(country_codes)).body,
+        )
+
+        for name, (legacy, direct) in candidates.items():
+            if legacy() != direct():
+                failures.append(f"{name}[{page}]")
+                print(f"FAIL {name} page {page}: bodies differ\n  legacy {legacy()[:300]}\n  direct {direct()[:300]}")
+                continue
+
+            legacy_time = timeit.timeit(legacy, number=repeat) / repeat
+            direct_time = timeit.timeit(direct, number=repeat) / repeat
+            print(
+                f"{name:>16} page {page:>3}: legacy {legacy_time * 1e6:8.1f}us, direct {direct_time * 1e6:8.1f}us, "
+                f"x{legacy_time / direct_time:.1f}"
+            )
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", default="10,100")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    main([int(page) for page in args.pages.split(",")], args.repeat)
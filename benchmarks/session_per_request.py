@@ -0,0 +1,107 @@
+"""
+Использование пула соединений, когда запрос получает отдельную сессию на каждый репозиторий и когда
+все репозитории запроса делят одну сессию из REQUEST-скоупа контейнера.
+
+Каждый запрос читает пользователя и компанию, а затем ждёт --work секунд, имитируя внешний вызов
+до закрытия сессии. Сценарий работает напрямую с репозиториями (POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET).
+
+Запуск: python -m benchmarks.session_per_request --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.build import create_async_container
+from app.database.postgres.models import BusinessCompanyModel, UserModel
+from app.database.postgres.session import get_db
+from app.database.repositories.business import BusinessCompanyRepository
+from app.database.repositories.user import UserRepository
+from app.ioc.registry import get_providers
+from benchmarks.common import report, run_concurrently
+
+
+async def seed(engine: AsyncEngine) -> tuple[str, str]:
+    user_id, company_email = uuid.uuid4(), f"bench-{uuid.uuid4().hex}@company.com"
+
+    async for db_session in get_db(engine):
+        await db_session.execute(
+            insert(UserModel),
+            [
+                {
+                    "id": user_id,
+                    "name": "Bench",
+                    "surname": "User",
+                    "email": f"bench-{uuid.uuid4().hex}@user.com",
+                    "password": "-",
+                    "age": 30,
+                    "country": "ru",
+                }
+            ],
+        )
+        await db_session.execute(
+            insert(BusinessCompanyModel), [{"name": "Benchmark company", "email": company_email, "password": "-"}]
+        )
+        await db_session.commit()
+
+    return str(user_id), company_email
+
+
+async def sample_checked_out(engine: AsyncEngine, samples: list[int]) -> None:
+    while True:
+        samples.append(engine.pool.checkedout())
+        await asyncio.sleep(0.001)
+
+
+async def main(requests: int, concurrency: int, work: float) -> None:
+    container = create_async_container(get_providers())
+
+    try:
+        engine = await container.get(AsyncEngine)
+        user_id, company_email = await seed(engine)
+
+        async def session_per_repository():
+            async for user_session in get_db(engine):
+                async for company_session in get_db(engine):
+                    await UserRepository(user_session).get_user_by_id(user_id)
+                    await BusinessCompanyRepository(company_session).get_company_by_email(company_email)
+                    await asyncio.sleep(work)
+
+        async def shared_session():
+            async with container() as request_container:
+                user_repository = await request_container.get(UserRepository)
+                business_company_repository = await request_container.get(BusinessCompanyRepository)
+
+                await user_repository.get_user_by_id(user_id)
+                await business_company_repository.get_company_by_email(company_email)
+                await asyncio.sleep(work)
+
+        for name, handle in (("session per repository", session_per_repository), ("shared session", shared_session)):
+            checkouts, wait_seconds = engine.pool.checkouts, engine.pool.checkout_wait_seconds
+            samples = []
+            sampler = asyncio.create_task(sample_checked_out(engine, samples))
+
+            _, latencies, elapsed = await run_concurrently([handle for _ in range(requests)], concurrency)
+
+            sampler.cancel()
+            report(name, latencies, elapsed)
+            print(
+                f"  checkouts per request {(engine.pool.checkouts - checkouts) / requests:.2f}, "
+                f"peak checked out {max(samples, default=0)}, "
+                f"pool wait {(engine.pool.checkout_wait_seconds - wait_seconds) * 1000:.0f}ms total"
+            )
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--work", type=float, default=0.005)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.work))
@@ -0,0 +1,87 @@
+"""
+Задержка /ping и /user/feed во время волны входов пользователей.
+
+Хэширование паролей выполняется в пуле потоков, поэтому p99 лёгких запросов не должен расти во время волны,
+а входы сверх PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE получают 503.
+
+Запуск: BASE_URL=http://localhost:8080/api python -m benchmarks.sign_in_storm --sign-ins 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+
+from httpx import AsyncClient
+
+from benchmarks.common import (
+    PASSWORD,
+    auth_headers,
+    create_client,
+    percentile,
+    report,
+    run_concurrently,
+    sign_up_user,
+)
+
+
+async def probe(client: AsyncClient, token: str, duration: float) -> dict[str, list[float]]:
+    latencies = {"/ping": [], "/user/feed": []}
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        for path, headers in (("/ping", {}), ("/user/feed", auth_headers(token))):
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+            latencies[path].append(time.perf_counter() - started)
+
+    return latencies
+
+
+def print_probe(name: str, latencies: dict[str, list[float]]) -> None:
+    for path, values in latencies.items():
+        print(
+            f"{name} {path}: {len(values)} requests, p50 {percentile(values, 50) * 1000:.1f}ms, "
+            f"p99 {percentile(values, 99) * 1000:.1f}ms"
+        )
+
+
+async def main(sign_ins: int, concurrency: int, baseline: float) -> None:
+    async with create_client(max_connections=concurrency + 10) as client:
+        email = f"bench-{uuid.uuid4().hex}@user.com"
+        await sign_up_user(client, email=email)
+        # Вход выдаёт новый токен и отзывает старый, поэтому ленту читаем отдельным пользователем.
+        feed_token = await sign_up_user(client)
+
+        print_probe("idle", await probe(client, feed_token, baseline))
+
+        def sign_in():
+            return client.post("/user/auth/sign-in", json={"email": email, "password": PASSWORD})
+
+        storm = asyncio.create_task(run_concurrently([sign_in for _ in range(sign_ins)], concurrency))
+
+        latencies = {"/ping": [], "/user/feed": []}
+        while not storm.done():
+            for path, values in (await probe(client, feed_token, 0.5)).items():
+                latencies[path] += values
+
+        responses, sign_in_latencies, elapsed = await storm
+        print_probe("storm", latencies)
+
+        metrics = (await client.get("/metrics")).json()
+
+    report("sign-in", sign_in_latencies, elapsed)
+    print(f"statuses: {dict(Counter(response.status_code for response in responses))}")
+    print(f"metrics: { {name: value for name, value in metrics.items() if name.startswith('password_hash')} }")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sign-ins", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--baseline", type=float, default=5.0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.sign_ins, args.concurrency, args.baseline))
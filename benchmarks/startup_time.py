@@ -0,0 +1,89 @@
+"""
+Время холодного старта сервера от запуска процесса до первого успешного GET /api/ping при разных
+POSTGRES_SCHEMA_MODE: create_all (по умолчанию, отражение всех таблиц), verify (одна проверка ревизии alembic) и skip.
+
+Каждый запуск поднимает отдельный процесс main.py на свободном порту с теми же переменными окружения,
+что и сервер (POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET). Завершается с кодом 1, если сервер
+не поднялся, например из-за несовпадения ревизии схемы.
+
+Запуск: python -m benchmarks.startup_time --modes verify,create_all --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.common import get_free_port
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def measure_startup(mode: str, timeout: float) -> float | None:
+    port = get_free_port()
+    env = {**os.environ, "SERVER_ADDRESS": f"127.0.0.1:{port}", "POSTGRES_SCHEMA_MODE": mode}
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "main.py"], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+
+    try:
+        with httpx.Client(timeout=1) as client:
+            while time.perf_counter() - started < timeout:
+                if process.poll() is not None:
+                    print(process.stderr.read().decode().strip().splitlines()[-1:])
+                    return None
+
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/api/ping").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+
+                time.sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait()
+
+    return None
+
+
+def main(modes: list[str], runs: int, timeout: float) -> None:
+    failed = False
+
+    for mode in modes:
+        timings = []
+        for _ in range(runs):
+            timing = measure_startup(mode, timeout)
+            if timing is None:
+                failed = True
+                break
+            timings.append(timing)
+
+        if len(timings) < runs:
+            print(f"{mode}: сервер не поднялся")
+            continue
+
+        print(
+            f"{mode}: {runs} starts, median {statistics.median(timings) * 1000:.0f}ms, "
+            f"min {min(timings) * 1000:.0f}ms, max {max(timings) * 1000:.0f}ms"
+        )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", default="verify,create_all")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    main(args.modes.split(","), args.runs, args.timeout)
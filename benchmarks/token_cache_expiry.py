@@ -0,0 +1,124 @@
+"""
+Проверка срока жизни токенов в VerifiedTokenCache: запись L1 не переживает ключ user_token:* в Redis, даже если
+exp в JWT позже. Ключ в Redis и запись L1 живут ACCESS_TOKEN_EXPIRE_MINUTES.
+
+Redis и клиентский кэш заменены хранилищем в памяти с истечением ключей, часы сдвигаются вручную, поэтому
+внешние сервисы не нужны. Завершается с кодом 1, если хотя бы один сценарий не прошёл.
+
+Запуск: python -m benchmarks.token_cache_expiry
+"""
+
+import asyncio
+import dataclasses
+import sys
+import time
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from app.core.config import SecurityConfig, TokenCacheConfig
+from app.core.exceptions import EntityUnauthorizedError
+from app.core.metrics import Metrics
+from app.core.security import Security
+from app.interactors.auth import OAuth2PasswordBearerUserInteractor
+from app.interactors.caching import CacheAccessTokenInteractor, VerifiedTokenCache
+from app.schemas.enums import EntityTypeEnum
+
+EXPIRE_MINUTES = 90
+
+
+class Clock:
+    def __init__(self):
+        self.offset = 0.0
+        self.time = time.time
+
+    def __call__(self) -> float:
+        return self.time() + self.offset
+
+
+class ExpiringStore:
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.values: dict[str, tuple[str, float]] = {}
+
+    async def set(self, key: str, value: str, ex: int) -> None:
+        self.values[key] = (value, self.clock() + ex)
+
+    async def get(self, key: str) -> str | None:
+        entry = self.values.get(key)
+
+        if entry is None or entry[1] <= self.clock():
+            return None
+
+        return entry[0]
+
+    async def publish(self, channel: str, message: str) -> None:
+        pass
+
+
+async def authenticate(
+    interactor: OAuth2PasswordBearerUserInteractor, token: str, cache: CacheAccessTokenInteractor
+) -> str | None:
+    try:
+        return await interactor(token, cache)
+    except EntityUnauthorizedError:
+        return None
+
+
+async def main() -> None:
+    config = dataclasses.replace(
+        SecurityConfig.from_env(), RANDOM_SECRET=uuid.uuid4().hex, ACCESS_TOKEN_EXPIRE_MINUTES=EXPIRE_MINUTES
+    )
+    metrics = Metrics()
+    security = Security(config, metrics)
+    clock = Clock()
+    failures = []
+
+    def check(name: str, ok: bool) -> None:
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+
+    try:
+        with mock.patch("time.time", clock):
+            store = ExpiringStore(clock)
+            token_cache_config = TokenCacheConfig(TOKEN_CACHE_ENABLED=True, TOKEN_CACHE_SIZE=100)
+            token_cache = VerifiedTokenCache(store, token_cache_config, config, metrics)
+            # Подписку на инвалидации заменяет хранилище в памяти, поэтому кэш считается подписанным сразу.
+            token_cache.subscribed = True
+            cache = CacheAccessTokenInteractor(store, token_cache, store, config)
+            interactor = OAuth2PasswordBearerUserInteractor(security, token_cache)
+
+            check("redis key ttl follows ACCESS_TOKEN_EXPIRE_MINUTES", cache.ttl == EXPIRE_MINUTES * 60)
+
+            # JWT живёт дольше ключа в Redis: после истечения ключа токен должен отклоняться и из L1.
+            user_id = str(uuid.uuid4())
+            token = security.create_access_token({"sub": user_id, "type": EntityTypeEnum.USER}, timedelta(hours=2))
+            await cache.save_user_token(user_id, token)
+
+            check("token accepted while redis key is alive", await authenticate(interactor, token, cache) == user_id)
+            check("token served from L1", token_cache.get(token, EntityTypeEnum.USER) == user_id)
+
+            clock.offset = cache.ttl + 1
+            check("jwt is still valid after redis key expired", security.decode_access_token(token) is not None)
+            check("L1 entry expired together with redis key", token_cache.get(token, EntityTypeEnum.USER) is None)
+            check("token rejected after redis key expired", await authenticate(interactor, token, cache) is None)
+
+            # Токен со сроком по умолчанию: exp совпадает с истечением ключа в Redis.
+            clock.offset = 0.0
+            user_id = str(uuid.uuid4())
+            token = security.create_access_token({"sub": user_id, "type": EntityTypeEnum.USER})
+            await cache.save_user_token(user_id, token)
+
+            check("default token accepted", await authenticate(interactor, token, cache) == user_id)
+            clock.offset = cache.ttl + 1
+            check("default token rejected after expiry", await authenticate(interactor, token, cache) is None)
+    finally:
+        security.close()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
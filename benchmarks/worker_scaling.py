@@ -0,0 +1,103 @@
+"""
+Пропускная способность GET /api/user/feed при разном числе воркеров uvicorn (SERVER_WORKERS) и время
+корректной остановки по SIGTERM.
+
+Для каждого числа воркеров поднимается отдельный процесс main.py на свободном порту. Пулы Postgres, Redis
+и клиента антифрода делятся между воркерами через POSTGRES_POOL_BUDGET, REDIS_POOL_BUDGET и
+ANTIFRAUD_POOL_BUDGET, поэтому суммарное число соединений не растёт с числом воркеров. Остальные переменные
+окружения те же, что и у сервера (POSTGRES_CONN, REDIS_HOST, REDIS_PORT, RANDOM_SECRET, ANTIFRAUD_ADDRESS).
+
+Запуск: python -m benchmarks.worker_scaling --workers 1,2,4,8 --requests 20000 --concurrency 256
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from httpx import AsyncClient, Limits, TransportError
+
+from benchmarks.common import auth_headers, get_free_port, report, run_concurrently, sign_up_user
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+async def wait_until_ready(process: asyncio.subprocess.Process, client: AsyncClient, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+
+    while time.perf_counter() < deadline:
+        if process.returncode is not None:
+            raise RuntimeError("Сервер завершился при запуске")
+
+        try:
+            if (await client.get("/ping")).status_code == 200:
+                return
+        except TransportError:
+            pass
+
+        await asyncio.sleep(0.05)
+
+    raise RuntimeError("Сервер не поднялся вовремя")
+
+
+async def measure(workers: int, requests: int, concurrency: int, budgets: dict[str, int]) -> None:
+    port = get_free_port()
+    env = {
+        **os.environ,
+        "SERVER_ADDRESS": f"127.0.0.1:{port}",
+        "SERVER_WORKERS": str(workers),
+        **{name: str(budget) for name, budget in budgets.items()},
+    }
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "main.py", cwd=ROOT, env=env, stdout=asyncio.subprocess.DEVNULL
+    )
+
+    try:
+        limits = Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}/api", limits=limits, timeout=60) as client:
+            await wait_until_ready(process, client, timeout=60)
+
+            token = await sign_up_user(client)
+
+            def get_feed():
+                return client.get("/user/feed", headers=auth_headers(token))
+
+            # Прогрев: каждый воркер открывает соединения своих пулов до замера.
+            await run_concurrently([get_feed for _ in range(concurrency * 2)], concurrency)
+
+            responses, latencies, elapsed = await run_concurrently([get_feed for _ in range(requests)], concurrency)
+
+        report(f"{workers} workers", latencies, elapsed)
+        print(f"  statuses: {dict(Counter(response.status_code for response in responses))}")
+    finally:
+        started = time.perf_counter()
+        process.send_signal(signal.SIGTERM)
+        await process.wait()
+        print(f"  drained in {(time.perf_counter() - started) * 1000:.0f}ms, exit code {process.returncode}")
+
+
+async def main(workers: list[int], requests: int, concurrency: int, budgets: dict[str, int]) -> None:
+    for count in workers:
+        await measure(count, requests, concurrency, budgets)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--pool-budget", type=int, default=80)
+    parser.add_argument("--redis-budget", type=int, default=100)
+    parser.add_argument("--antifraud-budget", type=int, default=100)
+    args = parser.parse_args()
+
+    budgets = {
+        "POSTGRES_POOL_BUDGET": args.pool_budget,
+        "REDIS_POOL_BUDGET": args.redis_budget,
+        "ANTIFRAUD_POOL_BUDGET": args.antifraud_budget,
+    }
+    asyncio.run(main([int(count) for count in args.workers.split(",")], args.requests, args.concurrency, budgets))
@@ -4,22 +4,32 @@ import uvicorn
 from dishka.integrations.fastapi import setup_dishka
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.api.v2 import root_router
 from app.core.build import create_async_container
-from app.core.config import create_config
+from app.core.config import PromoCodePoolConfig, create_config
 from app.core.exceptions import setup_exception_handlers
+from app.core.responses import JSONResponse
+from app.interactors.pool import PromoCodePoolReconciler
 from app.ioc.registry import get_providers
 
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Движок создаётся до приёма запросов, чтобы несовпадение ревизии схемы остановило запуск сразу.
+    await app.state.dishka_container.get(AsyncEngine)
+
+    promo_code_pool_config = await app.state.dishka_container.get(PromoCodePoolConfig)
+    if promo_code_pool_config.PROMO_CODE_POOL_ENABLED:
+        await app.state.dishka_container.get(PromoCodePoolReconciler)
+
     yield
     await app.state.dishka_container.close()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(lifespan=lifespan)
+    app = FastAPI(lifespan=lifespan, default_response_class=JSONResponse)
 
     return app
 
@@ -41,19 +51,38 @@ def configure_app(app: FastAPI, root_router: APIRouter) -> None:
     setup_dishka(container, app)
 
 
-def main():
+def get_app() -> FastAPI:
     app = create_app()
     configure_app(app, root_router)
 
-    config = create_config()
+    return app
+
+
+def main():
+    config = create_config().server_config
 
-    host = config.server_config.SERVER_ADDRESS
-    port = config.server_config.SERVER_PORT
+    host = config.SERVER_ADDRESS
+    port = config.SERVER_PORT
 
     if ":" in host:
         host, port = host.split(":")
 
-    uvicorn.run(app, host=host, port=int(port))
+    # Воркеры uvicorn запускаются отдельными процессами, поэтому приложение передаётся фабрикой:
+    # каждый воркер собирает свой контейнер со своими пулами Postgres, Redis и httpx.
+    # По SIGTERM воркер перестаёт принимать соединения, дожидается текущих запросов
+    # не дольше SERVER_GRACEFUL_TIMEOUT и закрывает контейнер в lifespan.
+    uvicorn.run(
+        "main:get_app" if config.SERVER_WORKERS > 1 else get_app(),
+        factory=config.SERVER_WORKERS > 1,
+        host=host,
+        port=int(port),
+        workers=config.SERVER_WORKERS,
+        loop=config.SERVER_LOOP,
+        http=config.SERVER_HTTP,
+        backlog=config.SERVER_BACKLOG,
+        timeout_keep_alive=config.SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=config.SERVER_GRACEFUL_TIMEOUT,
+    )
 
 
 if __name__ == "__main__":
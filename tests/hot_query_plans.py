@@ -0,0 +1,287 @@
+import contextlib
+import json
+import random
+import uuid
+from collections.abc import AsyncIterator
+from datetime import date, timedelta
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import PostgresConfig
+from app.core.exceptions import EntityAccessDeniedError, EntityNotFoundError
+from app.database.postgres.base import Base
+from app.database.postgres.models import (
+    BusinessCompanyModel,
+    CommentModel,
+    PromoModel,
+    PromoTargetModel,
+    PromoUniqueValueModel,
+    UserModel,
+    UserPromoActivationModel,
+    user_promo_likes,
+)
+from app.database.postgres.session import create_all_tables, get_db
+from app.database.repositories.business import BusinessCompanyRepository
+from app.database.repositories.user import UserRepository
+from app.schemas.enums import PromoModeEnum, PromoSortByEnum
+from app.utils.cursor import encode_cursor
+from app.utils.db_uri import get_db_uri
+from app.utils.time import get_naive_utc_now
+
+BATCH_SIZE = 5000
+COMPANIES_COUNT = 50
+UNIQUE_CODES_PER_PROMO = 5
+COUNTRIES = ["ru", "us", "gb", "fr", "de", "kz", "by", "cn", "jp", "br"]
+CATEGORIES = ["food", "travel", "books", "music", "sport", "games", "cinema", "cars"]
+
+# X-Total-Count первой страницы ленты считает все доступные пользователю промокоды и не может обойтись без полного чтения.
+ALLOWED_FULL_COUNTS = {"feed", "feed by category", "feed of active promos"}
+
+HOT_RELATIONS = {
+    "promos",
+    "users",
+    "user_promo_activations",
+    "user_promo_likes",
+    "comments",
+    "promo_unique_values",
+}
+
+
+async def insert_batches(db_session, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        await db_session.execute(insert(table), rows[start : start + BATCH_SIZE])
+
+
+async def seed(engine: AsyncEngine, users_count: int, promos_count: int) -> dict:
+    now = get_naive_utc_now()
+
+    companies = [
+        {"id": uuid.uuid4(), "name": "Explain company", "email": f"explain-{uuid.uuid4().hex}@company.com", "password": "-"}
+        for _ in range(COMPANIES_COUNT)
+    ]
+    users = [
+        {
+            "id": uuid.uuid4(),
+            "name": "Explain",
+            "surname": "User",
+            "email": f"explain-{uuid.uuid4().hex}@user.com",
+            "password": "-",
+            "age": random.randint(14, 80),
+            "country": random.choice(COUNTRIES),
+        }
+        for _ in range(users_count)
+    ]
+
+    promos, targets, unique_values = [], [], []
+    for index in range(promos_count):
+        mode = PromoModeEnum.UNIQUE if index % 4 == 0 else PromoModeEnum.COMMON
+        max_count = 1 if mode == PromoModeEnum.UNIQUE else random.randint(10, 1000)
+        promo = {
+            "id": uuid.uuid4(),
+            "description": "Explain promo",
+            "max_count": max_count,
+            "remaining_count": UNIQUE_CODES_PER_PROMO if mode == PromoModeEnum.UNIQUE else max_count,
+            "mode": mode,
+            "promo_common": "explain" if mode == PromoModeEnum.COMMON else None,
+            "active_from": date.today() - timedelta(days=random.randint(0, 30)) if index % 3 == 0 else None,
+            "active_until": date.today() + timedelta(days=random.randint(-5, 30)) if index % 5 == 0 else None,
+            "created_at": now - timedelta(seconds=index),
+            "company_id": random.choice(companies)["id"],
+        }
+        promos.append(promo)
+
+        if index % 2 == 0:
+            targets.append(
+                {
+                    "promo_id": promo["id"],
+                    "age_from": random.choice([None, 18]),
+                    "age_until": random.choice([None, 60]),
+                    "country": random.choice([None, *COUNTRIES]),
+                    "categories": random.sample(CATEGORIES, 2),
+                }
+            )
+
+        if mode == PromoModeEnum.UNIQUE:
+            unique_values += [
+                {"promo_id": promo["id"], "unique_code": f"code-{uuid.uuid4().hex[:20]}", "is_used": False}
+                for _ in range(UNIQUE_CODES_PER_PROMO)
+            ]
+
+    activations = [
+        {"user_id": random.choice(users)["id"], "promo_id": random.choice(promos)["id"], "activated_at": now}
+        for _ in range(promos_count * 3)
+    ]
+    likes = {(random.choice(users)["id"], random.choice(promos)["id"]) for _ in range(promos_count * 3)}
+    comments = [
+        {
+            "text": "Explain comment",
+            "date": now - timedelta(seconds=index),
+            "author_id": random.choice(users)["id"],
+            "promo_id": random.choice(promos)["id"],
+        }
+        for index in range(promos_count * 3)
+    ]
+
+    viewer, company, promo = users[0], companies[0], promos[1]
+    viewer_activations = [
+        {"user_id": viewer["id"], "promo_id": activated_promo["id"], "activated_at": now} for activated_promo in promos[:100]
+    ]
+    promo_comments = [
+        {"text": "Explain comment", "date": now - timedelta(seconds=index), "author_id": viewer["id"], "promo_id": promo["id"]}
+        for index in range(100)
+    ]
+
+    async for db_session in get_db(engine):
+        await insert_batches(db_session, BusinessCompanyModel, companies)
+        await insert_batches(db_session, UserModel, users)
+        await insert_batches(db_session, PromoModel, promos)
+        await insert_batches(db_session, PromoTargetModel, targets)
+        await insert_batches(db_session, PromoUniqueValueModel, unique_values)
+        await insert_batches(db_session, UserPromoActivationModel, activations + viewer_activations)
+        await insert_batches(
+            db_session, user_promo_likes, [{"user_id": user_id, "promo_id": promo_id} for user_id, promo_id in likes]
+        )
+        await insert_batches(db_session, CommentModel, comments + promo_comments)
+        await db_session.commit()
+
+        await UserRepository(db_session).recount_promo_counters()
+
+    async with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            await conn.execute(text(f"ANALYZE {table.name}"))
+
+    unique_promo = next(promo for promo in promos if promo["mode"] == PromoModeEnum.UNIQUE)
+    company_promos = [promo for promo in promos if promo["company_id"] == company["id"]]
+
+    return {
+        "user_id": str(viewer["id"]),
+        "user_email": viewer["email"],
+        "company_id": str(company["id"]),
+        "company_email": company["email"],
+        "company_promo_id": str(company_promos[0]["id"]),
+        "promo_id": str(promo["id"]),
+        "unique_promo_id": str(unique_promo["id"]),
+        "feed_cursor": encode_cursor("created_at", promos[100]["created_at"], promos[100]["id"]),
+    }
+
+
+async def check_eligibility(user: UserRepository, seeded: dict) -> None:
+    viewer = await user.get_user_by_id(seeded["user_id"])
+    await user.check_promo_eligibility(viewer, seeded["promo_id"])
+
+
+def get_checks(seeded: dict) -> dict:
+    return {
+        "user by email": lambda user, business: user.get_user_by_email(seeded["user_email"]),
+        "user by id": lambda user, business: user.get_user_by_id(seeded["user_id"]),
+        "feed": lambda user, business: user.get_promos_for_user(seeded["user_id"], None, None, 10, 0),
+        "feed by category": lambda user, business: user.get_promos_for_user(seeded["user_id"], "food", None, 10, 0),
+        "feed of active promos": lambda user, business: user.get_promos_for_user(seeded["user_id"], None, True, 10, 0),
+        "feed next page": lambda user, business: user.get_promos_for_user(
+            seeded["user_id"], None, None, 10, 0, seeded["feed_cursor"]
+        ),
+        "promo for user": lambda user, business: user.get_promo_for_user_by_id(seeded["user_id"], seeded["promo_id"]),
+        "like": lambda user, business: user.add_like_to_promo(seeded["user_id"], seeded["promo_id"]),
+        "unlike": lambda user, business: user.delete_like_to_promo(seeded["user_id"], seeded["promo_id"]),
+        "add comment": lambda user, business: user.add_comment_to_promo(seeded["user_id"], seeded["promo_id"], "Explain"),
+        "comments": lambda user, business: user.get_promo_comments(seeded["promo_id"], 10, 0),
+        "promo eligibility": lambda user, business: check_eligibility(user, seeded),
+        "activate common promo": lambda user, business: user.activate_promo_by_id(seeded["user_id"], seeded["promo_id"]),
+        "activate unique promo": lambda user, business: user.activate_promo_by_id(seeded["user_id"], seeded["unique_promo_id"]),
+        "unused unique codes": lambda user, business: user.get_unused_promo_codes(seeded["unique_promo_id"]),
+        "activations history": lambda user, business: user.get_user_promo_activations_history(seeded["user_id"], 10, 0),
+        "company by email": lambda user, business: business.get_company_by_email(seeded["company_email"]),
+        "company promos": lambda user, business: business.get_promos_for_company(seeded["company_id"]),
+        "company promos by active_from": lambda user, business: business.get_promos_for_company(
+            seeded["company_id"], sort_by=PromoSortByEnum.ACTIVE_FROM
+        ),
+        "company promos by country": lambda user, business: business.get_promos_for_company(
+            seeded["company_id"], country=["ru"]
+        ),
+        "company promo": lambda user, business: business.get_company_promo_by_id(
+            seeded["company_id"], seeded["company_promo_id"]
+        ),
+        "promo stat": lambda user, business: business.get_promo_activations_by_country(seeded["company_promo_id"]),
+    }
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    relations = []
+
+    if plan.get("Node Type") == "Seq Scan":
+        relations.append(plan["Relation Name"])
+    for subplan in plan.get("Plans", []):
+        relations += find_seq_scans(subplan)
+
+    return relations
+
+
+async def explain(engine: AsyncEngine, statement: str, parameters) -> dict:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar()
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return plan[0]["Plan"]
+
+
+async def find_hot_seq_scans(engine: AsyncEngine, name: str, call) -> list[str]:
+    failures = []
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async for db_session in get_db(engine):
+            await call(UserRepository(db_session), BusinessCompanyRepository(db_session))
+    except (EntityNotFoundError, EntityAccessDeniedError):
+        pass
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    for statement, parameters in statements:
+        if name in ALLOWED_FULL_COUNTS and statement.startswith("SELECT count(*)"):
+            continue
+
+        plan = await explain(engine, statement, parameters)
+        seq_scans = sorted(set(find_seq_scans(plan)) & HOT_RELATIONS)
+
+        if seq_scans:
+            failures.append(f"{name}: Seq Scan on {', '.join(seq_scans)}\n{statement}")
+
+    return failures
+
+
+@contextlib.asynccontextmanager
+async def create_throwaway_engine() -> AsyncIterator[AsyncEngine]:
+    # Данные наполняются в отдельную схему с таблицами по моделям и удаляются вместе с ней.
+    schema = f"hot_query_plans_{uuid.uuid4().hex}"
+    uri = get_db_uri(PostgresConfig.from_env())
+
+    engine = create_async_engine(uri)
+    async with engine.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+
+    schema_engine = create_async_engine(uri, connect_args={"server_settings": {"search_path": schema}})
+    try:
+        await create_all_tables(schema_engine)
+        yield schema_engine
+    finally:
+        await schema_engine.dispose()
+
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        await engine.dispose()
+
+
+async def explain_hot_queries(users_count: int, promos_count: int) -> dict[str, list[str]]:
+    async with create_throwaway_engine() as engine:
+        seeded = await seed(engine, users_count, promos_count)
+
+        return {name: await find_hot_seq_scans(engine, name, call) for name, call in get_checks(seeded).items()}
@@ -0,0 +1,23 @@
+import asyncio
+import os
+
+import pytest
+
+from tests.hot_query_plans import explain_hot_queries, get_checks
+
+USERS_COUNT = 5000
+PROMOS_COUNT = 20000
+
+pytestmark = pytest.mark.skipif(not os.getenv("POSTGRES_CONN"), reason="Нужна база данных: задайте POSTGRES_CONN")
+
+
+@pytest.fixture(scope="module")
+def seq_scans() -> dict[str, list[str]]:
+    # Движок и соединения живут в одном цикле событий, поэтому планы всех запросов собираются за один прогон.
+    # Данные наполняются во временную схему, которая удаляется в конце прогона.
+    return asyncio.run(explain_hot_queries(USERS_COUNT, PROMOS_COUNT))
+
+
+@pytest.mark.parametrize("name", get_checks({}))
+def test_hot_query_uses_indexes(seq_scans: dict[str, list[str]], name: str):
+    assert not seq_scans[name], "\n\n".join(seq_scans[name])